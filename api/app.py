@@ -1,27 +1,34 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from pathlib import Path
 import re
-from functools import lru_cache
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
 from xml.etree import ElementTree as ET
 import sqlite3
 
-from fastapi import FastAPI, Query
-from fastapi.responses import FileResponse, Response
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import Response, StreamingResponse
 import requests
 
 from db.store import Store
 from db.store import PostRecord
+from db import views
+from db.mentions import load_burst_detector, mention_times, observe_bursts
+from api.fastjson import JSONBytesResponse
+from api.http_cache import HashedStaticFiles, HttpCacheMiddleware, page_response
 from crawler.fetcher import fetch_feed
 from crawler.fulltext import CrawlerConfig, fetch_fulltext
 from processor.cleaner import canonicalize_url, normalize_text, stable_hash
-from nlp.classifier import RuleClassifier
-from nlp.entity_extractor import EntityExtractor
-from topic_engine.topic_builder import TopicBuilder
+from nlp.dictionary import load_yaml
+from nlp.annotator import Annotator
+from ranking.burst import BurstDetector
+from translate.service import TranslateConfig, Translator, build_translator
+from translate.text import HTML_TAG_RE, ZH_RE, extract_paragraphs, paragraph_segments, source_segment, to_cn_text
 
 
 def _is_serverless() -> bool:
@@ -32,14 +39,17 @@ def _build_store() -> Store:
     env_db = os.getenv("AINEWS_DB_PATH")
     db_path = env_db if env_db else ("/tmp/ainews.db" if _is_serverless() else "data/ainews.db")
 
-    primary = Store(db_path)
+    slow_ms = os.getenv("AINEWS_SLOW_QUERY_MS", "").strip()
+    slow_query_ms = float(slow_ms) if slow_ms else 250.0
+
+    primary = Store(db_path, slow_query_ms=slow_query_ms)
     try:
         primary.init_db()
         return primary
     except (sqlite3.OperationalError, PermissionError, OSError):
         # In serverless runtime, writeable filesystem is typically /tmp only.
         if db_path != "/tmp/ainews.db":
-            fallback = Store("/tmp/ainews.db")
+            fallback = Store("/tmp/ainews.db", slow_query_ms=slow_query_ms)
             fallback.init_db()
             return fallback
         raise
@@ -49,12 +59,10 @@ store = _build_store()
 
 app = FastAPI(title="AI News Daily API", version="0.1.0")
 STATIC_DIR = Path(__file__).parent / "static"
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+app.mount("/static", HashedStaticFiles(directory=STATIC_DIR), name="static")
+app.add_middleware(HttpCacheMiddleware, version=store.cache_version)
 
 
-_ZH_RE = re.compile(r"[\u4e00-\u9fff]")
-_HTML_TAG_RE = re.compile(r"<[^>]+>")
-_BLOCK_BREAK_RE = re.compile(r"</?(p|div|article|section|h1|h2|h3|h4|h5|h6|li|ul|ol|blockquote|pre|br)[^>]*>", re.IGNORECASE)
 _SCRIPT_STYLE_RE = re.compile(r"<(script|style|noscript)[^>]*>.*?</\\1>", re.IGNORECASE | re.DOTALL)
 
 
@@ -111,10 +119,19 @@ def _ensure_sources_seeded() -> None:
 
 
 _post_bootstrap_attempted = False
-_classifier = None
-_entity_extractor = None
-_topic_builder = None
+_annotator: Annotator | None = None
 _crawler_cfg: CrawlerConfig | None = None
+_burst_detector: BurstDetector | None = None
+_translate_cfg: TranslateConfig | None = None
+_translator: Translator | None = None
+# Shared by all post-detail requests: bounds concurrent paragraph translation and fulltext fetches.
+_translate_pool: ThreadPoolExecutor | None = None
+_fetch_pool: ThreadPoolExecutor | None = None
+# Cache lookups of post-detail requests, kept off _translate_pool so they never queue behind provider calls.
+_lookup_pool: ThreadPoolExecutor | None = None
+# Paragraph groups submitted to _translate_pool and not yet started.
+_translate_queued = 0
+_translate_queued_lock = threading.Lock()
 
 
 def _get_crawler_cfg() -> CrawlerConfig:
@@ -126,19 +143,29 @@ def _get_crawler_cfg() -> CrawlerConfig:
     return _crawler_cfg
 
 
+def _get_burst_detector() -> BurstDetector:
+    global _burst_detector
+    if _burst_detector is None:
+        base_dir = Path(__file__).resolve().parents[1]
+        hot_cfg = load_yaml(str(base_dir / "config" / "hot_config.yaml"))
+        _burst_detector = BurstDetector.from_config(hot_cfg.get("burst") or {})
+    return _burst_detector
+
+
+# Sent with read-API bodies that needed on-demand translation (or fell back to the source text):
+# they are left untagged, so the next request retries instead of revalidating to a 304.
+_ON_DEMAND_HEADERS = {"Cache-Control": "no-store"}
+
 # Cache: url -> (text, method, paywall_detected)
 _fulltext_cache: dict[str, tuple[str, str, bool]] = {}
 
 
-def _ensure_nlp_components() -> None:
-    global _classifier, _entity_extractor, _topic_builder
-    if _classifier and _entity_extractor and _topic_builder:
-        return
-    base_dir = Path(__file__).resolve().parents[1]
-    cfg_dir = base_dir / "config"
-    _classifier = RuleClassifier(str(cfg_dir / "taxonomy.yaml"))
-    _entity_extractor = EntityExtractor(str(cfg_dir / "entities.yaml"))
-    _topic_builder = TopicBuilder(str(cfg_dir / "topic_builder.yaml"))
+def _ensure_nlp_components() -> Annotator:
+    global _annotator
+    if _annotator is None:
+        base_dir = Path(__file__).resolve().parents[1]
+        _annotator = Annotator(base_dir / "config")
+    return _annotator
 
 
 def _bootstrap_posts_if_empty() -> None:
@@ -195,7 +222,7 @@ def _bootstrap_posts_if_empty() -> None:
     if not inserted_ids:
         return
 
-    _ensure_nlp_components()
+    annotator = _ensure_nlp_components()
     placeholders = ",".join("?" for _ in inserted_ids)
     with store.connect() as conn:
         rows = conn.execute(
@@ -207,63 +234,81 @@ def _bootstrap_posts_if_empty() -> None:
             inserted_ids,
         ).fetchall()
 
-    for row in rows:
-        post_id = int(row["id"])
-        text = "\n".join([row["title"] or "", row["summary"] or "", row["content"] or ""])
-        labels = _classifier.classify(text) if _classifier else []
-        entities = _entity_extractor.extract(text) if _entity_extractor else []
-        store.add_labels(post_id, labels)
-        store.add_entities(post_id, entities)
-        keywords = set(normalize_text(text).split())
-        topic_id, evidence = _topic_builder.assign_topic(entities, labels, keywords) if _topic_builder else (None, {})
-        if topic_id:
-            title = entities[0]["canonical"] if entities else (row["title"] or "Topic")
-            primary_entity = entities[0]["id"] if entities else None
-            store.upsert_topic(topic_id, "ENTITY" if entities else "CLUSTER", title, primary_entity)
-            store.bind_post_topic(topic_id, post_id, 1.0, evidence)
-
-
-def _to_cn_text(text: str, limit: int = 220) -> str:
-    value = (text or "").strip()
-    if not value:
-        return ""
-    value = _HTML_TAG_RE.sub(" ", value)
-    value = re.sub(r"\s+", " ", value).strip()
-    if len(value) > limit:
-        value = value[: limit - 1] + "…"
-    if _ZH_RE.search(value):
-        return value
-    return f"（英文）{value}"
+    # Loaded (or rebuilt) before the new annotations are saved, so they are counted once.
+    detector = load_burst_detector(store, annotator.bundle.hot_config.get("burst") or {})
+    store.record_dict_version(annotator.dict_version, annotator.dictionaries.term_map())
+    results = annotator.annotate([tuple(r) for r in rows])
+    store.save_annotations(results, dict_version=annotator.dict_version)
+    if detector is not None:
+        observe_bursts(store, detector, results, mention_times(store, results))
+
+
+def _get_translate_cfg() -> TranslateConfig:
+    global _translate_cfg
+    if _translate_cfg is None:
+        base_dir = Path(__file__).resolve().parents[1]
+        _translate_cfg = TranslateConfig.from_yaml(str(base_dir / "config" / "translate.yaml"))
+    return _translate_cfg
+
+
+def _get_translator() -> Translator:
+    global _translator
+    if _translator is None:
+        _translator = build_translator(store, _get_translate_cfg())
+    return _translator
+
+
+def _get_pools() -> tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+    global _translate_pool, _fetch_pool
+    if _translate_pool is None:
+        _translate_pool = ThreadPoolExecutor(max_workers=max(1, _get_translate_cfg().detail_max_concurrency))
+        _fetch_pool = ThreadPoolExecutor(max_workers=max(1, _get_crawler_cfg().max_concurrent))
+    return _translate_pool, _fetch_pool
+
+
+def _get_lookup_pool() -> ThreadPoolExecutor:
+    global _lookup_pool
+    if _lookup_pool is None:
+        _lookup_pool = ThreadPoolExecutor(max_workers=2)
+    return _lookup_pool
+
+
+def _submit_paragraph_group(items: List[tuple[str, int]]) -> Future | None:
+    """Queue ``_translate_many_to_zh(items)`` on the translation pool; None (dropped) when
+    ``post_detail.max_queued_groups`` groups are already waiting for a worker."""
+    global _translate_queued
+    translate_pool, _ = _get_pools()
+    with _translate_queued_lock:
+        if _translate_queued >= _get_translate_cfg().detail_max_queued_groups:
+            return None
+        _translate_queued += 1
+
+    def run() -> List[str]:
+        global _translate_queued
+        with _translate_queued_lock:
+            _translate_queued -= 1
+        return _translate_many_to_zh(items)
+
+    return translate_pool.submit(run)
+
+
+def _translate_many_to_zh(items: List[tuple[str, int]]) -> List[str]:
+    """Translate (text, limit) pairs with one cache lookup and batched provider requests."""
+    translated = _get_translator().translate_many(source_segment(text) for text, _ in items)
+    # Chinese text and failed translations fall back to readable source text.
+    return [to_cn_text(zh or text or "", limit=limit) for (text, limit), zh in zip(items, translated)]
 
 
-@lru_cache(maxsize=4096)
 def _translate_to_zh(text: str, limit: int = 220) -> str:
-    value = (text or "").strip()
-    if not value:
-        return ""
-    if _ZH_RE.search(value):
-        return _to_cn_text(value, limit=limit)
-    try:
-        q = value[:800]
-        resp = requests.get(
-            "https://translate.googleapis.com/translate_a/single",
-            params={"client": "gtx", "sl": "auto", "tl": "zh-CN", "dt": "t", "q": q},
-            timeout=3,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        translated = "".join(part[0] for part in (data[0] or []) if part and part[0])
-        translated = _to_cn_text(translated, limit=limit)
-        if translated:
-            return translated
-    except Exception:
-        pass
-    # fallback: keep readable Chinese-prefixed text when translation endpoint is unavailable.
-    return _to_cn_text(value, limit=limit)
+    return _translate_many_to_zh([(text, limit)])[0]
+
+
+def _add_zh_title_summary(items: List[Dict], summary_limit: int) -> None:
+    views.add_zh_title_summary(store, items, _get_translator().target, summary_limit, _translate_many_to_zh)
 
 
 def _split_text_chunks(text: str, chunk_size: int = 800) -> List[str]:
-    t = _HTML_TAG_RE.sub(" ", text or "")
+    t = HTML_TAG_RE.sub(" ", text or "")
     t = re.sub(r"\s+", " ", t).strip()
     if not t:
         return []
@@ -277,24 +322,6 @@ def _split_text_chunks(text: str, chunk_size: int = 800) -> List[str]:
     return chunks
 
 
-def _extract_paragraphs(text: str, max_paragraphs: int = 120) -> List[str]:
-    if not text:
-        return []
-    t = text
-    # Keep paragraph boundaries from common block tags.
-    t = _BLOCK_BREAK_RE.sub("\n\n", t)
-    t = _HTML_TAG_RE.sub(" ", t)
-    t = t.replace("\r\n", "\n").replace("\r", "\n")
-    t = re.sub(r"[ \t]+", " ", t)
-    raw_parts = [x.strip() for x in re.split(r"\n{2,}", t) if x.strip()]
-    # Fallback when source has no block boundaries.
-    if len(raw_parts) <= 1:
-        line_parts = [x.strip() for x in t.split("\n") if x.strip()]
-        if line_parts:
-            raw_parts = line_parts
-    return raw_parts[:max_paragraphs]
-
-
 def _fetch_article_result(url: str) -> tuple[str, str, bool]:
     """Fetch full article text. Returns (text, method, paywall_detected). Results are cached."""
     if not url:
@@ -315,28 +342,74 @@ def _fetch_article_text(url: str) -> str:
 
 
 def _translate_long_to_zh(text: str, max_chars: int = 20000) -> str:
-    clean = _HTML_TAG_RE.sub(" ", text or "")
+    clean = HTML_TAG_RE.sub(" ", text or "")
     clean = re.sub(r"\s+", " ", clean).strip()
     if not clean:
         return ""
-    if _ZH_RE.search(clean):
+    if ZH_RE.search(clean):
         return clean[:max_chars]
     clean = clean[:max_chars]
-    out: List[str] = []
-    for chunk in _split_text_chunks(clean, chunk_size=700):
-        out.append(_translate_to_zh(chunk, limit=740))
+    out = _translate_many_to_zh([(chunk, 740) for chunk in _split_text_chunks(clean, chunk_size=700)])
     return "\n".join(x for x in out if x).strip()
 
 
 def _translate_paragraphs(paragraphs: List[str], max_paragraph_chars: int = 1400) -> List[Dict[str, str]]:
-    out: List[Dict[str, str]] = []
-    for p in paragraphs:
-        en = (p or "").strip()
-        if not en:
-            continue
-        en = en[:max_paragraph_chars]
-        zh = _translate_to_zh(en, limit=max(120, min(1200, len(en) + 80)))
-        out.append({"en": en, "zh": zh})
+    ens = paragraph_segments(paragraphs, max_paragraph_chars)
+    zhs = _translate_many_to_zh([(en, max(120, min(1200, len(en) + 80))) for en in ens])
+    return [{"en": en, "zh": zh} for en, zh in zip(ens, zhs)]
+
+
+async def _iter_paragraph_translations(
+    ens: List[str], deadline: float, start: int = 0
+) -> AsyncIterator[List[tuple[int, str]]]:
+    """Yield (index, zh) pairs of ``ens[start:]`` as they become available, until ``deadline``.
+
+    Cached paragraphs come first from one lookup (also bounded by the deadline);
+    the rest go out in groups of ``segments_per_request`` on the shared
+    translation pool and are yielded group by group as they finish. Groups
+    unfinished at the deadline keep running, so their translations land in the
+    cache for a later request; groups beyond a full queue are not sent at all.
+    """
+    cfg = _get_translate_cfg()
+    loop = asyncio.get_running_loop()
+    indices = list(range(start, len(ens)))
+    limits = {i: max(120, min(1200, len(ens[i]) + 80)) for i in indices}
+    lookup = loop.run_in_executor(_get_lookup_pool(), _get_translator().lookup, [source_segment(ens[i]) for i in indices])
+    try:
+        cached = await asyncio.wait_for(lookup, timeout=max(0.0, deadline - loop.time()))
+    except asyncio.TimeoutError:
+        return
+    hits = [(i, to_cn_text(zh or ens[i], limit=limits[i])) for i, zh in zip(indices, cached) if zh is not None]
+    if hits:
+        yield hits
+    missing = [i for i, zh in zip(indices, cached) if zh is None]
+    step = max(1, cfg.detail_segments_per_request)
+    groups = [missing[i : i + step] for i in range(0, len(missing), step)]
+    futures = {}
+    for group in groups:
+        fut = _submit_paragraph_group([(ens[i], limits[i]) for i in group])
+        if fut is not None:
+            futures[asyncio.wrap_future(fut)] = group
+    pending = set(futures)
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, timeout=max(0.0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
+        )
+        if not done:
+            return
+        for fut in done:
+            if fut.exception() is None:
+                yield list(zip(futures[fut], fut.result()))
+
+
+async def _translate_paragraphs_within(paragraphs: List[str], deadline: float, max_paragraph_chars: int = 1400) -> List[Dict]:
+    """Paragraph pairs translated until ``deadline`` (event-loop time); the rest come back with ``pending`` set."""
+    ens = paragraph_segments(paragraphs, max_paragraph_chars)
+    out = [{"en": en, "zh": "", "pending": True} for en in ens]
+    async for pairs in _iter_paragraph_translations(ens, deadline):
+        for i, zh in pairs:
+            out[i]["zh"] = zh
+            out[i]["pending"] = False
     return out
 
 
@@ -352,25 +425,31 @@ def api_meta() -> Dict:
     return {"build_version": build_version}
 
 
+@app.get("/api/metrics")
+def api_metrics() -> Dict:
+    translation = dict(_translator.stats) if _translator is not None else {}
+    return {"query_cache": store.cache_stats(), "db": store.db_stats(), "translation": translation}
+
+
 @app.get("/")
-def web_home() -> FileResponse:
-    return FileResponse(STATIC_DIR / "index.html")
+def web_home(request: Request) -> Response:
+    return page_response(STATIC_DIR / "index.html", request)
 
 
 @app.get("/sources")
-def web_sources() -> FileResponse:
+def web_sources(request: Request) -> Response:
     _ensure_sources_seeded()
-    return FileResponse(STATIC_DIR / "sources.html")
+    return page_response(STATIC_DIR / "sources.html", request)
 
 
 @app.get("/browse")
-def web_browse() -> FileResponse:
-    return FileResponse(STATIC_DIR / "browse.html")
+def web_browse(request: Request) -> Response:
+    return page_response(STATIC_DIR / "browse.html", request)
 
 
 @app.get("/read")
-def web_read() -> FileResponse:
-    return FileResponse(STATIC_DIR / "read.html")
+def web_read(request: Request) -> Response:
+    return page_response(STATIC_DIR / "read.html", request)
 
 
 @app.get("/favicon.ico")
@@ -379,14 +458,9 @@ def favicon() -> Response:
 
 
 @app.get("/api/topics")
-def get_topics(window: str = Query("24h"), sort: str = Query("hot")) -> List[Dict]:
-    rows = store.api_topics(window=window, sort=sort)
-    out = []
-    for r in rows:
-        item = dict(r)
-        item["breakdown"] = json.loads(item.pop("breakdown_json"))
-        out.append(item)
-    return out
+def get_topics(window: str = Query("24h"), sort: str = Query("hot")) -> Response:
+    body = store.get_response_blob(views.topics_key(window, sort)) or views.topics_body(store, window, sort)
+    return JSONBytesResponse(body)
 
 
 @app.get("/api/topics/{topic_id}")
@@ -394,6 +468,43 @@ def get_topic(topic_id: str) -> Dict:
     return store.api_topic_detail(topic_id) or {"topic": None, "posts": []}
 
 
+@app.get("/api/topics/{topic_id}/trend")
+def get_topic_trend(
+    topic_id: str,
+    window: str = Query("24h"),
+    hours: int = Query(168, ge=1, le=24 * 90),
+    step_minutes: int = Query(60, ge=5, le=1440),
+) -> Dict:
+    return store.api_topic_trend(topic_id, window=window, hours=hours, step_minutes=step_minutes) or {
+        "topic_id": topic_id,
+        "window": window,
+        "points": [],
+        "changes": [],
+    }
+
+
+@app.get("/api/topics/{topic_id}/related")
+def get_topic_related(topic_id: str, limit: int = Query(10, ge=1, le=50)) -> List[Dict]:
+    return store.api_topic_related(topic_id, limit=limit) or []
+
+
+@app.get("/api/movers")
+def get_movers(
+    window: str = Query("24h"),
+    hours: int = Query(24, ge=1, le=24 * 90),
+    limit: int = Query(20, ge=1, le=200),
+) -> List[Dict]:
+    return store.api_movers(window=window, hours=hours, limit=limit)
+
+
+@app.get("/api/bursts")
+def get_bursts(
+    kind: Optional[str] = Query(None, pattern=r"^(entity|label)$"),
+    limit: int = Query(50, ge=1, le=500),
+) -> List[Dict]:
+    return store.api_bursts(_get_burst_detector(), kind=kind, limit=limit)
+
+
 @app.get("/api/posts")
 def get_posts(label: Optional[str] = None, after: Optional[str] = None) -> List[Dict]:
     return [dict(r) for r in store.api_posts(label=label, after=after)]
@@ -405,33 +516,26 @@ def get_entities(q: str = Query(..., min_length=1)) -> List[Dict]:
 
 
 @app.get("/api/dates")
-def get_available_dates(limit: int = Query(90, ge=1, le=365)) -> List[Dict]:
+def get_available_dates(limit: int = Query(90, ge=1, le=365)) -> Response:
     _bootstrap_posts_if_empty()
-    return [dict(r) for r in store.api_available_dates(limit=limit)]
+    return JSONBytesResponse([dict(r) for r in store.api_available_dates(limit=limit)])
 
 
 @app.get("/api/daily")
-def get_daily(day: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$")) -> Dict:
+def get_daily(day: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$")) -> Response:
     _bootstrap_posts_if_empty()
-    digest = store.api_daily_digest(day)
-    posts = []
-    for p in digest.get("posts", []):
-        labels = [x for x in (p.get("label_tags") or "").split(",") if x]
-        topics = [x for x in (p.get("topic_tags") or "").split(",") if x]
-        item = dict(p)
-        item["labels"] = labels
-        item["topics"] = topics
-        item["zh_title"] = _translate_to_zh(item.get("title", ""), limit=120)
-        item["zh_summary"] = _translate_to_zh(item.get("summary", ""), limit=220)
-        posts.append(item)
-    digest["posts"] = posts
-    return digest
+    # Bodies precomputed by the pipeline are served as stored while no write has happened since.
+    body = store.get_response_blob(views.daily_key(day)) or views.daily_body(store, day, _get_translator().target)
+    if body is None:
+        body = views.daily_body(store, day, _get_translator().target, _translate_many_to_zh)
+        return JSONBytesResponse(body, headers=_ON_DEMAND_HEADERS)
+    return JSONBytesResponse(body)
 
 
 @app.get("/api/sources")
-def get_sources(days: int = Query(7, ge=1, le=30)) -> List[Dict]:
+def get_sources(days: int = Query(7, ge=1, le=30)) -> Response:
     _ensure_sources_seeded()
-    return [dict(r) for r in store.api_sources(days=days)]
+    return JSONBytesResponse([dict(r) for r in store.api_sources(days=days)])
 
 
 @app.get("/api/browse")
@@ -439,53 +543,162 @@ def api_browse(
     kind: str = Query(..., pattern=r"^(topic|tag)$"),
     value: str = Query(..., min_length=1),
     limit: int = Query(300, ge=1, le=1000),
-) -> Dict:
+) -> Response:
     rows = [dict(r) for r in store.api_browse_posts(kind=kind, value=value, limit=limit)]
-    for item in rows:
-        item["zh_title"] = _translate_to_zh(item.get("title", ""), limit=120)
-        item["zh_summary"] = _translate_to_zh(item.get("summary", ""), limit=220)
-    return {"kind": kind, "value": value, "count": len(rows), "posts": rows}
+    headers = None
+    if not views.add_zh_title_summary(store, rows, _get_translator().target, 220):
+        _add_zh_title_summary(rows, summary_limit=220)
+        headers = _ON_DEMAND_HEADERS
+    return JSONBytesResponse({"kind": kind, "value": value, "count": len(rows), "posts": rows}, headers=headers)
 
 
-@app.get("/api/post/{post_id}")
-def api_post_detail(post_id: int) -> Dict:
+def _post_item(post_id: int) -> Dict | None:
     row = store.get_post_detail(post_id)
     if not row:
-        return {"ok": False, "error": "post not found"}
+        return None
     item = dict(row)
     item["labels"] = [x for x in (item.get("label_tags") or "").split(",") if x]
     item["topics"] = [x for x in (item.get("topic_tags") or "").split(",") if x]
-    item["zh_title"] = _translate_to_zh(item.get("title", ""), limit=120)
-    item["zh_summary"] = _translate_to_zh(item.get("summary", ""), limit=320)
+    return item
+
+
+async def _post_paragraphs(item: Dict, deadline: float) -> tuple[List[str], Dict]:
+    """Paragraph segments of a post's best available text, plus where it came from.
+
+    RSS feeds often provide only summaries, so short content triggers a
+    fulltext fetch. A fetch still running at ``deadline`` leaves the RSS text
+    in place (``fulltext_pending``); its result is cached for the next request.
+    """
+    loop = asyncio.get_running_loop()
+    _, fetch_pool = _get_pools()
     content = item.get("content") or ""
     source_type = "rss_content" if content else "rss_summary"
     paywall = False
+    fulltext_pending = False
     if len((content or "").strip()) < 500:
-        # RSS feeds often provide only summaries. Fetch full article on demand.
-        fetched_text, fetched_method, paywall = _fetch_article_result(item.get("url") or "")
-        if paywall:
-            source_type = "paywalled"
-        elif len(fetched_text) > len(content or ""):
-            content = fetched_text
-            source_type = "fetched_fulltext"
+        fetch_fut = loop.run_in_executor(fetch_pool, _fetch_article_result, item.get("url") or "")
+        try:
+            fetched_text, fetched_method, paywall = await asyncio.wait_for(
+                asyncio.shield(fetch_fut), timeout=max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            fulltext_pending = True
+        else:
+            if paywall:
+                source_type = "paywalled"
+            elif len(fetched_text) > len(content or ""):
+                content = fetched_text
+                source_type = "fetched_fulltext"
     if not content:
         content = item.get("summary") or ""
         if source_type not in {"paywalled"}:
             source_type = "rss_summary"
 
-    paragraphs = _extract_paragraphs(content, max_paragraphs=220)
+    paragraphs = extract_paragraphs(content, max_paragraphs=220)
     if not paragraphs:
-        paragraphs = _extract_paragraphs(item.get("summary") or "", max_paragraphs=20)
-    para_pairs = _translate_paragraphs(paragraphs)
+        paragraphs = extract_paragraphs(item.get("summary") or "", max_paragraphs=20)
+    return paragraph_segments(paragraphs), {
+        "content_source": source_type,
+        "paywall_detected": paywall,
+        "fulltext_available": source_type in {"fetched_fulltext", "rss_content"},
+        "fulltext_pending": fulltext_pending,
+    }
+
+
+async def _post_head_translation(item: Dict, deadline: float) -> None:
+    """Set zh_title/zh_summary, falling back to the source text if translation misses ``deadline``."""
+    loop = asyncio.get_running_loop()
+    translate_pool, _ = _get_pools()
+    head = {"id": item.get("id"), "title": item.get("title"), "summary": item.get("summary")}
+    try:
+        await asyncio.wait_for(
+            asyncio.shield(loop.run_in_executor(translate_pool, _add_zh_title_summary, [head], 320)),
+            timeout=max(0.0, deadline - loop.time()),
+        )
+    except asyncio.TimeoutError:
+        pass
+    item["zh_title"] = head.get("zh_title") or to_cn_text(item.get("title") or "", limit=120)
+    item["zh_summary"] = head.get("zh_summary") or to_cn_text(item.get("summary") or "", limit=320)
+
+
+@app.get("/api/post/{post_id}")
+async def api_post_detail(post_id: int) -> Dict:
+    """Post with paragraph-level translation, answered within ``post_detail.latency_budget``.
+
+    Title/summary translation runs alongside the fulltext fetch; paragraphs are
+    translated concurrently, and untranslated ones come back as pending.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _get_translate_cfg().detail_latency_budget
+    item = _post_item(post_id)
+    if item is None:
+        return {"ok": False, "error": "post not found"}
+    head_task = asyncio.ensure_future(_post_head_translation(item, deadline))
+    ens, source = await _post_paragraphs(item, deadline)
+    para_pairs = await _translate_paragraphs_within(ens, deadline)
+    await head_task
     item["paragraphs"] = para_pairs
     item["content_en"] = "\n\n".join(x["en"] for x in para_pairs)
-    item["content_zh"] = "\n\n".join(x["zh"] for x in para_pairs)
-    item["content_source"] = source_type
-    item["paywall_detected"] = paywall
-    item["fulltext_available"] = source_type in {"fetched_fulltext", "rss_content"}
+    # Pending paragraphs show their source text until translated.
+    item["content_zh"] = "\n\n".join(x["zh"] or to_cn_text(x["en"], limit=len(x["en"]) + 1) for x in para_pairs)
+    item["pending_paragraphs"] = sum(1 for x in para_pairs if x["pending"])
+    item.update(source)
     return {"ok": True, "post": item}
 
 
+@app.get("/api/post/{post_id}/stream")
+async def api_post_stream(
+    post_id: int,
+    start: int = Query(0, ge=0, alias="from"),
+    source: Optional[str] = Query(None),
+    total: Optional[int] = Query(None, ge=0),
+) -> StreamingResponse:
+    """NDJSON version of /api/post/{id} that renders progressively.
+
+    Lines, in order: ``meta`` (the post with zh_title/zh_summary, without
+    paragraphs), ``content`` (paragraph count, source flags and the English
+    paragraphs from ``from`` on), one
+    ``paragraph`` line ({index, en, zh}) per paragraph as soon as it is
+    translated (cached ones first, otherwise in completion order), then
+    ``done`` with the indices still pending at ``post_detail.stream_timeout``.
+    ``from`` skips paragraphs before that index, to resume a broken stream;
+    ``source`` and ``total`` are the ``content_source`` and paragraph count the
+    client's paragraphs came from. Paragraph indices only hold for the same text,
+    so when those no longer match (e.g. the fulltext fetch finished in between)
+    ``from`` is ignored and the stream starts over at 0.
+    """
+
+    def line(obj: Dict) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+    async def events() -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _get_translate_cfg().detail_stream_timeout
+        item = _post_item(post_id)
+        if item is None:
+            yield line({"type": "error", "error": "post not found"})
+            return
+        paragraphs_task = asyncio.ensure_future(_post_paragraphs(item, deadline))
+        await _post_head_translation(item, min(deadline, loop.time() + _get_translate_cfg().detail_latency_budget))
+        meta = {k: v for k, v in item.items() if k != "content"}
+        yield line({"type": "meta", "post": meta})
+        ens, flags = await paragraphs_task
+        first = start
+        if first > len(ens) or (source is not None and source != flags["content_source"]) or (
+            total is not None and total != len(ens)
+        ):
+            first = 0
+        # English text up front, so the page can show the original while translations arrive.
+        yield line({"type": "content", "total": len(ens), "from": first, "en": ens[first:], **flags})
+        remaining = set(range(first, len(ens)))
+        async for pairs in _iter_paragraph_translations(ens, deadline, start=first):
+            yield b"".join(line({"type": "paragraph", "index": i, "en": ens[i], "zh": zh}) for i, zh in pairs)
+            remaining.difference_update(i for i, _ in pairs)
+        yield line({"type": "done", "pending": sorted(remaining)})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
+
+
 @app.post("/api/translate/raw")
 def api_translate_raw(payload: Dict) -> Dict:
     text = (payload.get("text") or "").strip()
@@ -493,7 +706,7 @@ def api_translate_raw(payload: Dict) -> Dict:
     if not text:
         return {"ok": False, "error": "text is required"}
 
-    paragraphs = _extract_paragraphs(text, max_paragraphs=260)
+    paragraphs = extract_paragraphs(text, max_paragraphs=260)
     if not paragraphs:
         return {"ok": False, "error": "no valid paragraphs"}
     para_pairs = _translate_paragraphs(paragraphs, max_paragraph_chars=1600)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Any
+
+from starlette.responses import Response
+
+from db.fastjson import dumps
+
+
+class JSONBytesResponse(Response):
+    """JSON response that skips FastAPI's jsonable_encoder; accepts prebuilt bytes or plain data."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Cache-Control for one route; ``clock_seconds`` > 0 marks results that also move with the clock."""
+
+    max_age: int
+    s_maxage: int
+    stale_while_revalidate: int
+    clock_seconds: int = 0
+
+    def header(self) -> str:
+        return (
+            f"public, max-age={self.max_age}, s-maxage={self.s_maxage}, "
+            f"stale-while-revalidate={self.stale_while_revalidate}"
+        )
+
+
+# Browsers revalidate after max-age (cheap with the ETag), the CDN keeps s-maxage and
+# may serve a stale copy while it refetches in the background.
+ROUTE_POLICIES: dict[str, CachePolicy] = {
+    "/api/daily": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=3600),
+    "/api/dates": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=3600),
+    # Hot scores decay at read time, and the store caches them per minute.
+    "/api/topics": CachePolicy(max_age=30, s_maxage=60, stale_while_revalidate=600, clock_seconds=60),
+    "/api/browse": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=3600),
+    "/api/sources": CachePolicy(max_age=300, s_maxage=900, stale_while_revalidate=86400, clock_seconds=300),
+}
+
+# Pages keep their URLs across deploys: browsers always revalidate, the CDN is purged on deploy.
+PAGE_CACHE_CONTROL = "public, max-age=0, s-maxage=86400"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``."""
+    if not if_none_match:
+        return False
+    want = etag.removeprefix("W/")
+    return any(tag.strip() == "*" or tag.strip().removeprefix("W/") == want for tag in if_none_match.split(","))
+
+
+class HttpCacheMiddleware:
+    """ETag, Cache-Control and 304 handling for the read APIs in ``policies``.
+
+    The ETag of a GET is derived from ``version()`` (the store's data version),
+    the path and the normalized query string, plus a clock bucket for routes
+    whose results drift with time. A matching If-None-Match is answered with
+    304 before the route runs, so revalidations cost no query or serialization.
+    Only 200 responses are tagged; the tag is taken after the route ran, so a
+    route that writes (first-request bootstrap) gets the version it produced.
+    A route can opt a response out by sending ``Cache-Control: no-store``
+    itself, e.g. when it had to translate on demand.
+    """
+
+    def __init__(
+        self, app: ASGIApp, version: Callable[[], str], policies: dict[str, CachePolicy] | None = None
+    ) -> None:
+        self.app = app
+        self.version = version
+        self.policies = ROUTE_POLICIES if policies is None else policies
+
+    def etag(self, policy: CachePolicy, scope: Scope) -> str:
+        query = urlencode(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+        clock = int(time.time() // policy.clock_seconds) if policy.clock_seconds else 0
+        raw = f"{self.version()}|{clock}|{scope['path']}?{query}"
+        return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        policy = self.policies.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "GET" else None
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag = self.etag(policy, scope)
+        if etag_matches(Headers(scope=scope).get("if-none-match"), etag):
+            await send({"type": "http.response.start", "status": 304, "headers": self._headers(policy, etag)})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_tagged(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = message.get("headers", [])
+                if not any(k.lower() == b"cache-control" and b"no-store" in v for k, v in headers):
+                    headers = [(k, v) for k, v in headers if k.lower() != b"cache-control"]
+                    message = {**message, "headers": headers + self._headers(policy, self.etag(policy, scope))}
+            await send(message)
+
+        await self.app(scope, receive, send_tagged)
+
+    @staticmethod
+    def _headers(policy: CachePolicy, etag: str) -> list[tuple[bytes, bytes]]:
+        return [(b"etag", etag.encode("latin-1")), (b"cache-control", policy.header().encode("latin-1"))]
+
+
+class ContentHashes:
+    """Content hashes of files, recomputed only when a file's size or mtime changes."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+
+    def get(self, path: str | Path, stat_result: os.stat_result | None = None) -> str:
+        st = stat_result or os.stat(path)
+        key = str(path)
+        with self._lock:
+            hit = self._hashes.get(key)
+        if hit is not None and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+        with self._lock:
+            self._hashes[key] = (st.st_size, st.st_mtime_ns, digest)
+        return digest
+
+
+content_hashes = ContentHashes()
+
+
+class HashedStaticFiles(StaticFiles):
+    """StaticFiles with content-hash ETags; ``?v=<hash>`` URLs (see ``static_url``) are cached for a year."""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        digest = content_hashes.get(full_path, stat_result)
+        versioned = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1"))).get("v") == digest
+        headers = {"etag": f'"{digest}"', "cache-control": IMMUTABLE_CACHE_CONTROL if versioned else "no-cache"}
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return Response(status_code=304, headers=headers)
+        return response
+
+
+def static_url(static_dir: Path, name: str, prefix: str = "/static") -> str:
+    """URL of a static file carrying its content hash, safe to cache as immutable."""
+    return f"{prefix}/{name}?v={content_hashes.get(static_dir / name)}"
+
+
+def page_response(path: Path, request: Request) -> Response:
+    """An HTML page with a content-hash ETag, answering a matching If-None-Match with 304."""
+    st = os.stat(path)
+    etag = f'"{content_hashes.get(path, st)}"'
+    headers = {"etag": etag, "cache-control": PAGE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, stat_result=st, headers=headers)
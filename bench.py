@@ -0,0 +1,270 @@
+"""Parity checks and micro-benchmarks for hot code paths (run via ``cli.py bench-*``)."""
+from __future__ import annotations
+
+import copy
+import json
+import random
+import sqlite3
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+from db import views
+from db.fastjson import _HAS_ORJSON
+from db.store import Store
+from nlp.classifier import RuleClassifier
+from nlp.dictionary import CompiledDictionaries, load_yaml
+from nlp.entity_extractor import EntityExtractor
+from translate.text import to_cn_text
+
+
+def _legacy_classify(cfg: dict, text: str) -> list[dict]:
+    """Reference per-keyword substring scan that RuleClassifier used to run."""
+    boost = cfg["scoring"]["boost"]
+    thresholds = cfg["scoring"]["thresholds"]
+    t = text.lower()
+    scored: list[tuple[str, float]] = []
+    for label in cfg["labels"]:
+        s = 0.0
+        for kw in label.get("keywords_strong", []):
+            if kw.lower() in t:
+                s += boost["strong"]
+        for kw in label.get("keywords_medium", []):
+            if kw.lower() in t:
+                s += boost["medium"]
+        for kw in label.get("keywords_weak", []):
+            if kw.lower() in t:
+                s += boost["weak"]
+        if s > 0:
+            scored.append((label["id"], min(1.0, s / 3.0)))
+    if not scored:
+        return []
+    scored.sort(key=lambda x: x[1], reverse=True)
+    primary_min = float(thresholds["primary_label_min"])
+    secondary_min = float(thresholds["secondary_label_min"])
+    out: list[dict] = []
+    for i, (label_id, score) in enumerate(scored):
+        if i == 0 and score >= primary_min:
+            out.append({"id": label_id, "score": score, "primary": True})
+        elif score >= secondary_min:
+            out.append({"id": label_id, "score": score, "primary": False})
+    return out
+
+
+def _legacy_extract(entities: list[dict], text: str) -> list[dict]:
+    """Reference per-alias substring scan that EntityExtractor used to run."""
+    t = text.lower()
+    out: list[dict] = []
+    for ent in entities:
+        terms = list(ent.get("aliases", [])) + list(ent.get("trigger_keywords", []))
+        if any(term.lower() in t for term in terms):
+            out.append({"id": ent["id"], "canonical": ent["canonical"], "type": ent["type"], "confidence": 0.9})
+    return out
+
+
+def scale_dictionaries(taxonomy: dict, entities: dict, factor: int) -> tuple[dict, dict]:
+    """Grow both dictionaries ~factor× with synthetic labels/entities derived from the real terms."""
+    taxonomy = copy.deepcopy(taxonomy)
+    entities = copy.deepcopy(entities)
+    base_labels = list(taxonomy["labels"])
+    base_entities = list(entities["entities"])
+    for k in range(1, factor):
+        for label in base_labels:
+            clone = {"id": f"{label['id']}.x{k}", "name": label.get("name", "")}
+            for tier in ("strong", "medium", "weak"):
+                clone[f"keywords_{tier}"] = [f"{kw}-x{k}" for kw in label.get(f"keywords_{tier}", [])]
+            taxonomy["labels"].append(clone)
+        for ent in base_entities:
+            entities["entities"].append(
+                {
+                    "id": f"{ent['id']}.x{k}",
+                    "canonical": f"{ent['canonical']} x{k}",
+                    "type": ent["type"],
+                    "aliases": [f"{a}-x{k}" for a in ent.get("aliases", [])],
+                    "trigger_keywords": [f"{t}-x{k}" for t in ent.get("trigger_keywords", [])],
+                }
+            )
+    return taxonomy, entities
+
+
+def sample_texts(db_path: str | None, limit: int, taxonomy: dict, entities: dict) -> list[str]:
+    if db_path and Path(db_path).exists():
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute(
+                "SELECT title, summary, content FROM posts ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+        if rows:
+            return ["\n".join(x or "" for x in r) for r in rows]
+
+    vocab = [kw for label in taxonomy["labels"] for tier in ("strong", "medium", "weak") for kw in label.get(f"keywords_{tier}", [])]
+    vocab += [a for ent in entities["entities"] for a in ent.get("aliases", [])]
+    filler = "the a of to and in is for on with that this we it from by as be are at an new how".split()
+    rnd = random.Random(42)
+    texts = []
+    for _ in range(limit):
+        words = [rnd.choice(vocab) if rnd.random() < 0.08 else rnd.choice(filler) for _ in range(rnd.randint(200, 1500))]
+        texts.append(" ".join(words))
+    return texts
+
+
+def _time_per_post(fn, texts: list[str]) -> float:
+    t0 = time.perf_counter()
+    for t in texts:
+        fn(t)
+    return (time.perf_counter() - t0) * 1000.0 / max(1, len(texts))
+
+
+def bench_dictionaries(config_dir: str = "config", db_path: str | None = None, scale: int = 10, limit: int = 300) -> dict:
+    cdir = Path(config_dir)
+    taxonomy = load_yaml(str(cdir / "taxonomy.yaml"))
+    entities = load_yaml(str(cdir / "entities.yaml"))
+    texts = sample_texts(db_path, limit, taxonomy, entities)
+
+    out: dict = {"posts": len(texts), "avg_chars": round(sum(map(len, texts)) / max(1, len(texts)))}
+    for factor in sorted({1, max(1, scale)}):
+        tax, ents = scale_dictionaries(taxonomy, entities, factor)
+        t0 = time.perf_counter()
+        dicts = CompiledDictionaries(taxonomy=tax, entities=ents)
+        compile_ms = (time.perf_counter() - t0) * 1000.0
+        classifier = RuleClassifier(dictionaries=dicts)
+        extractor = EntityExtractor(dictionaries=dicts)
+
+        mismatches = 0
+        for t in texts:
+            hits = dicts.scan(t)
+            if classifier.classify_hits(hits) != _legacy_classify(tax, t):
+                mismatches += 1
+            elif extractor.extract_hits(hits) != _legacy_extract(ents["entities"], t):
+                mismatches += 1
+
+        hit_sets = [dicts.scan(t) for t in texts]
+        batch_mismatches = sum(
+            1 for got, t in zip(classifier.classify_hits_batch(hit_sets), texts) if got != _legacy_classify(tax, t)
+        )
+        t0 = time.perf_counter()
+        for h in hit_sets:
+            classifier.classify_hits(h)
+        score_ms = (time.perf_counter() - t0) * 1000.0 / max(1, len(texts))
+        t0 = time.perf_counter()
+        classifier.classify_hits_batch(hit_sets)
+        batch_ms = (time.perf_counter() - t0) * 1000.0 / max(1, len(texts))
+
+        def compiled(t: str) -> None:
+            hits = dicts.scan(t)
+            classifier.classify_hits(hits)
+            extractor.extract_hits(hits)
+
+        def legacy(t: str) -> None:
+            _legacy_classify(tax, t)
+            _legacy_extract(ents["entities"], t)
+
+        legacy_ms = _time_per_post(legacy, texts)
+        compiled_ms = _time_per_post(compiled, texts)
+        out[f"x{factor}"] = {
+            "patterns": len(dicts.matcher),
+            "parity_mismatches": mismatches,
+            "compile_ms": round(compile_ms, 2),
+            "legacy_ms_per_post": round(legacy_ms, 4),
+            "compiled_ms_per_post": round(compiled_ms, 4),
+            "speedup": round(legacy_ms / compiled_ms, 2) if compiled_ms else None,
+            "batch_parity_mismatches": batch_mismatches,
+            "label_scoring_ms_per_post": round(score_ms, 4),
+            "batch_label_scoring_ms_per_post": round(batch_ms, 4),
+        }
+    return out
+
+
+def _source_as_zh(items: list[tuple[str, int]]) -> list[str]:
+    """Offline stand-in for on-demand translation: the cleaned source text."""
+    return [to_cn_text(text, limit=limit) for text, limit in items]
+
+
+def _legacy_json(content) -> bytes:
+    """What FastAPI did for dict/list handler results: jsonable_encoder, then JSONResponse's json.dumps."""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _legacy_daily(store: Store, day: str, target: str) -> bytes:
+    digest = store.api_daily_digest(day)
+    posts = []
+    for p in digest.get("posts", []):
+        item = dict(p)
+        item["labels"] = [x for x in (p.get("label_tags") or "").split(",") if x]
+        item["topics"] = [x for x in (p.get("topic_tags") or "").split(",") if x]
+        posts.append(item)
+    views.add_zh_title_summary(store, posts, target, views.DIGEST_SUMMARY_LIMIT, _source_as_zh)
+    digest["posts"] = posts
+    return _legacy_json(digest)
+
+
+def _legacy_topics(store: Store, window: str, sort: str) -> bytes:
+    out = []
+    for r in store.api_topics(window=window, sort=sort):
+        item = dict(r)
+        item["breakdown"] = json.loads(item.pop("breakdown_json"))
+        out.append(item)
+    return _legacy_json(out)
+
+
+def _time_ms(fn, repeat: int) -> tuple[float, object]:
+    result = fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1000.0 / max(1, repeat), result
+
+
+def bench_json(db_path: str, days: int = 3, repeat: int = 20, target: str = "zh-CN") -> dict:
+    """Serialization cost per endpoint: generic encoding vs the fast encoder vs a precomputed blob.
+
+    Query results are warm in the store's cache for every variant, so the times
+    are what the handler spends after its queries. On-demand translation is
+    replaced by the source text. Both encodings must decode to equal JSON.
+    """
+    store = Store(db_path)
+    store.init_db()
+    endpoints: list[tuple[str, object, object, str]] = []
+    for r in store.api_available_dates(limit=days):
+        day = r["day"]
+        endpoints.append(
+            (
+                f"/api/daily?day={day}",
+                lambda day=day: _legacy_daily(store, day, target),
+                lambda day=day: views.daily_body(store, day, target, _source_as_zh),
+                views.daily_key(day),
+            )
+        )
+    for window in ("24h", "7d", "30d"):
+        for sort in views.TOPIC_SORTS:
+            endpoints.append(
+                (
+                    f"/api/topics?window={window}&sort={sort}",
+                    lambda window=window, sort=sort: _legacy_topics(store, window, sort),
+                    lambda window=window, sort=sort: views.topics_body(store, window, sort),
+                    views.topics_key(window, sort),
+                )
+            )
+
+    out: dict = {"orjson": _HAS_ORJSON, "repeat": repeat, "endpoints": {}}
+    mismatches = 0
+    for path, legacy, fast, key in endpoints:
+        legacy_ms, legacy_body = _time_ms(legacy, repeat)
+        fast_ms, fast_body = _time_ms(fast, repeat)
+        blob_ms, blob = _time_ms(lambda key=key: store.get_response_blob(key), repeat)
+        if json.loads(legacy_body) != json.loads(fast_body):
+            mismatches += 1
+        out["endpoints"][path] = {
+            "bytes": len(fast_body),
+            "legacy_ms": round(legacy_ms, 3),
+            "fast_ms": round(fast_ms, 3),
+            "speedup": round(legacy_ms / fast_ms, 2) if fast_ms else None,
+            "blob_ms": round(blob_ms, 3) if blob is not None else None,
+        }
+    out["parity_mismatches"] = mismatches
+    return out
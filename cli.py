@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import json
 import os
+from datetime import datetime, timezone
 
 
 def cmd_run(args: argparse.Namespace) -> None:
@@ -13,13 +14,30 @@ def cmd_run(args: argparse.Namespace) -> None:
             db_path=args.db,
             opml_path=args.opml,
             config_dir=args.config,
+            slow_query_ms=args.slow_query_ms,
+            annotate_workers=args.workers,
+            annotate_chunk_size=args.chunk_size,
         )
     )
     pipe.init()
     ingest = pipe.run_ingest()
     anno = pipe.run_annotate_and_topics()
+    maintenance = pipe.run_topic_maintenance()
+    related = pipe.run_related_topics()
     ranks = pipe.run_rankings()
-    print(json.dumps({"ingest": ingest, "annotate": anno, "rankings": ranks}, ensure_ascii=False, indent=2))
+    translated = pipe.run_translate()
+    blobs = pipe.run_response_blobs()
+    summary = {
+        "ingest": ingest,
+        "annotate": anno,
+        "topic_maintenance": maintenance,
+        "related_topics": related,
+        "rankings": ranks,
+        "translate": translated,
+        "response_blobs": blobs,
+        "db": pipe.store.db_stats(),
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
 
 
 def cmd_rank(args: argparse.Namespace) -> None:
@@ -30,11 +48,94 @@ def cmd_rank(args: argparse.Namespace) -> None:
             db_path=args.db,
             opml_path=args.opml,
             config_dir=args.config,
+            slow_query_ms=args.slow_query_ms,
         )
     )
     pipe.init()
-    ranks = pipe.run_rankings()
-    print(json.dumps({"rankings": ranks}, ensure_ascii=False, indent=2))
+    ranks = pipe.run_rankings(full=args.full)
+    print(json.dumps({"rankings": ranks, "db": pipe.store.db_stats()}, ensure_ascii=False, indent=2))
+
+
+def cmd_reannotate(args: argparse.Namespace) -> None:
+    from pipeline import DailyPipeline, PipelineConfig
+
+    pipe = DailyPipeline(
+        PipelineConfig(
+            db_path=args.db,
+            opml_path="",
+            config_dir=args.config,
+            annotate_chunk_size=args.chunk_size,
+        )
+    )
+    pipe.init()
+    result = pipe.run_reannotate()
+    print(json.dumps({"reannotate": result, "db": pipe.store.db_stats()}, ensure_ascii=False, indent=2))
+
+
+def _parse_as_of(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def cmd_backfill_rankings(args: argparse.Namespace) -> None:
+    from pipeline import DailyPipeline, PipelineConfig
+
+    pipe = DailyPipeline(PipelineConfig(db_path=args.db, opml_path="", config_dir=args.config))
+    pipe.init()
+    result = pipe.run_backfill_rankings(
+        _parse_as_of(args.start), _parse_as_of(args.end), step_hours=args.step_hours, workers=args.workers
+    )
+    print(json.dumps({"backfill": result}, ensure_ascii=False, indent=2))
+
+
+def cmd_rollback_rankings(args: argparse.Namespace) -> None:
+    from db.store import Store
+
+    store = Store(args.db)
+    store.init_db()
+    if not args.list:
+        try:
+            store.rollback_ranking_run(args.run_id)
+        except ValueError as e:
+            raise SystemExit(str(e))
+    print(json.dumps({"runs": store.list_ranking_runs()}, ensure_ascii=False, indent=2))
+
+
+def cmd_maintain_topics(args: argparse.Namespace) -> None:
+    from pipeline import DailyPipeline, PipelineConfig
+
+    pipe = DailyPipeline(PipelineConfig(db_path=args.db, opml_path="", config_dir=args.config))
+    pipe.init()
+    result = pipe.run_topic_maintenance()
+    print(json.dumps({"topic_maintenance": result}, ensure_ascii=False, indent=2))
+
+
+def cmd_relate_topics(args: argparse.Namespace) -> None:
+    from pipeline import DailyPipeline, PipelineConfig
+
+    pipe = DailyPipeline(PipelineConfig(db_path=args.db, opml_path="", config_dir=args.config))
+    pipe.init()
+    result = pipe.run_related_topics(rebuild=args.rebuild)
+    print(json.dumps({"related_topics": result}, ensure_ascii=False, indent=2))
+
+
+def cmd_translate(args: argparse.Namespace) -> None:
+    from pipeline import DailyPipeline, PipelineConfig
+
+    pipe = DailyPipeline(
+        PipelineConfig(db_path=args.db, opml_path="", config_dir=args.config, translate_config=args.translate_config)
+    )
+    pipe.init()
+    result = pipe.run_translate()
+    print(json.dumps({"translate": result}, ensure_ascii=False, indent=2))
+
+
+def cmd_dedup(args: argparse.Namespace) -> None:
+    from db.store import Store
+
+    store = Store(args.db)
+    store.init_db()
+    print(json.dumps(store.index_missing_minhashes(batch_size=args.batch_size), ensure_ascii=False, indent=2))
 
 
 def cmd_serve(args: argparse.Namespace) -> None:
@@ -44,6 +145,33 @@ def cmd_serve(args: argparse.Namespace) -> None:
     uvicorn.run("api.app:app", host=args.host, port=args.port, reload=False)
 
 
+def cmd_compile_dicts(args: argparse.Namespace) -> None:
+    from nlp.artifact import write_artifact
+
+    print(json.dumps(write_artifact(args.config), ensure_ascii=False, indent=2))
+
+
+def cmd_bench_dicts(args: argparse.Namespace) -> None:
+    from bench import bench_dictionaries
+
+    result = bench_dictionaries(config_dir=args.config, db_path=args.db, scale=args.scale, limit=args.limit)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    mismatches = sum(
+        v["parity_mismatches"] + v["batch_parity_mismatches"] for k, v in result.items() if k.startswith("x")
+    )
+    if mismatches:
+        raise SystemExit(f"parity check failed: {mismatches} mismatching posts")
+
+
+def cmd_bench_json(args: argparse.Namespace) -> None:
+    from bench import bench_json
+
+    result = bench_json(db_path=args.db, days=args.days, repeat=args.repeat)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if result["parity_mismatches"]:
+        raise SystemExit(f"parity check failed: {result['parity_mismatches']} endpoints encode differently")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="AI News Daily app")
     sub = parser.add_subparsers(required=True)
@@ -52,20 +180,85 @@ def build_parser() -> argparse.ArgumentParser:
     p_run.add_argument("--db", default="data/ainews.db", help="sqlite db path")
     p_run.add_argument("--opml", default="feeds.opml", help="opml input path")
     p_run.add_argument("--config", default="config", help="config directory")
+    p_run.add_argument("--slow-query-ms", type=float, default=250.0, help="log queries slower than this")
+    p_run.add_argument("--workers", type=int, default=0, help="annotation worker processes (0 = one per core)")
+    p_run.add_argument("--chunk-size", type=int, default=500, help="posts per annotation chunk")
     p_run.set_defaults(func=cmd_run)
 
     p_rank = sub.add_parser("rank", help="recompute rankings")
     p_rank.add_argument("--db", default="data/ainews.db", help="sqlite db path")
     p_rank.add_argument("--opml", default="feeds.opml", help="opml input path")
     p_rank.add_argument("--config", default="config", help="config directory")
+    p_rank.add_argument("--slow-query-ms", type=float, default=250.0, help="log queries slower than this")
+    p_rank.add_argument("--full", action="store_true", help="re-score every topic instead of only changed ones")
     p_rank.set_defaults(func=cmd_rank)
 
+    p_backfill = sub.add_parser("backfill-rankings", help="recompute historical rankings into ranking history")
+    p_backfill.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_backfill.add_argument("--config", default="config", help="config directory")
+    p_backfill.add_argument("--from", dest="start", required=True, help="first as-of time (ISO date/datetime, UTC)")
+    p_backfill.add_argument("--to", dest="end", required=True, help="last as-of time (ISO date/datetime, UTC)")
+    p_backfill.add_argument("--step-hours", type=float, default=24.0, help="hours between as-of times")
+    p_backfill.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per core)")
+    p_backfill.set_defaults(func=cmd_backfill_rankings)
+
+    p_rollback = sub.add_parser("rollback-rankings", help="republish an earlier ranking run")
+    p_rollback.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_rollback.add_argument("--run-id", type=int, default=None, help="run to republish (default: the previous one)")
+    p_rollback.add_argument("--list", action="store_true", help="only list the kept runs")
+    p_rollback.set_defaults(func=cmd_rollback_rankings)
+
+    p_reanno = sub.add_parser("reannotate", help="re-annotate posts affected by taxonomy/entity edits")
+    p_reanno.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_reanno.add_argument("--config", default="config", help="config directory")
+    p_reanno.add_argument("--chunk-size", type=int, default=500, help="posts per checkpointed chunk")
+    p_reanno.set_defaults(func=cmd_reannotate)
+
+    p_maint = sub.add_parser("maintain-topics", help="merge/split topics that changed since the last pass")
+    p_maint.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_maint.add_argument("--config", default="config", help="config directory")
+    p_maint.set_defaults(func=cmd_maintain_topics)
+
+    p_related = sub.add_parser("relate-topics", help="recompute related topics from entity co-occurrence")
+    p_related.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_related.add_argument("--config", default="config", help="config directory")
+    p_related.add_argument("--rebuild", action="store_true", help="recount co-occurrence from stored annotations")
+    p_related.set_defaults(func=cmd_relate_topics)
+
+    p_translate = sub.add_parser("translate", help="pre-translate recent posts within the configured budget")
+    p_translate.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_translate.add_argument("--config", default="config", help="config directory")
+    p_translate.add_argument("--translate-config", default="config/translate.yaml", help="translation config")
+    p_translate.set_defaults(func=cmd_translate)
+
+    p_dedup = sub.add_parser("dedup", help="index existing posts for near-duplicate detection")
+    p_dedup.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_dedup.add_argument("--batch-size", type=int, default=500, help="posts per transaction")
+    p_dedup.set_defaults(func=cmd_dedup)
+
     p_serve = sub.add_parser("serve", help="start API server")
     p_serve.add_argument("--db", default="data/ainews.db", help="sqlite db path")
     p_serve.add_argument("--host", default="0.0.0.0")
     p_serve.add_argument("--port", type=int, default=8000)
     p_serve.set_defaults(func=cmd_serve)
 
+    p_compile = sub.add_parser("compile-dicts", help="precompile dictionaries into a fast-loading artifact")
+    p_compile.add_argument("--config", default="config", help="config directory")
+    p_compile.set_defaults(func=cmd_compile_dicts)
+
+    p_bench = sub.add_parser("bench-dicts", help="check matcher parity and benchmark classify/extract")
+    p_bench.add_argument("--db", default="data/ainews.db", help="sample posts from this db (synthetic text if missing)")
+    p_bench.add_argument("--config", default="config", help="config directory")
+    p_bench.add_argument("--scale", type=int, default=10, help="dictionary size multiplier for the scaled run")
+    p_bench.add_argument("--limit", type=int, default=300, help="number of posts to sample")
+    p_bench.set_defaults(func=cmd_bench_dicts)
+
+    p_bench_json = sub.add_parser("bench-json", help="compare JSON serialization cost per API endpoint")
+    p_bench_json.add_argument("--db", default="data/ainews.db", help="sqlite db path")
+    p_bench_json.add_argument("--days", type=int, default=3, help="most recent days of /api/daily to include")
+    p_bench_json.add_argument("--repeat", type=int, default=20, help="timed repetitions per endpoint")
+    p_bench_json.set_defaults(func=cmd_bench_json)
+
     return parser
 
 
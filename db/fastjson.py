@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    _HAS_ORJSON = False
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON of plain dicts/lists/scalars; orjson when installed, else the standard library."""
+    if _HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_with_raw(items: list[dict], key: str, raw: list[str | bytes | None]) -> bytes:
+    """JSON array of ``items``, each ending with ``key`` set to the already-serialized JSON in ``raw``.
+
+    Stored JSON columns are spliced in as they are instead of being parsed and
+    encoded again for every row.
+    """
+    field = dumps(key) + b":"
+    parts = []
+    for item, value in zip(items, raw):
+        body = dumps(item)
+        if value is None:
+            value = b"null"
+        elif isinstance(value, str):
+            value = value.encode("utf-8")
+        parts.append(body[:-1] + (b"," if len(body) > 2 else b"") + field + value + b"}")
+    return b"[" + b",".join(parts) + b"]"
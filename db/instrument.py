@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Iterator
+
+logger = logging.getLogger("ainews.db")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_WS_RE = re.compile(r"\s+")
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        i = 0
+        while i < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound containing the q-quantile (max_ms for the open bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target and c:
+                bound = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b:g}" for b in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max_ms, 3),
+            "buckets": {k: v for k, v in zip(labels, self.counts) if v},
+        }
+
+
+class _MethodStats:
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.open = LatencyHistogram()
+        self.rows = 0
+        self.statements = 0
+        self.errors = 0
+
+
+class QueryStats:
+    """Thread-safe per-method timing for Store connections, plus a slow-query log.
+
+    A "method" is the Store method (or external function) that opened the
+    connection; its latency is the full lifetime of the ``with store.connect()``
+    block, including commit. Individual statements slower than ``slow_query_ms``
+    are logged with their EXPLAIN QUERY PLAN and kept in a small ring buffer.
+    """
+
+    def __init__(self, slow_query_ms: float | None = 250.0, slow_log_size: int = 50) -> None:
+        self.slow_query_ms = slow_query_ms
+        self._methods: dict[str, _MethodStats] = {}
+        self._slow: deque[dict] = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def record_connection(self, op: str, open_ms: float, elapsed_ms: float, rows: int, statements: int, failed: bool) -> None:
+        with self._lock:
+            m = self._methods.get(op)
+            if m is None:
+                m = self._methods[op] = _MethodStats()
+            m.open.observe(open_ms)
+            m.latency.observe(elapsed_ms)
+            m.rows += rows
+            m.statements += statements
+            if failed:
+                m.errors += 1
+
+    def record_slow(self, op: str, sql: str, elapsed_ms: float, rows: int, plan: list[str]) -> None:
+        entry = {
+            "method": op,
+            "ms": round(elapsed_ms, 3),
+            "rows": rows,
+            "sql": _WS_RE.sub(" ", sql).strip()[:2000],
+            "plan": plan,
+            "at": time.time(),
+        }
+        with self._lock:
+            self._slow.append(entry)
+        logger.warning(
+            "slow query in %s: %.1f ms, %d rows: %s\n  plan: %s",
+            op, elapsed_ms, rows, entry["sql"], " | ".join(plan) or "n/a",
+        )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            methods = {
+                op: {
+                    "calls": m.latency.count,
+                    "statements": m.statements,
+                    "rows": m.rows,
+                    "errors": m.errors,
+                    "latency_ms": m.latency.to_dict(),
+                    "connect_ms": m.open.to_dict(),
+                }
+                for op, m in sorted(self._methods.items())
+            }
+            return {
+                "slow_query_ms": self.slow_query_ms,
+                "methods": methods,
+                "slow_queries": list(self._slow),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._methods.clear()
+            self._slow.clear()
+
+
+class _TimedCursor:
+    """Cursor proxy that finishes timing a statement once its rows are consumed."""
+
+    def __init__(self, conn: "InstrumentedConnection", cursor: sqlite3.Cursor, sql: str, params: Any, elapsed: float) -> None:
+        self._conn = conn
+        self._cursor = cursor
+        self._sql = sql
+        self._params = params
+        self._elapsed = elapsed
+        self._rows = 0
+        self._done = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def _finish(self) -> None:
+        if not self._done:
+            self._done = True
+            self._conn._statement_done(self._sql, self._params, self._elapsed, self._rows)
+
+    def fetchone(self) -> Any:
+        t0 = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._elapsed += time.perf_counter() - t0
+        if row is not None:
+            self._rows += 1
+        self._finish()
+        return row
+
+    def fetchmany(self, size: int | None = None) -> list:
+        t0 = time.perf_counter()
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._elapsed += time.perf_counter() - t0
+        self._rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self) -> list:
+        t0 = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._elapsed += time.perf_counter() - t0
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __iter__(self) -> Iterator:
+        while True:
+            t0 = time.perf_counter()
+            row = self._cursor.fetchone()
+            self._elapsed += time.perf_counter() - t0
+            if row is None:
+                self._finish()
+                return
+            self._rows += 1
+            yield row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection (use as ``factory=``) that times every statement."""
+
+    stats: QueryStats | None = None
+    op: str = "?"
+    rows = 0
+    statements = 0
+
+    def execute(self, sql: str, parameters: Any = (), /) -> Any:  # type: ignore[override]
+        t0 = time.perf_counter()
+        cur = super().execute(sql, parameters)
+        elapsed = time.perf_counter() - t0
+        if cur.description is None:
+            self._statement_done(sql, parameters, elapsed, 0)
+            return cur
+        return _TimedCursor(self, cur, sql, parameters, elapsed)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, /) -> sqlite3.Cursor:  # type: ignore[override]
+        t0 = time.perf_counter()
+        cur = super().executemany(sql, seq_of_parameters)
+        self._statement_done(sql, None, time.perf_counter() - t0, 0)
+        return cur
+
+    def _statement_done(self, sql: str, params: Any, elapsed: float, rows: int) -> None:
+        self.rows += rows
+        self.statements += 1
+        stats = self.stats
+        if stats is None or stats.slow_query_ms is None:
+            return
+        ms = elapsed * 1000.0
+        if ms >= stats.slow_query_ms:
+            stats.record_slow(self.op, sql, ms, rows, self._explain(sql, params))
+
+    def _explain(self, sql: str, params: Any) -> list[str]:
+        head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if head not in {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE"} or params is None:
+            return []
+        try:
+            rows = super().execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        except sqlite3.Error:
+            return []
+        return [str(r[-1]) for r in rows]
+
+
+def caller_op(store_file: str) -> str:
+    """Name of the function that entered ``Store.connect`` (skipping contextlib frames).
+
+    Store methods are reported by bare name (leading underscores dropped, so the
+    cached ``_api_topics`` loader reports as ``api_topics``); callers outside the
+    store module are prefixed with their module name.
+    """
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename == contextlib.__file__:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    name = frame.f_code.co_name
+    if frame.f_code.co_filename == store_file:
+        return name.lstrip("_") or name
+    return f"{frame.f_globals.get('__name__', '?')}.{name}"
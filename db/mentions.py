@@ -0,0 +1,57 @@
+"""Counters derived from stored annotations, shared by the pipeline and the API's first-request bootstrap."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from db.store import Store
+from ranking.burst import _HAS_NUMPY as _HAS_BURST, BurstDetector
+
+
+def mention_times(store: Store, annotations: list[dict]) -> dict[int, float]:
+    """Unix publish time per annotated post; future-dated entries (bad feed timezones) count as now."""
+    brief = store.get_posts_brief([a["post_id"] for a in annotations]) if annotations else {}
+    now = datetime.now(timezone.utc).timestamp()
+    out = {}
+    for post_id, post in brief.items():
+        ts = now
+        if post["published_at"]:
+            # published_at is stored as UTC.
+            ts = min(now, datetime.fromisoformat(post["published_at"]).replace(tzinfo=timezone.utc).timestamp())
+        out[post_id] = ts
+    return out
+
+
+def observe_bursts(
+    store: Store, detector: BurstDetector, annotations: list[dict], times: dict[int, float], weight: float = 1.0
+) -> None:
+    """Count each post's entities and labels once in the burst counters and persist the touched rows.
+
+    A ``weight`` of -1 retracts mentions counted before, e.g. when a post is re-annotated.
+    """
+    for a in annotations:
+        ts = times.get(a["post_id"])
+        if ts is None:
+            continue
+        mentions = {f"entity:{e['id']}": e.get("canonical") or e["id"] for e in a.get("entities", [])}
+        mentions.update((f"label:{lab['id']}", lab["id"]) for lab in a.get("labels", []))
+        for key, name in mentions.items():
+            detector.observe(key, ts, name, weight)
+    store.save_burst_counters(detector.take_dirty(), detector.half_lives_hours)
+
+
+def load_burst_detector(store: Store, cfg: dict) -> BurstDetector | None:
+    """Burst detector holding the persisted counters; None when disabled.
+
+    When none are persisted under the configured half-lives (first run, or the
+    half-lives changed) the counters are rebuilt from the stored annotations.
+    """
+    if not cfg.get("enabled", True) or not _HAS_BURST:
+        return None
+    detector = BurstDetector.from_config(cfg)
+    rows = store.load_burst_counters(detector.half_lives_hours)
+    for row in rows:
+        detector.load(*row)
+    if not rows:
+        for chunk in store.iter_saved_annotations():
+            observe_bursts(store, detector, chunk, mention_times(store, chunk))
+    return detector
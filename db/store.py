@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import json
+import math
 import sqlite3
+import sys
+import time
+import uuid
+from array import array
+from collections import Counter
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+from db.cache import QueryCache
+from db.instrument import InstrumentedConnection, QueryStats, caller_op
+from processor.dedup import MinHashDeduper
 
 
 @dataclass
@@ -100,27 +110,402 @@ CREATE TABLE IF NOT EXISTS hot_rankings (
   resonance REAL NOT NULL,
   UNIQUE(window, computed_at, topic_id)
 );
+
+CREATE TABLE IF NOT EXISTS store_meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS post_annotations (
+  post_id INTEGER PRIMARY KEY,
+  dict_version TEXT NOT NULL,
+  annotated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_post_annotations_version ON post_annotations(dict_version, post_id);
+
+CREATE TABLE IF NOT EXISTS dict_versions (
+  version TEXT PRIMARY KEY,
+  term_map TEXT NOT NULL,
+  created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reannotate_jobs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  from_version TEXT NOT NULL,
+  to_version TEXT NOT NULL,
+  status TEXT NOT NULL,
+  full_rescan INTEGER NOT NULL DEFAULT 0,
+  changed_terms INTEGER NOT NULL DEFAULT 0,
+  candidates INTEGER NOT NULL DEFAULT 0,
+  last_post_id INTEGER NOT NULL DEFAULT 0,
+  reannotated INTEGER NOT NULL DEFAULT 0,
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  UNIQUE(from_version, to_version)
+);
+
+-- Vocabulary and per-post term frequencies from nlp.tokenizer; df counts posts per term.
+CREATE TABLE IF NOT EXISTS terms (
+  term_id INTEGER PRIMARY KEY,
+  term TEXT NOT NULL UNIQUE,
+  df INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS post_terms (
+  post_id INTEGER PRIMARY KEY,
+  n_tokens INTEGER NOT NULL,
+  tf BLOB NOT NULL
+);
+
+-- MinHash signatures and their LSH band buckets (processor.dedup) for near-duplicate lookup.
+CREATE TABLE IF NOT EXISTS post_minhash (
+  post_id INTEGER PRIMARY KEY,
+  signature BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+  band INTEGER NOT NULL,
+  bucket INTEGER NOT NULL,
+  post_id INTEGER NOT NULL,
+  PRIMARY KEY (band, bucket, post_id)
+) WITHOUT ROWID;
+
+-- Semantic clusters (topic_engine.semantic): centroid is the float32 sum of member vectors.
+-- topic_id is set once the cluster reaches min_cluster_size.
+CREATE TABLE IF NOT EXISTS semantic_clusters (
+  cluster_id INTEGER PRIMARY KEY,
+  centroid BLOB NOT NULL,
+  n_posts INTEGER NOT NULL,
+  topic_id TEXT,
+  first_post_at TEXT NOT NULL,
+  last_post_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_semantic_clusters_last ON semantic_clusters(last_post_at);
+
+CREATE TABLE IF NOT EXISTS semantic_cluster_posts (
+  post_id INTEGER PRIMARY KEY,
+  cluster_id INTEGER NOT NULL,
+  similarity REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_semantic_cluster_posts_cluster ON semantic_cluster_posts(cluster_id);
+
+-- Keyword clusters (topic_engine.keyword_cluster): salient-term counts per cluster form the
+-- inverted index; similarity in keyword_cluster_posts is the share of the post's keywords matched.
+CREATE TABLE IF NOT EXISTS keyword_clusters (
+  cluster_id INTEGER PRIMARY KEY,
+  n_posts INTEGER NOT NULL,
+  topic_id TEXT,
+  first_post_at TEXT NOT NULL,
+  last_post_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_clusters_last ON keyword_clusters(last_post_at);
+
+CREATE TABLE IF NOT EXISTS keyword_cluster_terms (
+  cluster_id INTEGER NOT NULL,
+  term TEXT NOT NULL,
+  count INTEGER NOT NULL,
+  PRIMARY KEY (cluster_id, term)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS keyword_cluster_posts (
+  post_id INTEGER PRIMARY KEY,
+  cluster_id INTEGER NOT NULL,
+  similarity REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_keyword_cluster_posts_cluster ON keyword_cluster_posts(cluster_id);
+
+-- Topics merged away by the maintenance pass keep resolving through this map.
+CREATE TABLE IF NOT EXISTS topic_redirects (
+  from_topic_id TEXT PRIMARY KEY,
+  to_topic_id TEXT NOT NULL,
+  reason TEXT NOT NULL,
+  created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_topic_posts_post ON topic_posts(post_id);
+CREATE INDEX IF NOT EXISTS idx_posts_published ON posts(published_at);
+
+-- One row per ranking computation. Rows of hot_rankings carry their run_id;
+-- the API only reads the run named by store_meta 'published_ranking_run'.
+CREATE TABLE IF NOT EXISTS ranking_runs (
+  run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  as_of TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  status TEXT NOT NULL,
+  n_rows INTEGER NOT NULL DEFAULT 0,
+  published_at TEXT
+);
+
+-- Topics whose window stats may have changed since the last published ranking
+-- run; filled by the triggers in RANKING_DIRTY_SQL.
+CREATE TABLE IF NOT EXISTS ranking_dirty_topics (
+  topic_id TEXT PRIMARY KEY
+) WITHOUT ROWID;
+
+-- Compact ranking history. Topics get small integer keys; a history row is
+-- written only when a topic's score inputs change between runs (or it drops
+-- out of the window: n_posts = 0), with scores in fixed point (1e-4) and the
+-- breakdown as separate integer columns. ranking_series holds the last row of
+-- each (window, topic) series, to compare new runs against.
+CREATE TABLE IF NOT EXISTS topic_keys (
+  topic_key INTEGER PRIMARY KEY,
+  topic_id TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS ranking_history (
+  window TEXT NOT NULL,
+  topic_key INTEGER NOT NULL,
+  ts INTEGER NOT NULL,
+  base INTEGER NOT NULL,
+  d INTEGER NOT NULL,
+  q INTEGER NOT NULL,
+  v INTEGER NOT NULL,
+  resonance INTEGER NOT NULL,
+  n_posts INTEGER NOT NULL,
+  n_blogs INTEGER NOT NULL,
+  n_prev INTEGER NOT NULL,
+  latest INTEGER,
+  PRIMARY KEY (window, topic_key, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ranking_series (
+  window TEXT NOT NULL,
+  topic_key INTEGER NOT NULL,
+  ts INTEGER NOT NULL,
+  base INTEGER NOT NULL,
+  d INTEGER NOT NULL,
+  q INTEGER NOT NULL,
+  v INTEGER NOT NULL,
+  resonance INTEGER NOT NULL,
+  n_posts INTEGER NOT NULL,
+  n_blogs INTEGER NOT NULL,
+  n_prev INTEGER NOT NULL,
+  latest INTEGER,
+  PRIMARY KEY (window, topic_key)
+) WITHOUT ROWID;
+
+-- Entity co-occurrence: weight sums 2**((published - epoch) / half_life) over posts
+-- mentioning both a and b (a <= b; a = b is the entity's own count, ('', '') all posts).
+-- The epoch (store_meta 'cooccurrence_epoch') moves forward with the newest post, every
+-- weight being rescaled when it does.
+CREATE TABLE IF NOT EXISTS entity_cooccurrence (
+  a TEXT NOT NULL,
+  b TEXT NOT NULL,
+  weight REAL NOT NULL,
+  PRIMARY KEY (a, b)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entity_cooccurrence_b ON entity_cooccurrence(b);
+
+CREATE TABLE IF NOT EXISTS topic_related (
+  topic_id TEXT NOT NULL,
+  rank INTEGER NOT NULL,
+  related_topic_id TEXT NOT NULL,
+  score REAL NOT NULL,
+  computed_at TEXT NOT NULL,
+  PRIMARY KEY (topic_id, rank)
+) WITHOUT ROWID;
+
+-- Machine translations keyed by a hash of the source segment (translate.service.source_hash).
+CREATE TABLE IF NOT EXISTS translation_cache (
+  src_hash TEXT NOT NULL,
+  target TEXT NOT NULL,
+  translated TEXT NOT NULL,
+  provider TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  PRIMARY KEY (src_hash, target)
+) WITHOUT ROWID;
+
+-- Pre-translated post fields from run_translate; text is the provider output,
+-- "" when the source needs none (empty or already Chinese).
+CREATE TABLE IF NOT EXISTS post_translations (
+  post_id INTEGER NOT NULL,
+  field TEXT NOT NULL,
+  target TEXT NOT NULL,
+  text TEXT NOT NULL,
+  translated_at TEXT NOT NULL,
+  PRIMARY KEY (post_id, field, target)
+) WITHOUT ROWID;
+
+-- Precomputed JSON bodies of hot endpoints (db/views.py) from run_response_blobs;
+-- served while cache_version() still equals version and, if set, before expires_at (Unix time).
+CREATE TABLE IF NOT EXISTS response_blobs (
+  key TEXT PRIMARY KEY,
+  version TEXT NOT NULL,
+  body BLOB NOT NULL,
+  built_at TEXT NOT NULL,
+  expires_at REAL
+) WITHOUT ROWID;
+
+-- Decayed mention counters of entities/labels for burst detection; counts is one
+-- little-endian float64 per half-life in store_meta 'burst_half_lives', as of updated.
+CREATE TABLE IF NOT EXISTS burst_counters (
+  key TEXT PRIMARY KEY,
+  name TEXT NOT NULL,
+  updated REAL NOT NULL,
+  counts BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Created after the ALTERs in init_db (posts.duplicate_of may be new).
+RANKING_DIRTY_SQL = """
+CREATE TRIGGER IF NOT EXISTS topic_posts_rank_ai AFTER INSERT ON topic_posts BEGIN
+  INSERT OR IGNORE INTO ranking_dirty_topics(topic_id) VALUES (new.topic_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS topic_posts_rank_ad AFTER DELETE ON topic_posts BEGIN
+  INSERT OR IGNORE INTO ranking_dirty_topics(topic_id) VALUES (old.topic_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS topic_posts_rank_au AFTER UPDATE ON topic_posts BEGIN
+  INSERT OR IGNORE INTO ranking_dirty_topics(topic_id) VALUES (old.topic_id), (new.topic_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS posts_rank_dup AFTER UPDATE OF duplicate_of ON posts BEGIN
+  INSERT OR IGNORE INTO ranking_dirty_topics(topic_id) SELECT topic_id FROM topic_posts WHERE post_id = new.id;
+END;
+"""
+
+# Trigram full-text index over post text, used to find posts containing changed
+# dictionary terms. Optional: skipped when SQLite lacks FTS5/trigram support.
+POSTS_FTS_SQL = """
+CREATE VIRTUAL TABLE posts_fts USING fts5(
+  title, summary, content,
+  content='posts', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+  INSERT INTO posts_fts(rowid, title, summary, content) VALUES (new.id, new.title, new.summary, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+  INSERT INTO posts_fts(posts_fts, rowid, title, summary, content)
+  VALUES ('delete', old.id, old.title, old.summary, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, summary, content ON posts BEGIN
+  INSERT INTO posts_fts(posts_fts, rowid, title, summary, content)
+  VALUES ('delete', old.id, old.title, old.summary, old.content);
+  INSERT INTO posts_fts(rowid, title, summary, content) VALUES (new.id, new.title, new.summary, new.content);
+END;
+
+INSERT INTO posts_fts(posts_fts) VALUES ('rebuild');
 """
 
+# Trigram MATCH cannot find substrings shorter than this.
+FTS_MIN_TERM_CHARS = 3
+
+_TF_COUNT_MAX = 0xFFFF
+
+# Fixed-point scale of scores in ranking_history.
+_HISTORY_SCALE = 10000
+_HISTORY_COLS = ("base", "d", "q", "v", "resonance", "n_posts", "n_blogs", "n_prev", "latest")
+
+# Julian day number of 1970-01-01T00:00:00Z, to compare SQLite julianday() with Unix time.
+_UNIX_EPOCH_JD = 2440587.5
+
+# Half-lives a post may be newer than the entity_cooccurrence epoch before the epoch moves
+# up to it, keeping pre-scaled weights within 2**this.
+_COOCCURRENCE_REBASE = 16.0
+
+
+def _pack_tf(tf: dict[int, int]) -> bytes:
+    """Encode {term_id: count} as little-endian uint32 ids followed by uint16 counts."""
+    ids = array("I", sorted(tf))
+    counts = array("H", (min(tf[i], _TF_COUNT_MAX) for i in ids))
+    if sys.byteorder == "big":
+        ids.byteswap()
+        counts.byteswap()
+    return ids.tobytes() + counts.tobytes()
+
+
+def _unpack_tf(blob: bytes) -> dict[int, int]:
+    n = len(blob) // 6
+    ids = array("I")
+    counts = array("H")
+    ids.frombytes(blob[: n * 4])
+    counts.frombytes(blob[n * 4 :])
+    if sys.byteorder == "big":
+        ids.byteswap()
+        counts.byteswap()
+    return dict(zip(ids, counts))
+
+
+# kind -> (clusters table, membership table) for the topic clustering engines.
+_CLUSTER_TABLES = {
+    "semantic": ("semantic_clusters", "semantic_cluster_posts"),
+    "keyword": ("keyword_clusters", "keyword_cluster_posts"),
+}
+
+
+def _cluster_evidence(kind: str, r: sqlite3.Row) -> str:
+    return json.dumps(
+        {"mode": f"{kind}_cluster", "cluster_id": int(r["cluster_id"]), "similarity": round(float(r["similarity"]), 4)}
+    )
+
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 class Store:
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(
+        self,
+        db_path: str | Path,
+        cache_size: int = 256,
+        cache_ttl_seconds: float = 300.0,
+        generation_check_interval: float = 1.0,
+        slow_query_ms: float | None = 250.0,
+        deduper: MinHashDeduper | None = None,
+        read_only: bool = False,
+    ) -> None:
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.query_cache = QueryCache(maxsize=cache_size, ttl_seconds=cache_ttl_seconds)
+        # The generation lives in the DB so writers in other processes (the pipeline)
+        # invalidate this process's cache; it is re-read at most once per interval.
+        self.generation_check_interval = generation_check_interval
+        self._generation = 0
+        self._cache_version = ""
+        self._generation_checked_at = float("-inf")
+        self.query_stats = QueryStats(slow_query_ms=slow_query_ms)
+        self.deduper = deduper or MinHashDeduper()
 
     @contextmanager
     def connect(self):
-        conn = sqlite3.connect(self.db_path)
+        op = caller_op(__file__)
+        t0 = time.perf_counter()
+        if self.read_only:
+            conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, factory=InstrumentedConnection)
+        else:
+            conn = sqlite3.connect(self.db_path, factory=InstrumentedConnection)
+        opened = time.perf_counter()
+        conn.stats = self.query_stats
+        conn.op = op
         conn.row_factory = sqlite3.Row
+        failed = True
         try:
             yield conn
             conn.commit()
+            failed = False
         finally:
             conn.close()
+            self.query_stats.record_connection(
+                op,
+                open_ms=(opened - t0) * 1000.0,
+                elapsed_ms=(time.perf_counter() - t0) * 1000.0,
+                rows=conn.rows,
+                statements=conn.statements,
+                failed=failed,
+            )
 
     def init_db(self) -> None:
         with self.connect() as conn:
@@ -132,11 +517,94 @@ class Store:
                 # V2: full-text source tracking and paywall detection
                 "ALTER TABLE posts ADD COLUMN content_source TEXT",
                 "ALTER TABLE posts ADD COLUMN paywall_detected INTEGER DEFAULT 0",
+                # Near-duplicate of an earlier post (MinHash/LSH); such posts are not annotated or ranked.
+                "ALTER TABLE posts ADD COLUMN duplicate_of INTEGER",
+                # Ranking run (ranking_runs) a hot_rankings row belongs to.
+                "ALTER TABLE hot_rankings ADD COLUMN run_id INTEGER",
+                # Score without the recency term and the post it decays from; the API
+                # applies the decay at read time, so unchanged topics need no re-scoring.
+                "ALTER TABLE hot_rankings ADD COLUMN base_score REAL",
+                "ALTER TABLE hot_rankings ADD COLUMN latest_post_at TEXT",
+                "ALTER TABLE ranking_runs ADD COLUMN recency_weight REAL",
+                "ALTER TABLE ranking_runs ADD COLUMN recency_tau_hours REAL",
+                "ALTER TABLE ranking_runs ADD COLUMN config_hash TEXT",
+                "ALTER TABLE ranking_runs ADD COLUMN n_scored INTEGER",
             ):
                 try:
                     conn.execute(sql)
                 except sqlite3.OperationalError:
                     pass
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_hot_rankings_run ON hot_rankings(run_id, window, hot_score)")
+            # Generations count from zero in every database; the id tells two databases apart.
+            conn.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('store_id', ?)", (uuid.uuid4().hex[:12],))
+            conn.executescript(RANKING_DIRTY_SQL)
+            self._adopt_legacy_rankings(conn)
+            has_fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name='posts_fts'").fetchone()
+            if not has_fts:
+                try:
+                    conn.executescript(POSTS_FTS_SQL)
+                except sqlite3.OperationalError:
+                    pass
+
+    def _adopt_legacy_rankings(self, conn: sqlite3.Connection) -> None:
+        """Wrap rankings written before ranking runs existed into one published run."""
+        legacy = conn.execute(
+            "SELECT COUNT(*) AS n, MAX(computed_at) AS as_of FROM hot_rankings WHERE run_id IS NULL"
+        ).fetchone()
+        if not legacy["n"]:
+            return
+        now = utc_now_iso()
+        run_id = conn.execute(
+            "INSERT INTO ranking_runs (as_of, created_at, status, n_rows, published_at) VALUES (?, ?, 'published', ?, ?)",
+            (legacy["as_of"], now, legacy["n"], now),
+        ).lastrowid
+        conn.execute("UPDATE hot_rankings SET run_id = ? WHERE run_id IS NULL", (run_id,))
+        self._set_published_run(conn, run_id)
+
+    def fts_available(self) -> bool:
+        with self.connect() as conn:
+            return conn.execute("SELECT 1 FROM sqlite_master WHERE name='posts_fts'").fetchone() is not None
+
+    def _bump_generation(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            INSERT INTO store_meta (key, value) VALUES ('data_generation', '1')
+            ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+            """
+        )
+        # Force the next cached read to pick up the new value once this transaction commits.
+        self._generation_checked_at = float("-inf")
+
+    def data_generation(self) -> int:
+        now = time.monotonic()
+        if now - self._generation_checked_at < self.generation_check_interval:
+            return self._generation
+        with self.connect() as conn:
+            meta = {
+                r["key"]: r["value"]
+                for r in conn.execute(
+                    "SELECT key, value FROM store_meta WHERE key IN ('data_generation', 'translation_generation', 'store_id')"
+                )
+            }
+        self._generation = int(meta.get("data_generation") or 0)
+        self._cache_version = f"{meta.get('store_id', '')}.{self._generation}.{meta.get('translation_generation', 0)}"
+        self._generation_checked_at = now
+        return self._generation
+
+    def cache_version(self) -> str:
+        """Database id, data generation and pretranslation generation; changes whenever API responses may."""
+        self.data_generation()
+        return self._cache_version
+
+    def _cached(self, name: str, params: tuple, compute: Callable[[], Any]) -> Any:
+        key: Hashable = (name, params)
+        return self.query_cache.get_or_compute(key, self.data_generation(), compute)
+
+    def cache_stats(self) -> dict:
+        return self.query_cache.stats()
+
+    def db_stats(self) -> dict:
+        return self.query_stats.snapshot()
 
     def feed_count(self) -> int:
         with self.connect() as conn:
@@ -179,6 +647,7 @@ class Store:
                 """,
                 (feed_url, title, site_url),
             )
+            self._bump_generation(conn)
             row = conn.execute("SELECT id FROM feeds WHERE feed_url=?", (feed_url,)).fetchone()
             return int(row["id"])
 
@@ -188,6 +657,7 @@ class Store:
                 conn.execute("UPDATE feeds SET source_topic=? WHERE id=?", (source_topic, feed_id))
             if source_status is not None:
                 conn.execute("UPDATE feeds SET source_status=? WHERE id=?", (source_status, feed_id))
+            self._bump_generation(conn)
 
     def mark_feed_fetch(self, feed_id: int, ok: bool) -> None:
         with self.connect() as conn:
@@ -201,11 +671,21 @@ class Store:
                     "UPDATE feeds SET error_count=error_count+1, last_fetch_at=? WHERE id=?",
                     (utc_now_iso(), feed_id),
                 )
+            self._bump_generation(conn)
 
     def insert_posts(self, posts: Iterable[PostRecord]) -> list[int]:
+        """Insert new posts, refreshing exact duplicates; near-duplicates are inserted but linked.
+
+        A new post whose MinHash signature matches an indexed post (see
+        ``processor.dedup``) gets ``duplicate_of`` set to that post's canonical
+        id, which keeps it out of annotation, fulltext fetches and rankings.
+        """
+        posts = list(posts)
+        # Hash outside the transaction so the write lock is held only for SQL.
+        signatures = [self.deduper.signature(self._dedup_text(p.title, p.summary, p.content)) for p in posts]
         inserted = []
         with self.connect() as conn:
-            for p in posts:
+            for p, signature in zip(posts, signatures):
                 try:
                     cur = conn.execute(
                         """
@@ -232,6 +712,8 @@ class Store:
                         ),
                     )
                     inserted.append(cur.lastrowid)
+                    if signature is not None:
+                        self._index_minhash(conn, cur.lastrowid, signature)
                 except sqlite3.IntegrityError:
                     # Existing post: refresh key metadata so parser fixes can correct old rows.
                     conn.execute(
@@ -261,8 +743,89 @@ class Store:
                         ),
                     )
                     continue
+            self._bump_generation(conn)
         return inserted
 
+    @staticmethod
+    def _dedup_text(title: str | None, summary: str | None, content: str | None) -> str:
+        # Syndicated copies often carry only a summary; compare against the longer body.
+        body = content if len(content or "") >= len(summary or "") else summary
+        return f"{title or ''}\n{body or ''}"
+
+    def _index_minhash(self, conn: sqlite3.Connection, post_id: int, signature: list[int]) -> int | None:
+        """Link ``post_id`` to its best near-duplicate (if any), then add it to the LSH index."""
+        d = self.deduper
+        keys = d.band_keys(signature)
+        where = " OR ".join("(band = ? AND bucket = ?)" for _ in keys)
+        params = [x for band, key in enumerate(keys) for x in (band, key)]
+        candidates = conn.execute(
+            f"""
+            SELECT m.post_id, m.signature, COALESCE(p.duplicate_of, p.id) AS canonical_id
+            FROM post_minhash m
+            JOIN posts p ON p.id = m.post_id
+            WHERE m.post_id IN (SELECT DISTINCT post_id FROM lsh_buckets WHERE {where})
+            """,
+            params,
+        ).fetchall()
+        best: tuple[float, int] | None = None
+        for r in candidates:
+            sim = d.similarity(signature, d.unpack(r["signature"]))
+            if sim >= d.threshold and (best is None or (sim, -r["canonical_id"]) > (best[0], -best[1])):
+                best = (sim, int(r["canonical_id"]))
+        duplicate_of = best[1] if best else None
+        if duplicate_of is not None:
+            conn.execute("UPDATE posts SET duplicate_of = ? WHERE id = ?", (duplicate_of, post_id))
+        conn.execute("INSERT OR REPLACE INTO post_minhash (post_id, signature) VALUES (?, ?)", (post_id, d.pack(signature)))
+        conn.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (band, bucket, post_id) VALUES (?, ?, ?)",
+            [(band, key, post_id) for band, key in enumerate(keys)],
+        )
+        return duplicate_of
+
+    def index_missing_minhashes(self, batch_size: int = 500) -> dict:
+        """Sign and index posts inserted before near-duplicate detection existed, oldest first."""
+        indexed = duplicates = 0
+        last_id = 0
+        while True:
+            with self.connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT p.id, p.title, p.summary, p.content
+                    FROM posts p
+                    WHERE p.id > ?
+                      AND NOT EXISTS (SELECT 1 FROM post_minhash m WHERE m.post_id = p.id)
+                    ORDER BY p.id
+                    LIMIT ?
+                    """,
+                    (last_id, batch_size),
+                ).fetchall()
+                for r in rows:
+                    signature = self.deduper.signature(self._dedup_text(r["title"], r["summary"], r["content"]))
+                    if signature is None:
+                        continue
+                    indexed += 1
+                    if self._index_minhash(conn, int(r["id"]), signature) is not None:
+                        duplicates += 1
+                if duplicates:
+                    self._bump_generation(conn)
+            if len(rows) < batch_size:
+                return {"indexed": indexed, "duplicates": duplicates}
+            last_id = int(rows[-1]["id"])
+
+    def count_duplicates(self, post_ids: list[int]) -> int:
+        if not post_ids:
+            return 0
+        with self.connect() as conn:
+            total = 0
+            for i in range(0, len(post_ids), 500):
+                batch = post_ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                row = conn.execute(
+                    f"SELECT COUNT(*) AS cnt FROM posts WHERE duplicate_of IS NOT NULL AND id IN ({placeholders})", batch
+                ).fetchone()
+                total += int(row["cnt"])
+            return total
+
     def list_posts_needing_fulltext(self, min_chars: int = 500, limit: int = 200) -> list[sqlite3.Row]:
         """Return posts whose stored content is shorter than min_chars and not yet enriched."""
         with self.connect() as conn:
@@ -271,6 +834,7 @@ class Store:
                 SELECT id, url
                 FROM posts
                 WHERE (content_source IS NULL OR content_source = 'rss_summary')
+                  AND duplicate_of IS NULL
                   AND length(COALESCE(content, '')) < ?
                   AND url IS NOT NULL AND url != ''
                 ORDER BY published_at DESC
@@ -291,6 +855,7 @@ class Store:
                 """,
                 (content, content_source, 1 if paywall_detected else 0, post_id),
             )
+            self._bump_generation(conn)
 
     def add_labels(self, post_id: int, labels: list[dict]) -> None:
         with self.connect() as conn:
@@ -302,6 +867,7 @@ class Store:
                     """,
                     (post_id, item["id"], item["score"], 1 if item.get("primary") else 0),
                 )
+            self._bump_generation(conn)
 
     def add_entities(self, post_id: int, entities: list[dict]) -> None:
         with self.connect() as conn:
@@ -314,11 +880,163 @@ class Store:
                     """,
                     (post_id, e["id"], e["canonical"], e["type"], e["confidence"]),
                 )
+            self._bump_generation(conn)
 
-    def upsert_topic(self, topic_id: str, topic_type: str, title: str, primary_entity_id: str | None) -> None:
+    def iter_unlabeled_posts(self, chunk_size: int = 500) -> Iterator[list[tuple]]:
+        """Yield never-annotated posts as (id, title, summary, content) tuples in ID-ordered chunks.
+
+        Keyset pagination: each chunk is read on its own short connection, so only
+        one chunk is held in memory and writers are never blocked by a long read.
+        """
+        last_id = 0
+        while True:
+            with self.connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT p.id, p.title, p.summary, p.content
+                    FROM posts p
+                    WHERE p.id > ?
+                      AND p.duplicate_of IS NULL
+                      AND NOT EXISTS (SELECT 1 FROM post_annotations pa WHERE pa.post_id = p.id)
+                    ORDER BY p.id
+                    LIMIT ?
+                    """,
+                    (last_id, chunk_size),
+                ).fetchall()
+            if not rows:
+                return
+            last_id = int(rows[-1]["id"])
+            yield [(int(r["id"]), r["title"] or "", r["summary"] or "", r["content"] or "") for r in rows]
+            if len(rows) < chunk_size:
+                return
+
+    def iter_saved_annotations(self, chunk_size: int = 500) -> Iterator[list[dict]]:
+        """Yield the stored labels and entities of annotated posts, shaped like annotator output, in ID-ordered chunks.
+
+        Items carry post_id, labels ({"id"}) and entities ({"id", "canonical"},
+        most confident first); used to rebuild counters derived from annotations.
+        """
+        last_id = 0
+        while True:
+            with self.connect() as conn:
+                ids = [
+                    int(r["post_id"])
+                    for r in conn.execute(
+                        """
+                        SELECT pa.post_id FROM post_annotations pa
+                        JOIN posts p ON p.id = pa.post_id
+                        WHERE pa.post_id > ? AND p.duplicate_of IS NULL
+                        ORDER BY pa.post_id
+                        LIMIT ?
+                        """,
+                        (last_id, chunk_size),
+                    )
+                ]
+                if not ids:
+                    return
+                items = self._saved_annotations(conn, ids)
+            last_id = ids[-1]
+            yield items
+            if len(ids) < chunk_size:
+                return
+
+    def saved_annotations(self, post_ids: list[int]) -> list[dict]:
+        """Stored annotations of ``post_ids`` that are not duplicates, shaped like ``iter_saved_annotations`` items."""
+        out: list[dict] = []
+        with self.connect() as conn:
+            for i in range(0, len(post_ids), 500):
+                batch = post_ids[i : i + 500]
+                marks = ",".join("?" for _ in batch)
+                ids = [
+                    int(r["post_id"])
+                    for r in conn.execute(
+                        f"""
+                        SELECT pa.post_id FROM post_annotations pa
+                        JOIN posts p ON p.id = pa.post_id
+                        WHERE pa.post_id IN ({marks}) AND p.duplicate_of IS NULL
+                        ORDER BY pa.post_id
+                        """,
+                        batch,
+                    )
+                ]
+                if ids:
+                    out.extend(self._saved_annotations(conn, ids))
+        return out
+
+    @staticmethod
+    def _saved_annotations(conn: sqlite3.Connection, ids: list[int]) -> list[dict]:
+        items = {pid: {"post_id": pid, "labels": [], "entities": []} for pid in ids}
+        marks = ",".join("?" for _ in ids)
+        for r in conn.execute(f"SELECT post_id, label_id FROM post_labels WHERE post_id IN ({marks})", ids):
+            items[int(r["post_id"])]["labels"].append({"id": r["label_id"]})
+        for r in conn.execute(
+            f"""
+            SELECT post_id, entity_id, canonical_name FROM post_entities
+            WHERE post_id IN ({marks})
+            ORDER BY confidence DESC, entity_id
+            """,
+            ids,
+        ):
+            items[int(r["post_id"])]["entities"].append({"id": r["entity_id"], "canonical": r["canonical_name"]})
+        return list(items.values())
+
+    def save_annotations(self, annotations: Iterable[dict], dict_version: str = "", replace: bool = False) -> int:
+        """Write labels, entities and topic bindings for many posts in one transaction.
+
+        Each item carries post_id, labels, entities and optionally a topic dict
+        (topic_id, topic_type, title, primary_entity_id, evidence) and the post's
+        term frequencies (terms, n_tokens). Every post is stamped with
+        ``dict_version``; with ``replace`` its previous labels, entities and
+        topic bindings are dropped first. Returns the number of topic bindings
+        written.
+        """
+        annotations = list(annotations)
         now = utc_now_iso()
+        label_rows: list[tuple] = []
+        entity_rows: list[tuple] = []
+        topic_rows: dict[str, tuple] = {}
+        bind_rows: list[tuple] = []
+        for a in annotations:
+            post_id = a["post_id"]
+            for item in a["labels"]:
+                label_rows.append((post_id, item["id"], item["score"], 1 if item.get("primary") else 0))
+            for e in a["entities"]:
+                entity_rows.append((post_id, e["id"], e["canonical"], e["type"], e["confidence"]))
+            topic = a.get("topic")
+            if topic:
+                topic_rows[topic["topic_id"]] = (
+                    topic["topic_id"], topic["topic_type"], topic["title"], topic["primary_entity_id"], now, now,
+                )
+                bind_rows.append(
+                    (topic["topic_id"], post_id, topic.get("score", 1.0), json.dumps(topic["evidence"], ensure_ascii=False))
+                )
+        post_ids = [(a["post_id"],) for a in annotations]
         with self.connect() as conn:
-            conn.execute(
+            # Topics merged away (entity topics are rebuilt from the same id) bind to the survivor instead.
+            redirects = self._topic_redirects(conn, list(topic_rows))
+            if redirects:
+                topic_rows = {t: row for t, row in topic_rows.items() if t not in redirects}
+                bind_rows = [(redirects.get(r[0], r[0]), *r[1:]) for r in bind_rows]
+            if replace:
+                conn.executemany("DELETE FROM post_labels WHERE post_id=?", post_ids)
+                conn.executemany("DELETE FROM post_entities WHERE post_id=?", post_ids)
+                conn.executemany("DELETE FROM topic_posts WHERE post_id=?", post_ids)
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO post_labels (post_id, label_id, score, primary_label)
+                VALUES (?, ?, ?, ?)
+                """,
+                label_rows,
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO post_entities (
+                  post_id, entity_id, canonical_name, entity_type, confidence
+                ) VALUES (?, ?, ?, ?, ?)
+                """,
+                entity_rows,
+            )
+            conn.executemany(
                 """
                 INSERT INTO topics (topic_id, topic_type, title, primary_entity_id, created_at, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?)
@@ -326,160 +1044,1913 @@ class Store:
                   title=excluded.title,
                   updated_at=excluded.updated_at
                 """,
-                (topic_id, topic_type, title, primary_entity_id, now, now),
+                list(topic_rows.values()),
             )
-
-    def bind_post_topic(self, topic_id: str, post_id: int, score: float, evidence: dict) -> None:
-        with self.connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO topic_posts (topic_id, post_id, score, evidence)
                 VALUES (?, ?, ?, ?)
                 """,
-                (topic_id, post_id, score, json.dumps(evidence, ensure_ascii=False)),
+                bind_rows,
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO post_annotations (post_id, dict_version, annotated_at) VALUES (?, ?, ?)",
+                [(pid, dict_version, now) for (pid,) in post_ids],
             )
+            term_rows = [(a["post_id"], a["n_tokens"], a["terms"]) for a in annotations if a.get("terms") is not None]
+            if term_rows:
+                self._write_post_terms(conn, term_rows)
+            self._bump_generation(conn)
+        return len(bind_rows)
 
-    def list_topics_with_stats(self, window_hours: int) -> list[sqlite3.Row]:
-        with self.connect() as conn:
-            return conn.execute(
-                """
-                WITH current_posts AS (
-                  SELECT tp.topic_id, p.id AS post_id, p.blog_id, p.published_at
-                  FROM topic_posts tp
-                  JOIN posts p ON p.id = tp.post_id
-                  WHERE datetime(p.published_at) >= datetime('now', ?)
-                ),
-                prev_posts AS (
-                  SELECT tp.topic_id, COUNT(*) AS cnt
-                  FROM topic_posts tp
-                  JOIN posts p ON p.id = tp.post_id
-                  WHERE datetime(p.published_at) < datetime('now', ?)
-                    AND datetime(p.published_at) >= datetime('now', ?)
-                  GROUP BY tp.topic_id
+    @staticmethod
+    def _topic_redirects(conn: sqlite3.Connection, topic_ids: list[str]) -> dict[str, str]:
+        """from_topic_id -> to_topic_id for the redirected ids among ``topic_ids`` (redirects are kept one hop)."""
+        out: dict[str, str] = {}
+        for i in range(0, len(topic_ids), 500):
+            batch = topic_ids[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            out.update(
+                (r["from_topic_id"], r["to_topic_id"])
+                for r in conn.execute(
+                    f"SELECT from_topic_id, to_topic_id FROM topic_redirects WHERE from_topic_id IN ({placeholders})", batch
                 )
-                SELECT
-                  t.topic_id,
-                  t.title,
-                  COUNT(cp.post_id) AS n_posts,
-                  COUNT(DISTINCT cp.blog_id) AS n_blogs,
-                  COALESCE(pp.cnt, 0) AS n_prev,
-                  MAX(cp.published_at) AS latest_post_at
-                FROM topics t
-                JOIN current_posts cp ON cp.topic_id = t.topic_id
-                LEFT JOIN prev_posts pp ON pp.topic_id = t.topic_id
-                GROUP BY t.topic_id, t.title, pp.cnt
-                """,
-                (f"-{window_hours} hours", f"-{window_hours} hours", f"-{window_hours * 2} hours"),
-            ).fetchall()
+            )
+        return out
 
-    def clear_window_rankings(self, window: str) -> None:
+    def save_post_terms(self, items: Iterable[tuple[int, int, dict[str, int]]]) -> None:
+        """Store (post_id, n_tokens, {term: count}) rows, replacing earlier terms of those posts."""
         with self.connect() as conn:
-            conn.execute("DELETE FROM hot_rankings WHERE window=?", (window,))
+            self._write_post_terms(conn, list(items))
 
-    def insert_ranking(self, window: str, topic_id: str, hot_score: float, breakdown: dict, cross_hot: bool, resonance: float) -> None:
-        with self.connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO hot_rankings (
-                  window, computed_at, topic_id, hot_score, breakdown_json, cross_blogger_hot, resonance
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    window,
-                    utc_now_iso(),
-                    topic_id,
-                    hot_score,
-                    json.dumps(breakdown, ensure_ascii=False),
-                    1 if cross_hot else 0,
-                    resonance,
-                ),
+    def _write_post_terms(self, conn: sqlite3.Connection, items: list[tuple[int, int, dict[str, int]]]) -> None:
+        self._drop_post_terms(conn, [post_id for post_id, _, _ in items])
+        vocab = sorted({term for _, _, tf in items for term in tf})
+        conn.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", [(t,) for t in vocab])
+        term_ids: dict[str, int] = {}
+        for i in range(0, len(vocab), 500):
+            batch = vocab[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            term_ids.update(
+                (r["term"], int(r["term_id"]))
+                for r in conn.execute(f"SELECT term_id, term FROM terms WHERE term IN ({placeholders})", batch)
             )
+        df: Counter[int] = Counter()
+        rows = []
+        for post_id, n_tokens, tf in items:
+            packed = {term_ids[t]: c for t, c in tf.items()}
+            df.update(packed.keys())
+            rows.append((post_id, n_tokens, _pack_tf(packed)))
+        conn.executemany("INSERT INTO post_terms (post_id, n_tokens, tf) VALUES (?, ?, ?)", rows)
+        conn.executemany("UPDATE terms SET df = df + ? WHERE term_id = ?", [(n, tid) for tid, n in df.items()])
+
+    def _drop_post_terms(self, conn: sqlite3.Connection, post_ids: list[int]) -> None:
+        df: Counter[int] = Counter()
+        dropped: list[tuple[int]] = []
+        for i in range(0, len(post_ids), 500):
+            batch = post_ids[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            for r in conn.execute(f"SELECT post_id, tf FROM post_terms WHERE post_id IN ({placeholders})", batch):
+                df.update(_unpack_tf(r["tf"]).keys())
+                dropped.append((int(r["post_id"]),))
+        if dropped:
+            conn.executemany("DELETE FROM post_terms WHERE post_id = ?", dropped)
+            conn.executemany("UPDATE terms SET df = df - ? WHERE term_id = ?", [(n, tid) for tid, n in df.items()])
+
+    def term_idf(self, terms: Iterable[str]) -> dict[str, float]:
+        """Smoothed inverse document frequency, log((1 + N) / (1 + df)), over posts with saved terms."""
+        terms = sorted(set(terms))
+        with self.connect() as conn:
+            n_docs = int(conn.execute("SELECT COUNT(*) AS cnt FROM post_terms").fetchone()["cnt"])
+            df: dict[str, int] = {}
+            for i in range(0, len(terms), 500):
+                batch = terms[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                df.update(
+                    (r["term"], int(r["df"]))
+                    for r in conn.execute(f"SELECT term, df FROM terms WHERE term IN ({placeholders})", batch)
+                )
+        return {t: math.log((1 + n_docs) / (1 + df.get(t, 0))) for t in terms}
+
+    def get_posts_brief(self, post_ids: list[int]) -> dict[int, sqlite3.Row]:
+        out: dict[int, sqlite3.Row] = {}
+        with self.connect() as conn:
+            for i in range(0, len(post_ids), 500):
+                batch = post_ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for r in conn.execute(
+                    f"SELECT id, title, blog_id, published_at FROM posts WHERE id IN ({placeholders})", batch
+                ):
+                    out[int(r["id"])] = r
+        return out
 
-    def api_topics(self, window: str, sort: str = "hot") -> list[sqlite3.Row]:
-        order_by = "hot_score DESC" if sort == "hot" else "resonance DESC"
+    def load_semantic_clusters(self, since: str) -> list[sqlite3.Row]:
+        """Clusters with a post published at or after ``since`` (ISO timestamp)."""
         with self.connect() as conn:
             return conn.execute(
-                f"""
-                SELECT hr.window, hr.topic_id, t.title, hr.hot_score,
-                       hr.cross_blogger_hot, hr.resonance, hr.breakdown_json
-                FROM hot_rankings hr
-                JOIN topics t ON t.topic_id = hr.topic_id
-                WHERE hr.window = ?
-                ORDER BY {order_by}
-                LIMIT 200
+                """
+                SELECT cluster_id, centroid, n_posts
+                FROM semantic_clusters
+                WHERE last_post_at >= ?
+                ORDER BY cluster_id
                 """,
-                (window,),
+                (since,),
             ).fetchall()
 
-    def api_topic_detail(self, topic_id: str) -> dict | None:
+    def load_keyword_clusters(self, since: str) -> tuple[list[sqlite3.Row], list[sqlite3.Row]]:
+        """Active keyword clusters and their (cluster_id, term, count) rows."""
         with self.connect() as conn:
-            topic = conn.execute("SELECT * FROM topics WHERE topic_id=?", (topic_id,)).fetchone()
-            if not topic:
-                return None
-            posts = conn.execute(
+            clusters = conn.execute(
+                "SELECT cluster_id, n_posts FROM keyword_clusters WHERE last_post_at >= ? ORDER BY cluster_id", (since,)
+            ).fetchall()
+            terms = conn.execute(
                 """
-                SELECT p.id, p.title, p.url, p.author, p.published_at, p.summary, p.blog_id
-                FROM topic_posts tp
-                JOIN posts p ON p.id = tp.post_id
-                WHERE tp.topic_id=?
-                ORDER BY datetime(p.published_at) DESC
-                LIMIT 200
+                SELECT kt.cluster_id, kt.term, kt.count
+                FROM keyword_cluster_terms kt
+                JOIN keyword_clusters k ON k.cluster_id = kt.cluster_id
+                WHERE k.last_post_at >= ?
                 """,
-                (topic_id,),
+                (since,),
             ).fetchall()
-            return {
-                "topic": dict(topic),
-                "posts": [dict(x) for x in posts],
-            }
+        return clusters, terms
 
-    def api_posts(self, label: str | None, after: str | None) -> list[sqlite3.Row]:
-        sql = """
-        SELECT DISTINCT p.id, p.title, p.url, p.author, p.published_at, p.summary
-        FROM posts p
-        LEFT JOIN post_labels pl ON pl.post_id = p.id
-        WHERE 1=1
+    def max_cluster_id(self, kind: str) -> int:
+        clusters_table, _ = _CLUSTER_TABLES[kind]
+        with self.connect() as conn:
+            row = conn.execute(f"SELECT COALESCE(MAX(cluster_id), 0) AS m FROM {clusters_table}").fetchone()
+            return int(row["m"])
+
+    def rebind_cluster_members(self, kind: str, post_ids: list[int]) -> tuple[set[int], set[int]]:
+        """Restore topic bindings of posts already in a ``kind`` cluster (e.g. after re-annotation).
+
+        Returns (ids of posts that are cluster members, ids of posts bound to a topic).
         """
-        params: list = []
-        if label:
-            sql += " AND pl.label_id = ?"
-            params.append(label)
-        if after:
-            sql += " AND datetime(p.published_at) >= datetime(?)"
-            params.append(after)
-        sql += " ORDER BY datetime(p.published_at) DESC LIMIT 200"
+        clusters_table, posts_table = _CLUSTER_TABLES[kind]
+        members: set[int] = set()
+        rows: list[tuple] = []
         with self.connect() as conn:
-            return conn.execute(sql, params).fetchall()
+            for i in range(0, len(post_ids), 500):
+                batch = post_ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for r in conn.execute(
+                    f"""
+                    SELECT cp.post_id, cp.cluster_id, cp.similarity, c.topic_id
+                    FROM {posts_table} cp
+                    JOIN {clusters_table} c ON c.cluster_id = cp.cluster_id
+                    WHERE cp.post_id IN ({placeholders})
+                    """,
+                    batch,
+                ):
+                    members.add(int(r["post_id"]))
+                    if r["topic_id"]:
+                        rows.append((r["topic_id"], r["post_id"], r["similarity"], _cluster_evidence(kind, r)))
+            if rows:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO topic_posts (topic_id, post_id, score, evidence) VALUES (?, ?, ?, ?)", rows
+                )
+                self._bump_generation(conn)
+        return members, {int(r[1]) for r in rows}
 
-    def api_entities(self, q: str) -> list[sqlite3.Row]:
+    def save_semantic_clusters(
+        self,
+        clusters: list[tuple[int, bytes, int, str, str]],
+        members: list[tuple[int, int, float]],
+        min_cluster_size: int,
+    ) -> set[int]:
+        """Persist semantic cluster state and bind posts of clusters large enough to be topics.
+
+        ``clusters`` rows are (cluster_id, centroid, n_posts, first_post_at, last_post_at)
+        and ``members`` rows (cluster_id, post_id, similarity). Returns ids of posts bound.
+        """
+        now = utc_now_iso()
         with self.connect() as conn:
-            return conn.execute(
+            conn.executemany(
                 """
-                SELECT canonical_name, entity_type, entity_id, COUNT(*) AS mentions
-                FROM post_entities
-                WHERE lower(canonical_name) LIKE lower(?)
-                GROUP BY canonical_name, entity_type, entity_id
-                ORDER BY mentions DESC
-                LIMIT 50
+                INSERT INTO semantic_clusters (cluster_id, centroid, n_posts, first_post_at, last_post_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cluster_id) DO UPDATE SET
+                  centroid=excluded.centroid,
+                  n_posts=excluded.n_posts,
+                  first_post_at=MIN(first_post_at, excluded.first_post_at),
+                  last_post_at=MAX(last_post_at, excluded.last_post_at),
+                  updated_at=excluded.updated_at
                 """,
-                (f"%{q}%",),
-            ).fetchall()
+                [(*c, now) for c in clusters],
+            )
+            return self._bind_cluster_members(conn, "semantic", members, min_cluster_size, now)
 
-    def api_browse_posts(self, kind: str, value: str, limit: int = 300) -> list[sqlite3.Row]:
+    def save_keyword_clusters(
+        self,
+        clusters: list[tuple[int, int, str, str]],
+        terms: list[tuple[int, str, int]],
+        members: list[tuple[int, int, float]],
+        min_cluster_size: int,
+    ) -> set[int]:
+        """Persist keyword cluster state and bind posts of clusters large enough to be topics.
+
+        ``clusters`` rows are (cluster_id, n_posts, first_post_at, last_post_at),
+        ``terms`` rows (cluster_id, term, count) with absolute counts and ``members``
+        rows (cluster_id, post_id, overlap). Returns ids of posts bound.
+        """
+        now = utc_now_iso()
         with self.connect() as conn:
-            if kind == "topic":
-                return conn.execute(
-                    """
-                    SELECT DISTINCT
-                      p.id, p.title, p.url, p.author, p.blog_id, p.published_at, p.summary,
-                      COALESCE(MAX(CASE WHEN pl.primary_label = 1 THEN pl.label_id END), '') AS primary_label
-                    FROM posts p
-                    JOIN topic_posts tp ON tp.post_id = p.id
-                    JOIN topics t ON t.topic_id = tp.topic_id
-                    LEFT JOIN post_labels pl ON pl.post_id = p.id
-                    WHERE t.title = ?
-                    GROUP BY p.id, p.title, p.url, p.author, p.blog_id, p.published_at, p.summary
-                    ORDER BY datetime(p.published_at) DESC
-                    LIMIT ?
+            conn.executemany(
+                """
+                INSERT INTO keyword_clusters (cluster_id, n_posts, first_post_at, last_post_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(cluster_id) DO UPDATE SET
+                  n_posts=excluded.n_posts,
+                  first_post_at=MIN(first_post_at, excluded.first_post_at),
+                  last_post_at=MAX(last_post_at, excluded.last_post_at),
+                  updated_at=excluded.updated_at
+                """,
+                [(*c, now) for c in clusters],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO keyword_cluster_terms (cluster_id, term, count) VALUES (?, ?, ?)", terms
+            )
+            return self._bind_cluster_members(conn, "keyword", members, min_cluster_size, now)
+
+    def _bind_cluster_members(
+        self,
+        conn: sqlite3.Connection,
+        kind: str,
+        members: list[tuple[int, int, float]],
+        min_cluster_size: int,
+        now: str,
+    ) -> set[int]:
+        """Record membership; a cluster reaching ``min_cluster_size`` becomes topic
+        ``topic.<kind>.<id>`` titled after its earliest post and all its members are
+        bound, later members are bound as they join."""
+        clusters_table, posts_table = _CLUSTER_TABLES[kind]
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {posts_table} (cluster_id, post_id, similarity) VALUES (?, ?, ?)", members
+        )
+        touched = sorted({cid for cid, _, _ in members})
+        new_post_ids = {post_id for _, post_id, _ in members}
+        topic_rows: list[tuple] = []
+        bind_rows: list[tuple] = []
+        for i in range(0, len(touched), 500):
+            batch = touched[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            for c in conn.execute(
+                f"""
+                SELECT cluster_id, topic_id FROM {clusters_table}
+                WHERE cluster_id IN ({placeholders}) AND n_posts >= ?
+                """,
+                [*batch, min_cluster_size],
+            ).fetchall():
+                posts = conn.execute(
+                    f"""
+                    SELECT cp.post_id, cp.cluster_id, cp.similarity, p.title
+                    FROM {posts_table} cp
+                    JOIN posts p ON p.id = cp.post_id
+                    WHERE cp.cluster_id = ?
+                    ORDER BY p.published_at, p.id
+                    """,
+                    (c["cluster_id"],),
+                ).fetchall()
+                topic_id = c["topic_id"]
+                if not topic_id:
+                    topic_id = f"topic.{kind}.{c['cluster_id']}"
+                    conn.execute(f"UPDATE {clusters_table} SET topic_id = ? WHERE cluster_id = ?", (topic_id, c["cluster_id"]))
+                    topic_rows.append((topic_id, "CLUSTER", posts[0]["title"] if posts else "Topic", None, now, now))
+                    to_bind = posts
+                else:
+                    to_bind = [r for r in posts if r["post_id"] in new_post_ids]
+                # Members that found a cluster topic elsewhere while this cluster was too
+                # small (the keyword fallback) keep it: one cluster topic per post.
+                taken = self._cluster_bound_posts(conn, [r["post_id"] for r in to_bind], topic_id)
+                to_bind = [r for r in to_bind if r["post_id"] not in taken]
+                bind_rows.extend((topic_id, r["post_id"], r["similarity"], _cluster_evidence(kind, r)) for r in to_bind)
+        conn.executemany(
+            """
+            INSERT INTO topics (topic_id, topic_type, title, primary_entity_id, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(topic_id) DO UPDATE SET updated_at=excluded.updated_at
+            """,
+            topic_rows,
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO topic_posts (topic_id, post_id, score, evidence) VALUES (?, ?, ?, ?)", bind_rows
+        )
+        if bind_rows:
+            self._bump_generation(conn)
+        return {int(r[1]) for r in bind_rows}
+
+    @staticmethod
+    def _cluster_bound_posts(conn: sqlite3.Connection, post_ids: list[int], except_topic: str) -> set[int]:
+        """Posts among ``post_ids`` bound to a CLUSTER topic other than ``except_topic``."""
+        out: set[int] = set()
+        for i in range(0, len(post_ids), 500):
+            batch = post_ids[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            out.update(
+                int(r["post_id"])
+                for r in conn.execute(
+                    f"""
+                    SELECT tp.post_id FROM topic_posts tp
+                    JOIN topics t ON t.topic_id = tp.topic_id
+                    WHERE tp.post_id IN ({placeholders}) AND t.topic_type = 'CLUSTER' AND tp.topic_id != ?
+                    """,
+                    (*batch, except_topic),
+                )
+            )
+        return out
+
+    def topics_changed_since_maintenance(self) -> tuple[list[str], int]:
+        """Topics that received posts since the last maintenance pass, plus the new checkpoint.
+
+        The checkpoint is the highest topic_posts rowid seen; every binding (new or
+        replaced) gets a fresh rowid, so anything above it is new since the pass.
+        """
+        with self.connect() as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key='topic_maintenance_rowid'").fetchone()
+            since = int(row["value"]) if row else 0
+            top = int(conn.execute("SELECT COALESCE(MAX(rowid), 0) AS m FROM topic_posts").fetchone()["m"])
+            ids = [
+                r["topic_id"]
+                for r in conn.execute(
+                    "SELECT DISTINCT topic_id FROM topic_posts WHERE rowid > ? AND rowid <= ? ORDER BY topic_id", (since, top)
+                )
+            ]
+        return ids, top
+
+    def set_topic_maintenance_checkpoint(self, rowid: int) -> None:
+        with self.connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO store_meta (key, value) VALUES ('topic_maintenance_rowid', ?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                """,
+                (str(rowid),),
+            )
+
+    def get_topic_rows(self, topic_ids: Iterable[str]) -> dict[str, sqlite3.Row]:
+        """Topic rows with their post count, keyed by topic_id."""
+        topic_ids = sorted(set(topic_ids))
+        out: dict[str, sqlite3.Row] = {}
+        with self.connect() as conn:
+            for i in range(0, len(topic_ids), 500):
+                batch = topic_ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for r in conn.execute(
+                    f"""
+                    SELECT t.topic_id, t.topic_type, t.title, t.primary_entity_id, t.created_at,
+                           (SELECT COUNT(*) FROM topic_posts tp WHERE tp.topic_id = t.topic_id) AS n_posts
+                    FROM topics t
+                    WHERE t.topic_id IN ({placeholders})
+                    """,
+                    batch,
+                ):
+                    out[r["topic_id"]] = r
+        return out
+
+    def topic_overlap_pairs(self, topic_ids: list[str], min_share: float) -> list[tuple[str, str]]:
+        """Pairs (dirty topic, other topic) sharing at least ``min_share`` of the smaller topic's posts."""
+        pairs: list[tuple[str, str]] = []
+        with self.connect() as conn:
+            for topic_id in topic_ids:
+                for r in conn.execute(
+                    """
+                    WITH mine AS (SELECT post_id FROM topic_posts WHERE topic_id = ?)
+                    SELECT tp.topic_id, COUNT(*) AS shared,
+                           (SELECT COUNT(*) FROM mine) AS n_mine,
+                           (SELECT COUNT(*) FROM topic_posts x WHERE x.topic_id = tp.topic_id) AS n_other
+                    FROM topic_posts tp
+                    JOIN mine m ON m.post_id = tp.post_id
+                    WHERE tp.topic_id != ?
+                    GROUP BY tp.topic_id
+                    """,
+                    (topic_id, topic_id),
+                ):
+                    if r["shared"] >= min_share * max(1, min(r["n_mine"], r["n_other"])):
+                        pairs.append((topic_id, r["topic_id"]))
+        return pairs
+
+    def same_entity_topic_pairs(self, topic_ids: list[str]) -> list[tuple[str, str]]:
+        """Pairs of current (non-episode) entity topics naming the same canonical entity."""
+        pairs: list[tuple[str, str]] = []
+        with self.connect() as conn:
+            for topic_id in topic_ids:
+                for r in conn.execute(
+                    """
+                    SELECT o.topic_id
+                    FROM topics t
+                    JOIN topics o ON o.topic_type = 'ENTITY' AND o.title = t.title
+                                 AND o.topic_id != t.topic_id AND instr(o.topic_id, '@') = 0
+                    WHERE t.topic_id = ? AND t.topic_type = 'ENTITY' AND instr(t.topic_id, '@') = 0
+                    """,
+                    (topic_id,),
+                ):
+                    pairs.append((topic_id, r["topic_id"]))
+        return pairs
+
+    def active_cluster_topics(self, since: str) -> list[str]:
+        with self.connect() as conn:
+            return [
+                r["topic_id"]
+                for r in conn.execute(
+                    """
+                    SELECT topic_id FROM semantic_clusters WHERE topic_id IS NOT NULL AND last_post_at >= ?
+                    UNION
+                    SELECT topic_id FROM keyword_clusters WHERE topic_id IS NOT NULL AND last_post_at >= ?
+                    """,
+                    (since, since),
+                )
+            ]
+
+    def topic_posts_with_times(self, topic_ids: Iterable[str], limit_per_topic: int | None = None) -> dict[str, list[tuple[int, str]]]:
+        """(post_id, published_at) of each topic's posts, newest first when limited."""
+        out: dict[str, list[tuple[int, str]]] = {}
+        with self.connect() as conn:
+            for topic_id in sorted(set(topic_ids)):
+                rows = conn.execute(
+                    """
+                    SELECT p.id, p.published_at
+                    FROM topic_posts tp
+                    JOIN posts p ON p.id = tp.post_id
+                    WHERE tp.topic_id = ?
+                    ORDER BY p.published_at DESC, p.id DESC
+                    LIMIT ?
+                    """,
+                    (topic_id, -1 if limit_per_topic is None else limit_per_topic),
+                ).fetchall()
+                out[topic_id] = [(int(r["id"]), r["published_at"]) for r in rows]
+        return out
+
+    def topic_episodes(self, topic_id: str) -> list[tuple[str, str, str]]:
+        """Episodes already split off ``topic_id``: (episode topic_id, first, last published_at)."""
+        with self.connect() as conn:
+            return [
+                (r["topic_id"], r["first_at"], r["last_at"])
+                for r in conn.execute(
+                    """
+                    SELECT tp.topic_id, MIN(p.published_at) AS first_at, MAX(p.published_at) AS last_at
+                    FROM topic_posts tp
+                    JOIN posts p ON p.id = tp.post_id
+                    WHERE tp.topic_id >= ? AND tp.topic_id < ?
+                    GROUP BY tp.topic_id
+                    ORDER BY first_at
+                    """,
+                    (topic_id + "@", topic_id + "A"),
+                )
+            ]
+
+    def merge_topics(self, keep: str, merged: list[str], reason: str) -> int:
+        """Fold ``merged`` topics into ``keep`` and leave redirects behind; returns posts moved."""
+        now = utc_now_iso()
+        with self.connect() as conn:
+            moved = 0
+            for topic_id in merged:
+                cur = conn.execute(
+                    """
+                    INSERT OR IGNORE INTO topic_posts (topic_id, post_id, score, evidence)
+                    SELECT ?, post_id, score, evidence FROM topic_posts WHERE topic_id = ?
+                    """,
+                    (keep, topic_id),
+                )
+                moved += cur.rowcount
+                conn.execute("DELETE FROM topic_posts WHERE topic_id = ?", (topic_id,))
+                conn.execute("DELETE FROM topics WHERE topic_id = ?", (topic_id,))
+                for table in ("semantic_clusters", "keyword_clusters"):
+                    conn.execute(f"UPDATE {table} SET topic_id = ? WHERE topic_id = ?", (keep, topic_id))
+                conn.execute("UPDATE topic_redirects SET to_topic_id = ? WHERE to_topic_id = ?", (keep, topic_id))
+                conn.execute(
+                    "INSERT OR REPLACE INTO topic_redirects (from_topic_id, to_topic_id, reason, created_at) VALUES (?, ?, ?, ?)",
+                    (topic_id, keep, reason, now),
+                )
+            conn.execute("DELETE FROM topic_redirects WHERE from_topic_id = ?", (keep,))
+            conn.execute("UPDATE topics SET updated_at = ? WHERE topic_id = ?", (now, keep))
+            self._bump_generation(conn)
+        return moved
+
+    def move_posts_to_episode(self, topic_id: str, episode_topic_id: str, post_ids: list[int]) -> None:
+        """Move posts of ``topic_id`` into the episode topic, creating it from the parent if needed."""
+        now = utc_now_iso()
+        with self.connect() as conn:
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO topics (topic_id, topic_type, title, primary_entity_id, created_at, updated_at)
+                SELECT ?, topic_type, title, primary_entity_id, ?, ? FROM topics WHERE topic_id = ?
+                """,
+                (episode_topic_id, now, now, topic_id),
+            )
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO topic_posts (topic_id, post_id, score, evidence)
+                SELECT ?, post_id, score, evidence FROM topic_posts WHERE topic_id = ? AND post_id = ?
+                """,
+                [(episode_topic_id, topic_id, pid) for pid in post_ids],
+            )
+            conn.executemany(
+                "DELETE FROM topic_posts WHERE topic_id = ? AND post_id = ?", [(topic_id, pid) for pid in post_ids]
+            )
+            self._bump_generation(conn)
+
+    def get_post_terms(self, post_ids: list[int]) -> dict[int, dict[str, int]]:
+        """Term frequencies saved at annotation time, keyed by post id (posts without terms are absent)."""
+        out: dict[int, dict[str, int]] = {}
+        if not post_ids:
+            return out
+        with self.connect() as conn:
+            packed: dict[int, dict[int, int]] = {}
+            for i in range(0, len(post_ids), 500):
+                batch = post_ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for r in conn.execute(f"SELECT post_id, tf FROM post_terms WHERE post_id IN ({placeholders})", batch):
+                    packed[int(r["post_id"])] = _unpack_tf(r["tf"])
+            ids = sorted({tid for tf in packed.values() for tid in tf})
+            names: dict[int, str] = {}
+            for i in range(0, len(ids), 500):
+                batch = ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                names.update(
+                    (int(r["term_id"]), r["term"])
+                    for r in conn.execute(f"SELECT term_id, term FROM terms WHERE term_id IN ({placeholders})", batch)
+                )
+        for post_id, tf in packed.items():
+            out[post_id] = {names[tid]: c for tid, c in tf.items()}
+        return out
+
+    def get_posts_for_annotation(self, post_ids: list[int]) -> list[tuple]:
+        if not post_ids:
+            return []
+        placeholders = ",".join("?" for _ in post_ids)
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"SELECT id, title, summary, content FROM posts WHERE id IN ({placeholders}) ORDER BY id",
+                post_ids,
+            ).fetchall()
+        return [(int(r["id"]), r["title"] or "", r["summary"] or "", r["content"] or "") for r in rows]
+
+    def record_dict_version(self, version: str, term_map: dict) -> bool:
+        """Remember a dictionary snapshot; returns True if it was not known before.
+
+        The very first snapshot also stamps already-labeled posts from before
+        versioning existed, so they become diffable instead of being re-annotated.
+        """
+        with self.connect() as conn:
+            first = conn.execute("SELECT 1 FROM dict_versions LIMIT 1").fetchone() is None
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO dict_versions (version, term_map, created_at) VALUES (?, ?, ?)",
+                (version, json.dumps(term_map, ensure_ascii=False, sort_keys=True), utc_now_iso()),
+            )
+            if first:
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO post_annotations (post_id, dict_version, annotated_at)
+                    SELECT DISTINCT post_id, ?, ? FROM post_labels
+                    """,
+                    (version, utc_now_iso()),
+                )
+            return cur.rowcount > 0
+
+    def get_dict_term_map(self, version: str) -> dict | None:
+        with self.connect() as conn:
+            row = conn.execute("SELECT term_map FROM dict_versions WHERE version=?", (version,)).fetchone()
+        return json.loads(row["term_map"]) if row else None
+
+    def stale_dict_versions(self, current: str) -> list[str]:
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT dict_version FROM post_annotations WHERE dict_version != ?", (current,)
+            ).fetchall()
+        return [str(r["dict_version"]) for r in rows]
+
+    def post_ids_with_dict_version(self, version: str) -> list[int]:
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT post_id FROM post_annotations WHERE dict_version=? ORDER BY post_id", (version,)
+            ).fetchall()
+        return [int(r["post_id"]) for r in rows]
+
+    def fts_post_ids(self, terms: Iterable[str], batch: int = 100) -> set[int]:
+        """IDs of posts whose title/summary/content contains any of ``terms`` (>= 3 chars)."""
+        terms = sorted(t for t in set(terms) if len(t) >= FTS_MIN_TERM_CHARS)
+        out: set[int] = set()
+        with self.connect() as conn:
+            for i in range(0, len(terms), batch):
+                query = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms[i : i + batch])
+                for row in conn.execute("SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?", (query,)):
+                    out.add(int(row[0]))
+        return out
+
+    def restamp_dict_version(self, old: str, new: str) -> int:
+        with self.connect() as conn:
+            cur = conn.execute(
+                "UPDATE post_annotations SET dict_version=? WHERE dict_version=?", (new, old)
+            )
+            return cur.rowcount
+
+    def start_reannotate_job(self, from_version: str, to_version: str, full_rescan: bool, changed_terms: int) -> sqlite3.Row:
+        """Create the job for a version transition, or resume the unfinished one."""
+        now = utc_now_iso()
+        with self.connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO reannotate_jobs (
+                  from_version, to_version, status, full_rescan, changed_terms, created_at, updated_at
+                ) VALUES (?, ?, 'running', ?, ?, ?, ?)
+                ON CONFLICT(from_version, to_version) DO UPDATE SET
+                  status = 'running',
+                  last_post_id = CASE WHEN reannotate_jobs.status = 'done' THEN 0 ELSE reannotate_jobs.last_post_id END,
+                  reannotated = CASE WHEN reannotate_jobs.status = 'done' THEN 0 ELSE reannotate_jobs.reannotated END,
+                  updated_at = excluded.updated_at
+                """,
+                (from_version, to_version, 1 if full_rescan else 0, changed_terms, now, now),
+            )
+            return conn.execute(
+                "SELECT * FROM reannotate_jobs WHERE from_version=? AND to_version=?", (from_version, to_version)
+            ).fetchone()
+
+    def update_reannotate_job(self, job_id: int, **fields: Any) -> None:
+        allowed = {"status", "candidates", "last_post_id", "reannotated"}
+        cols = [k for k in fields if k in allowed]
+        if not cols:
+            return
+        with self.connect() as conn:
+            conn.execute(
+                f"UPDATE reannotate_jobs SET {', '.join(f'{c}=?' for c in cols)}, updated_at=? WHERE id=?",
+                [fields[c] for c in cols] + [utc_now_iso(), job_id],
+            )
+
+    def upsert_topic(self, topic_id: str, topic_type: str, title: str, primary_entity_id: str | None) -> None:
+        now = utc_now_iso()
+        with self.connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO topics (topic_id, topic_type, title, primary_entity_id, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(topic_id) DO UPDATE SET
+                  title=excluded.title,
+                  updated_at=excluded.updated_at
+                """,
+                (topic_id, topic_type, title, primary_entity_id, now, now),
+            )
+            self._bump_generation(conn)
+
+    def bind_post_topic(self, topic_id: str, post_id: int, score: float, evidence: dict) -> None:
+        with self.connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO topic_posts (topic_id, post_id, score, evidence)
+                VALUES (?, ?, ?, ?)
+                """,
+                (topic_id, post_id, score, json.dumps(evidence, ensure_ascii=False)),
+            )
+            self._bump_generation(conn)
+
+    def topic_window_stats(
+        self,
+        as_of: datetime,
+        window_hours: list[int],
+        topic_ids: Iterable[str] | None = None,
+        historical: bool = False,
+    ) -> list[sqlite3.Row]:
+        """Per-topic post stats for every ranking window in one scan, as of a fixed time.
+
+        Window ``i`` yields n_posts_i, n_blogs_i and latest_post_at_i/latest_jd_i
+        (julian day) for posts published since ``as_of - hours`` and n_prev_i
+        over the preceding window of equal length. published_at is stored as UTC ISO
+        text, so window bounds at second precision compare correctly as strings;
+        the CROSS JOIN keeps posts as the outer loop so only the longest window's
+        range of idx_posts_published is read, however long the history. With
+        ``topic_ids`` only those topics are computed, starting from their bindings.
+        ``historical`` also drops posts published after ``as_of``, for past
+        as-of times; live runs keep them, as feeds may post-date entries slightly.
+        """
+        as_of = as_of.astimezone(timezone.utc).replace(microsecond=0)
+        bounds = [
+            ((as_of - timedelta(hours=h)).isoformat(), (as_of - timedelta(hours=2 * h)).isoformat())
+            for h in window_hours
+        ]
+        cols: list[str] = []
+        params: list[str] = []
+        for i, (start, prev_start) in enumerate(bounds):
+            cols.append(
+                f"""
+                  SUM(p.published_at >= ?) AS n_posts_{i},
+                  COUNT(DISTINCT CASE WHEN p.published_at >= ? THEN p.blog_id END) AS n_blogs_{i},
+                  SUM(p.published_at >= ? AND p.published_at < ?) AS n_prev_{i},
+                  MAX(CASE WHEN p.published_at >= ? THEN p.published_at END) AS latest_post_at_{i},
+                  julianday(MAX(CASE WHEN p.published_at >= ? THEN p.published_at END)) AS latest_jd_{i}"""
+            )
+            params += [start, start, prev_start, start, start, start]
+        earliest = min((prev for _, prev in bounds), default=as_of.isoformat())
+        # Seconds-precision as_of sorts below same-second timestamps with a fraction.
+        latest = (as_of + timedelta(seconds=1)).isoformat() if historical else "9999"
+        select = f"SELECT tp.topic_id,{','.join(cols)}"
+        with self.connect() as conn:
+            if topic_ids is None:
+                return conn.execute(
+                    f"""
+                    {select}
+                    FROM posts p
+                    CROSS JOIN topic_posts tp ON tp.post_id = p.id
+                    JOIN topics t ON t.topic_id = tp.topic_id
+                    WHERE p.published_at >= ? AND p.published_at < ?
+                      AND p.duplicate_of IS NULL
+                    GROUP BY tp.topic_id
+                    """,
+                    (*params, earliest, latest),
+                ).fetchall()
+            topic_ids = sorted(set(topic_ids))
+            out: list[sqlite3.Row] = []
+            for i in range(0, len(topic_ids), 500):
+                batch = topic_ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                out += conn.execute(
+                    f"""
+                    {select}
+                    FROM topic_posts tp
+                    CROSS JOIN posts p ON p.id = tp.post_id
+                    JOIN topics t ON t.topic_id = tp.topic_id
+                    WHERE tp.topic_id IN ({placeholders})
+                      AND p.published_at >= ? AND p.published_at < ?
+                      AND p.duplicate_of IS NULL
+                    GROUP BY tp.topic_id
+                    """,
+                    (*params, *batch, earliest, latest),
+                ).fetchall()
+            return out
+
+    def topics_crossing_windows(self, since: datetime, as_of: datetime, window_hours: list[int]) -> set[str]:
+        """Topics with a post that moved across a window or previous-window boundary between two as-of times."""
+        ranges = []
+        for h in window_hours:
+            for span in (h, 2 * h):
+                lo = (since.astimezone(timezone.utc).replace(microsecond=0) - timedelta(hours=span)).isoformat()
+                hi = (as_of.astimezone(timezone.utc).replace(microsecond=0) - timedelta(hours=span)).isoformat()
+                if lo < hi:
+                    ranges.append((lo, hi))
+        out: set[str] = set()
+        with self.connect() as conn:
+            for lo, hi in ranges:
+                out.update(
+                    r["topic_id"]
+                    for r in conn.execute(
+                        """
+                        SELECT DISTINCT tp.topic_id
+                        FROM posts p
+                        CROSS JOIN topic_posts tp ON tp.post_id = p.id
+                        WHERE p.published_at >= ? AND p.published_at < ?
+                        """,
+                        (lo, hi),
+                    )
+                )
+        return out
+
+    def ranking_dirty_topics(self) -> list[str]:
+        with self.connect() as conn:
+            return [r["topic_id"] for r in conn.execute("SELECT topic_id FROM ranking_dirty_topics ORDER BY topic_id")]
+
+    def stage_rankings(
+        self,
+        as_of: str,
+        rankings: dict[str, list[tuple]],
+        params: dict,
+        carry_from: int | None = None,
+        rescored: Iterable[str] = (),
+    ) -> int:
+        """Write a complete ranking run; it stays invisible until ``publish_ranking_run``. Returns its run_id.
+
+        ``rankings`` holds (topic_id, hot, breakdown, cross_hot, resonance, base_score,
+        latest_post_at) rows per window. With ``carry_from``, rows of that run for
+        topics not in ``rescored`` are copied over unchanged. ``params`` records
+        recency_weight, recency_tau_hours and config_hash for the run.
+        """
+        now = utc_now_iso()
+        with self.connect() as conn:
+            run_id = int(
+                conn.execute(
+                    """
+                    INSERT INTO ranking_runs (as_of, created_at, status, recency_weight, recency_tau_hours, config_hash)
+                    VALUES (?, ?, 'staged', ?, ?, ?)
+                    """,
+                    (as_of, now, params["recency_weight"], params["recency_tau_hours"], params["config_hash"]),
+                ).lastrowid
+            )
+            if carry_from is not None:
+                conn.execute("CREATE TEMP TABLE rescored_topics (topic_id TEXT PRIMARY KEY) WITHOUT ROWID")
+                conn.executemany("INSERT OR IGNORE INTO rescored_topics VALUES (?)", [(t,) for t in rescored])
+                conn.execute(
+                    """
+                    INSERT INTO hot_rankings (
+                      run_id, window, computed_at, topic_id, hot_score, breakdown_json, cross_blogger_hot, resonance,
+                      base_score, latest_post_at
+                    )
+                    SELECT ?, window, ?, topic_id, hot_score, breakdown_json, cross_blogger_hot, resonance,
+                           base_score, latest_post_at
+                    FROM hot_rankings
+                    WHERE run_id = ? AND topic_id NOT IN (SELECT topic_id FROM rescored_topics)
+                    """,
+                    (run_id, now, carry_from),
+                )
+            n_scored = 0
+            for window, rows in rankings.items():
+                conn.executemany(
+                    """
+                    INSERT INTO hot_rankings (
+                      run_id, window, computed_at, topic_id, hot_score, breakdown_json, cross_blogger_hot, resonance,
+                      base_score, latest_post_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            run_id,
+                            window,
+                            now,
+                            topic_id,
+                            hot,
+                            json.dumps(breakdown, ensure_ascii=False),
+                            1 if cross_hot else 0,
+                            resonance,
+                            base_score,
+                            latest_post_at,
+                        )
+                        for topic_id, hot, breakdown, cross_hot, resonance, base_score, latest_post_at in rows
+                    ],
+                )
+                n_scored += len(rows)
+            conn.execute(
+                """
+                UPDATE ranking_runs
+                SET n_rows = (SELECT COUNT(*) FROM hot_rankings WHERE run_id = ?), n_scored = ?
+                WHERE run_id = ?
+                """,
+                (run_id, n_scored, run_id),
+            )
+        return run_id
+
+    @staticmethod
+    def _topic_keys(conn: sqlite3.Connection, topic_ids: Iterable[str]) -> dict[str, int]:
+        """Integer keys of ``topic_ids``, assigning new ones as needed."""
+        conn.executemany("INSERT OR IGNORE INTO topic_keys (topic_id) VALUES (?)", [(t,) for t in set(topic_ids)])
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_topics (topic_id TEXT PRIMARY KEY) WITHOUT ROWID")
+        conn.execute("DELETE FROM wanted_topics")
+        conn.executemany("INSERT OR IGNORE INTO wanted_topics VALUES (?)", [(t,) for t in set(topic_ids)])
+        return {
+            r["topic_id"]: int(r["topic_key"])
+            for r in conn.execute("SELECT k.topic_id, k.topic_key FROM wanted_topics w JOIN topic_keys k USING (topic_id)")
+        }
+
+    @staticmethod
+    def _run_rankings(conn: sqlite3.Connection, run_id: int) -> dict[str, list[tuple]]:
+        """Rows of a stored run shaped as for ``stage_rankings``; rows from before base scores existed are left out."""
+        out: dict[str, list[tuple]] = {r["window"]: [] for r in conn.execute("SELECT DISTINCT window FROM ranking_series")}
+        for r in conn.execute(
+            """
+            SELECT window, topic_id, hot_score, breakdown_json, cross_blogger_hot, resonance, base_score, latest_post_at
+            FROM hot_rankings WHERE run_id = ? AND base_score IS NOT NULL AND latest_post_at IS NOT NULL
+            """,
+            (run_id,),
+        ):
+            out.setdefault(r["window"], []).append(
+                (
+                    r["topic_id"],
+                    r["hot_score"],
+                    json.loads(r["breakdown_json"]),
+                    bool(r["cross_blogger_hot"]),
+                    r["resonance"],
+                    r["base_score"],
+                    r["latest_post_at"],
+                )
+            )
+        return out
+
+    def _undo_ranking_history(self, conn: sqlite3.Connection, timestamps: list[int]) -> None:
+        """Delete history points written at ``timestamps`` and reset each touched series' head to its latest remaining point."""
+        touched: set[tuple[str, int]] = set()
+        for ts in timestamps:
+            touched.update(
+                (r["window"], int(r["topic_key"]))
+                for r in conn.execute("SELECT window, topic_key FROM ranking_history WHERE ts = ?", (ts,))
+            )
+            conn.execute("DELETE FROM ranking_history WHERE ts = ?", (ts,))
+        cols = ", ".join(_HISTORY_COLS)
+        for window, key in touched:
+            conn.execute("DELETE FROM ranking_series WHERE window = ? AND topic_key = ?", (window, key))
+            conn.execute(
+                f"""
+                INSERT INTO ranking_series (window, topic_key, ts, {cols})
+                SELECT window, topic_key, ts, {cols} FROM ranking_history
+                WHERE window = ? AND topic_key = ? ORDER BY ts DESC LIMIT 1
+                """,
+                (window, key),
+            )
+
+    def _append_ranking_history(
+        self, conn: sqlite3.Connection, as_of: str, rankings: dict[str, list[tuple]], rescored: set[str] | None
+    ) -> int:
+        """Record rows whose inputs changed since each series' last point; returns points written.
+
+        ``rescored`` limits drop-out detection to those topics (incremental runs);
+        None means the run covered every topic (full runs).
+        """
+        ts = int(datetime.fromisoformat(as_of).timestamp())
+        keys = self._topic_keys(
+            conn, {row[0] for rows in rankings.values() for row in rows} | (rescored or set())
+        )
+        points = []
+        for window, rows in rankings.items():
+            if rescored is None:
+                heads = conn.execute("SELECT * FROM ranking_series WHERE window = ?", (window,)).fetchall()
+            else:
+                heads = conn.execute(
+                    """
+                    SELECT s.* FROM wanted_topics w
+                    JOIN topic_keys k USING (topic_id)
+                    JOIN ranking_series s ON s.window = ? AND s.topic_key = k.topic_key
+                    """,
+                    (window,),
+                ).fetchall()
+            head = {int(r["topic_key"]): tuple(r[c] for c in _HISTORY_COLS) for r in heads}
+            points += self._history_points(window, ts, rows, head, keys)
+        cols = ", ".join(_HISTORY_COLS)
+        marks = ", ".join("?" for _ in range(len(_HISTORY_COLS) + 3))
+        conn.executemany(f"INSERT OR REPLACE INTO ranking_history (window, topic_key, ts, {cols}) VALUES ({marks})", points)
+        conn.executemany(f"INSERT OR REPLACE INTO ranking_series (window, topic_key, ts, {cols}) VALUES ({marks})", points)
+        return len(points)
+
+    @staticmethod
+    def _history_points(
+        window: str, ts: int, rows: list[tuple], head: dict[int, tuple], keys: dict[str, int]
+    ) -> list[tuple]:
+        """History points for ranking ``rows`` differing from ``head`` (topic_key -> last values).
+
+        Series live in ``head`` but absent from ``rows`` dropped out of the window
+        and get a zero point.
+        """
+        scale = _HISTORY_SCALE
+        points = []
+        seen: set[int] = set()
+        for topic_id, _hot, breakdown, _cross_hot, resonance, base_score, latest_post_at in rows:
+            key = keys[topic_id]
+            seen.add(key)
+            values = (
+                round(base_score * scale),
+                round(breakdown["D_diversity"] * scale),
+                round(breakdown["Q_volume"] * scale),
+                round(breakdown["V_velocity"] * scale),
+                round(resonance * scale),
+                int(breakdown["n_posts"]),
+                int(breakdown["n_blogs"]),
+                int(breakdown["n_prev"]),
+                int(datetime.fromisoformat(latest_post_at).timestamp()),
+            )
+            if head.get(key) != values:
+                points.append((window, key, ts, *values))
+        for key, values in head.items():
+            if key not in seen and values[5] > 0:
+                points.append((window, key, ts, 0, 0, 0, 0, 0, 0, 0, 0, None))
+        return points
+
+    def write_backfilled_history(self, snapshots: Iterable[tuple[str, dict[str, list[tuple]]]], start: str, end: str) -> int:
+        """Replace ranking history between ``start`` and ``end`` with backfilled snapshots.
+
+        ``snapshots`` yields (as_of, rankings) in as-of order, rankings shaped as
+        for ``stage_rankings``. Each is diffed against the previous snapshot (the
+        first against the history before ``start``). Points are staged in a
+        temporary table, committed per snapshot so a long backfill does not hold
+        the write lock, and swapped into ranking_history in one transaction at
+        the end: a failing snapshot leaves the history untouched.
+
+        Live points after ``end`` were diffed against the replaced history, so at
+        the first published run after ``end`` every series whose backfilled value
+        differs from the value it had there gets a closing point restoring it.
+        Without such a run the backfilled values are the latest, and
+        ranking_series (the heads the next live run is diffed against) is reset
+        to them.
+        """
+        start_ts = int(datetime.fromisoformat(start).timestamp())
+        end_ts = int(datetime.fromisoformat(end).timestamp())
+        cols = ", ".join(_HISTORY_COLS)
+        marks = ", ".join("?" for _ in range(len(_HISTORY_COLS) + 3))
+        with self.connect() as conn:
+            at_end = self._history_heads(conn, end_ts + 1)
+            heads = self._history_heads(conn, start_ts)
+            conn.execute("DROP TABLE IF EXISTS temp.backfill_history")
+            conn.execute(
+                f"""
+                CREATE TEMP TABLE backfill_history (
+                  window TEXT NOT NULL, topic_key INTEGER NOT NULL, ts INTEGER NOT NULL,
+                  {", ".join(f"{c} INTEGER" for c in _HISTORY_COLS)},
+                  PRIMARY KEY (window, topic_key, ts)
+                )
+                """
+            )
+            for as_of, rankings in snapshots:
+                ts = int(datetime.fromisoformat(as_of).timestamp())
+                keys = self._topic_keys(conn, {row[0] for rows in rankings.values() for row in rows})
+                points = []
+                for window, rows in rankings.items():
+                    head = heads.setdefault(window, {})
+                    new_points = self._history_points(window, ts, rows, head, keys)
+                    for point in new_points:
+                        head[point[1]] = point[3:]
+                    points += new_points
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO temp.backfill_history (window, topic_key, ts, {cols}) VALUES ({marks})", points
+                )
+                conn.commit()
+            resume = [
+                ts
+                for ts in (
+                    int(datetime.fromisoformat(r["as_of"]).timestamp())
+                    for r in conn.execute("SELECT as_of FROM ranking_runs WHERE status IN ('published', 'retired')")
+                )
+                if ts > end_ts
+            ]
+            conn.execute("DELETE FROM ranking_history WHERE ts >= ? AND ts <= ?", (start_ts, end_ts))
+            written = conn.execute(
+                f"""
+                INSERT OR REPLACE INTO ranking_history (window, topic_key, ts, {cols})
+                SELECT window, topic_key, ts, {cols} FROM temp.backfill_history
+                """
+            ).rowcount
+            if resume:
+                closing = self._closing_points(conn, min(resume), heads, at_end)
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO ranking_history (window, topic_key, ts, {cols}) VALUES ({marks})", closing
+                )
+                written += len(closing)
+            else:
+                conn.execute("DELETE FROM ranking_series")
+                conn.execute(
+                    f"""
+                    INSERT INTO ranking_series (window, topic_key, ts, {cols})
+                    SELECT h.window, h.topic_key, h.ts, {", ".join(f"h.{c}" for c in _HISTORY_COLS)}
+                    FROM ranking_history h
+                    JOIN (SELECT window, topic_key, MAX(ts) AS ts FROM ranking_history GROUP BY window, topic_key) m
+                      USING (window, topic_key, ts)
+                    """
+                )
+            conn.execute("DROP TABLE temp.backfill_history")
+            self._bump_generation(conn)
+        return written
+
+    @staticmethod
+    def _history_heads(conn: sqlite3.Connection, before_ts: int) -> dict[str, dict[int, tuple]]:
+        """Last history values of every series strictly before ``before_ts``, per window."""
+        heads: dict[str, dict[int, tuple]] = {}
+        for r in conn.execute(
+            """
+            SELECT h.* FROM ranking_history h
+            JOIN (SELECT window, topic_key, MAX(ts) AS ts FROM ranking_history WHERE ts < ? GROUP BY window, topic_key) m
+              USING (window, topic_key, ts)
+            """,
+            (before_ts,),
+        ):
+            heads.setdefault(r["window"], {})[int(r["topic_key"])] = tuple(r[c] for c in _HISTORY_COLS)
+        return heads
+
+    @staticmethod
+    def _closing_points(
+        conn: sqlite3.Connection, ts: int, backfilled: dict[str, dict[int, tuple]], live: dict[str, dict[int, tuple]]
+    ) -> list[tuple]:
+        """Points at ``ts`` returning series from their ``backfilled`` values to the ``live`` ones.
+
+        Series with a point at ``ts`` already are skipped; a missing or dropped-out
+        series on either side counts as a zero point.
+        """
+        zero = (0, 0, 0, 0, 0, 0, 0, 0, None)
+        present = {(r["window"], int(r["topic_key"])) for r in conn.execute("SELECT window, topic_key FROM ranking_history WHERE ts = ?", (ts,))}
+        points = []
+        for window in set(backfilled) | set(live):
+            before, after = backfilled.get(window, {}), live.get(window, {})
+            for key in set(before) | set(after):
+                old = before.get(key) if before.get(key, zero)[5] > 0 else zero
+                new = after.get(key) if after.get(key, zero)[5] > 0 else zero
+                if old != new and (window, key) not in present:
+                    points.append((window, key, ts, *new))
+        return points
+
+    def snapshot(self, path: str | Path) -> None:
+        """Consistent copy of the database, indexes included, for read-only batch jobs."""
+        with self.connect() as conn:
+            conn.execute("VACUUM INTO ?", (str(path),))
+
+    def prune_ranking_history(self, keep_days: float) -> int:
+        """Drop history points older than ``keep_days``, keeping each series' last point before the cutoff."""
+        cutoff = int(time.time() - keep_days * 86400)
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                DELETE FROM ranking_history
+                WHERE ts < ?
+                  AND ts < (SELECT MAX(h.ts) FROM ranking_history h
+                            WHERE h.window = ranking_history.window AND h.topic_key = ranking_history.topic_key
+                              AND h.ts < ?)
+                """,
+                (cutoff, cutoff),
+            ).rowcount
+
+    def latest_ranking_run(self) -> int | None:
+        """Newest run that was ever published (staged-only runs are ignored)."""
+        with self.connect() as conn:
+            row = conn.execute("SELECT MAX(run_id) AS run_id FROM ranking_runs WHERE status != 'staged'").fetchone()
+            return row["run_id"]
+
+    def get_ranking_run(self, run_id: int) -> sqlite3.Row | None:
+        with self.connect() as conn:
+            return conn.execute("SELECT * FROM ranking_runs WHERE run_id = ?", (run_id,)).fetchone()
+
+    @staticmethod
+    def _published_run(conn: sqlite3.Connection) -> int | None:
+        row = conn.execute("SELECT value FROM store_meta WHERE key='published_ranking_run'").fetchone()
+        return int(row["value"]) if row else None
+
+    def _set_published_run(self, conn: sqlite3.Connection, run_id: int) -> None:
+        conn.execute(
+            """
+            INSERT INTO store_meta (key, value) VALUES ('published_ranking_run', ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+            """,
+            (str(run_id),),
+        )
+        self._bump_generation(conn)
+
+    def published_ranking_run(self) -> int | None:
+        with self.connect() as conn:
+            return self._published_run(conn)
+
+    def publish_ranking_run(
+        self,
+        run_id: int,
+        clear_dirty: Iterable[str] = (),
+        rankings: dict[str, list[tuple]] | None = None,
+        rescored: Iterable[str] | None = None,
+    ) -> None:
+        """Point readers at a staged run; the previously published run is retired, not deleted.
+
+        ``clear_dirty`` are the ranking_dirty_topics the run accounted for. Runs are
+        staged and published by a single writer, so nothing re-dirties them in between.
+        The run's changes are appended to ranking history in the same transaction:
+        ``rankings``/``rescored`` are what ``stage_rankings`` got (only ``rescored``
+        topics are checked for drop-outs), otherwise the stored run is diffed in full.
+        """
+        with self.connect() as conn:
+            as_of = conn.execute("SELECT as_of FROM ranking_runs WHERE run_id = ?", (run_id,)).fetchone()["as_of"]
+            if rankings is None:
+                self._append_ranking_history(conn, as_of, self._run_rankings(conn, run_id), None)
+            else:
+                self._append_ranking_history(conn, as_of, rankings, None if rescored is None else set(rescored))
+            conn.executemany("DELETE FROM ranking_dirty_topics WHERE topic_id = ?", [(t,) for t in clear_dirty])
+            previous = self._published_run(conn)
+            if previous is not None and previous != run_id:
+                conn.execute("UPDATE ranking_runs SET status='retired' WHERE run_id = ?", (previous,))
+            conn.execute(
+                "UPDATE ranking_runs SET status='published', published_at=? WHERE run_id = ?", (utc_now_iso(), run_id)
+            )
+            self._set_published_run(conn, run_id)
+
+    def rollback_ranking_run(self, run_id: int | None = None) -> int | None:
+        """Republish ``run_id`` (default: the latest retired run before the current one); returns the run now live.
+
+        Runs published after it are marked rolled back and their ranking history
+        points removed, so trends and the next run's diff continue from ``run_id``.
+        """
+        with self.connect() as conn:
+            current = self._published_run(conn)
+            if run_id is None:
+                row = conn.execute(
+                    "SELECT MAX(run_id) AS run_id FROM ranking_runs WHERE status='retired' AND run_id < ?",
+                    (current if current is not None else -1,),
+                ).fetchone()
+                run_id = row["run_id"]
+            elif not conn.execute(
+                "SELECT 1 FROM ranking_runs WHERE run_id = ? AND status IN ('retired', 'rolled_back')", (run_id,)
+            ).fetchone():
+                raise ValueError(f"ranking run {run_id} is not available for rollback")
+            if run_id is None:
+                return current
+            later = conn.execute(
+                "SELECT run_id, as_of FROM ranking_runs WHERE run_id > ? AND status IN ('published', 'retired')", (run_id,)
+            ).fetchall()
+            self._undo_ranking_history(conn, [int(datetime.fromisoformat(r["as_of"]).timestamp()) for r in later])
+            conn.executemany(
+                "UPDATE ranking_runs SET status='rolled_back' WHERE run_id = ?", [(r["run_id"],) for r in later]
+            )
+            # No-op unless the run's own points were removed by an earlier rollback.
+            as_of = conn.execute("SELECT as_of FROM ranking_runs WHERE run_id = ?", (run_id,)).fetchone()["as_of"]
+            self._append_ranking_history(conn, as_of, self._run_rankings(conn, int(run_id)), None)
+            conn.execute("UPDATE ranking_runs SET status='published', published_at=? WHERE run_id = ?", (utc_now_iso(), run_id))
+            self._set_published_run(conn, int(run_id))
+        return int(run_id)
+
+    def prune_ranking_runs(self, keep: int) -> int:
+        """Drop rows of runs older than the ``keep`` most recent finished runs; returns runs removed.
+
+        The published run and anything staged after it are always kept.
+        """
+        with self.connect() as conn:
+            current = self._published_run(conn)
+            keep_ids = {
+                int(r["run_id"])
+                for r in conn.execute(
+                    "SELECT run_id FROM ranking_runs WHERE status != 'staged' ORDER BY run_id DESC LIMIT ?", (max(1, keep),)
+                )
+            }
+            floor = current if current is not None else 0
+            doomed = [
+                int(r["run_id"])
+                for r in conn.execute("SELECT run_id FROM ranking_runs WHERE run_id < ?", (floor,))
+                if int(r["run_id"]) not in keep_ids
+            ]
+            for run_id in doomed:
+                conn.execute("DELETE FROM hot_rankings WHERE run_id = ?", (run_id,))
+                conn.execute("DELETE FROM ranking_runs WHERE run_id = ?", (run_id,))
+        return len(doomed)
+
+    def list_ranking_runs(self) -> list[dict]:
+        with self.connect() as conn:
+            current = self._published_run(conn)
+            return [
+                {**dict(r), "live": r["run_id"] == current}
+                for r in conn.execute("SELECT * FROM ranking_runs ORDER BY run_id DESC")
+            ]
+
+    @staticmethod
+    def _cooccurrence_factor(half_life_days: float, seconds: float) -> float:
+        """2**(seconds / half_life), clamped so ages far beyond any count cannot overflow."""
+        return 2.0 ** max(-2000.0, min(1000.0, seconds / (half_life_days * 86400)))
+
+    @staticmethod
+    def _cooccurrence_epoch(conn: sqlite3.Connection) -> float | None:
+        row = conn.execute("SELECT value FROM store_meta WHERE key='cooccurrence_epoch'").fetchone()
+        return float(row["value"]) if row is not None else None
+
+    @staticmethod
+    def _set_cooccurrence_epoch(conn: sqlite3.Connection, epoch: float) -> None:
+        conn.execute(
+            """
+            INSERT INTO store_meta (key, value) VALUES ('cooccurrence_epoch', ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+            """,
+            (repr(float(epoch)),),
+        )
+
+    def entity_cooccurrences_current(self, half_life_days: float) -> bool:
+        """Whether co-occurrence counts are stored under ``half_life_days``."""
+        with self.connect() as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key='cooccurrence_half_life_days'").fetchone()
+            if row is None or row["value"] != json.dumps(float(half_life_days)):
+                return False
+            return conn.execute("SELECT 1 FROM entity_cooccurrence WHERE a='' AND b=''").fetchone() is not None
+
+    def reset_entity_cooccurrences(self, half_life_days: float) -> None:
+        """Drop all co-occurrence counts, ready to be recounted under ``half_life_days``."""
+        with self.connect() as conn:
+            conn.execute("DELETE FROM entity_cooccurrence")
+            conn.execute("DELETE FROM store_meta WHERE key='cooccurrence_epoch'")
+            conn.execute(
+                """
+                INSERT INTO store_meta (key, value) VALUES ('cooccurrence_half_life_days', ?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                """,
+                (json.dumps(float(half_life_days)),),
+            )
+
+    def add_entity_cooccurrences(
+        self, posts: list[tuple[float, list[tuple[str, str]]]], half_life_days: float, weight: float = 1.0
+    ) -> None:
+        """Count each post's entity pairs (a <= b, incl. (a, a)) at its Unix time, ``weight`` times.
+
+        Weights are stored pre-scaled by 2**((ts - epoch) / half_life), so adding a
+        post is a plain addition whatever its time; dividing by the factor of the
+        read time yields counts decayed to then. When a post is more than
+        ``_COOCCURRENCE_REBASE`` half-lives past the epoch, the epoch moves to it
+        and every stored weight is rescaled. Counts kept under another half-life
+        are dropped first. A ``weight`` of -1 retracts posts counted before; pairs
+        left with nothing are deleted.
+        """
+        if not posts:
+            return
+        marker = json.dumps(float(half_life_days))
+        newest = max(ts for ts, _ in posts)
+        with self.connect() as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key='cooccurrence_half_life_days'").fetchone()
+            if row is None or row["value"] != marker:
+                conn.execute("DELETE FROM entity_cooccurrence")
+                conn.execute("DELETE FROM store_meta WHERE key='cooccurrence_epoch'")
+                conn.execute(
+                    """
+                    INSERT INTO store_meta (key, value) VALUES ('cooccurrence_half_life_days', ?)
+                    ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                    """,
+                    (marker,),
+                )
+            epoch = self._cooccurrence_epoch(conn)
+            if epoch is None:
+                epoch = newest
+                self._set_cooccurrence_epoch(conn, epoch)
+            elif newest - epoch > _COOCCURRENCE_REBASE * half_life_days * 86400:
+                conn.execute(
+                    "UPDATE entity_cooccurrence SET weight = weight * ?",
+                    (self._cooccurrence_factor(half_life_days, epoch - newest),),
+                )
+                epoch = newest
+                self._set_cooccurrence_epoch(conn, epoch)
+            weights: Counter[tuple[str, str]] = Counter()
+            for ts, pairs in posts:
+                w = weight * self._cooccurrence_factor(half_life_days, ts - epoch)
+                weights[("", "")] += w
+                for pair in pairs:
+                    weights[pair] += w
+            conn.executemany(
+                """
+                INSERT INTO entity_cooccurrence (a, b, weight) VALUES (?, ?, ?)
+                ON CONFLICT(a, b) DO UPDATE SET weight = weight + excluded.weight
+                """,
+                [(a, b, w) for (a, b), w in weights.items()],
+            )
+            if weight < 0:
+                conn.execute("DELETE FROM entity_cooccurrence WHERE weight <= 0")
+
+    def entity_cooccurrence_counts(
+        self, entity_ids: Iterable[str], half_life_days: float, min_pair_count: float, now_ts: float | None = None
+    ) -> tuple[dict[tuple[str, str], float], dict[str, float], float]:
+        """Decayed counts as of ``now_ts``: (pairs involving ``entity_ids`` with at least
+        ``min_pair_count`` shared posts, per-entity counts of every entity involved, total posts)."""
+        ids = sorted(set(entity_ids))
+        pairs: dict[tuple[str, str], float] = {}
+        singles: dict[str, float] = {}
+        with self.connect() as conn:
+            total = conn.execute("SELECT weight FROM entity_cooccurrence WHERE a='' AND b=''").fetchone()
+            epoch = self._cooccurrence_epoch(conn)
+            if total is None or epoch is None:
+                return pairs, singles, 0.0
+            now = now_ts if now_ts is not None else time.time()
+            decay = self._cooccurrence_factor(half_life_days, epoch - now)
+            if decay <= 0.0:
+                return pairs, singles, 0.0
+            floor = min_pair_count / decay
+            for i in range(0, len(ids), 500):
+                batch = ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for col in ("a", "b"):
+                    for r in conn.execute(
+                        f"""
+                        SELECT a, b, weight FROM entity_cooccurrence
+                        WHERE {col} IN ({placeholders}) AND a <> b AND weight >= ?
+                        """,
+                        (*batch, floor),
+                    ):
+                        pairs[(r["a"], r["b"])] = float(r["weight"]) * decay
+            involved = sorted(set(ids) | {e for pair in pairs for e in pair})
+            for i in range(0, len(involved), 500):
+                batch = involved[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for r in conn.execute(
+                    f"SELECT a, weight FROM entity_cooccurrence WHERE a IN ({placeholders}) AND b = a", batch
+                ):
+                    singles[r["a"]] = float(r["weight"]) * decay
+        return pairs, singles, float(total["weight"]) * decay
+
+    def topic_entity_profiles(self, since: str, max_entities: int) -> dict[str, list[tuple[str, float]]]:
+        """Topics with posts published since ``since``: their top entities over those posts, as shares."""
+        counts: dict[str, list[tuple[str, int]]] = {}
+        with self.connect() as conn:
+            for r in conn.execute(
+                """
+                SELECT tp.topic_id, pe.entity_id, COUNT(*) AS n
+                FROM posts p
+                CROSS JOIN topic_posts tp ON tp.post_id = p.id
+                JOIN post_entities pe ON pe.post_id = p.id
+                WHERE p.published_at >= ? AND p.duplicate_of IS NULL
+                GROUP BY tp.topic_id, pe.entity_id
+                """,
+                (since,),
+            ):
+                counts.setdefault(r["topic_id"], []).append((r["entity_id"], int(r["n"])))
+        profiles = {}
+        for topic_id, ents in counts.items():
+            top = sorted(ents, key=lambda x: (-x[1], x[0]))[:max_entities]
+            total = sum(n for _, n in top)
+            profiles[topic_id] = [(e, n / total) for e, n in top]
+        return profiles
+
+    def replace_topic_related(self, related: dict[str, list[tuple[str, float]]]) -> int:
+        """Swap in freshly computed neighbour lists for all topics in one transaction."""
+        now = utc_now_iso()
+        rows = [
+            (topic_id, rank, other, round(score, 6), now)
+            for topic_id, ranked in related.items()
+            for rank, (other, score) in enumerate(ranked, start=1)
+        ]
+        with self.connect() as conn:
+            conn.execute("DELETE FROM topic_related")
+            conn.executemany(
+                "INSERT INTO topic_related (topic_id, rank, related_topic_id, score, computed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._bump_generation(conn)
+        return len(rows)
+
+    def api_topic_related(self, topic_id: str, limit: int) -> list[dict] | None:
+        return self._cached("api_topic_related", (topic_id, limit), lambda: self._api_topic_related(topic_id, limit))
+
+    def _api_topic_related(self, topic_id: str, limit: int) -> list[dict] | None:
+        with self.connect() as conn:
+            redirect = conn.execute("SELECT to_topic_id FROM topic_redirects WHERE from_topic_id=?", (topic_id,)).fetchone()
+            if redirect:
+                topic_id = redirect["to_topic_id"]
+            if not conn.execute("SELECT 1 FROM topics WHERE topic_id=?", (topic_id,)).fetchone():
+                return None
+            # Neighbours merged away since the lists were computed resolve to their survivor.
+            rows = conn.execute(
+                """
+                SELECT tr.rank, tr.score, t.topic_id, t.title, t.topic_type, t.primary_entity_id
+                FROM topic_related tr
+                LEFT JOIN topic_redirects rd ON rd.from_topic_id = tr.related_topic_id
+                JOIN topics t ON t.topic_id = COALESCE(rd.to_topic_id, tr.related_topic_id)
+                WHERE tr.topic_id = ?
+                ORDER BY tr.rank
+                LIMIT ?
+                """,
+                (topic_id, limit * 2),
+            ).fetchall()
+        out: list[dict] = []
+        seen = {topic_id}
+        for r in rows:
+            if r["topic_id"] in seen:
+                continue
+            seen.add(r["topic_id"])
+            out.append(
+                {
+                    "topic_id": r["topic_id"],
+                    "title": r["title"],
+                    "topic_type": r["topic_type"],
+                    "primary_entity_id": r["primary_entity_id"],
+                    "score": r["score"],
+                }
+            )
+        return out[:limit]
+
+    def get_translations(self, src_hashes: Iterable[str], target: str) -> dict[str, str]:
+        hashes = list(src_hashes)
+        out: dict[str, str] = {}
+        with self.connect() as conn:
+            for i in range(0, len(hashes), 500):
+                batch = hashes[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for r in conn.execute(
+                    f"SELECT src_hash, translated FROM translation_cache WHERE target = ? AND src_hash IN ({placeholders})",
+                    (target, *batch),
+                ):
+                    out[r["src_hash"]] = r["translated"]
+        return out
+
+    def put_translations(self, rows: list[tuple[str, str, str, str]]) -> None:
+        """Store (src_hash, target, translated, provider) rows. Cached API reads do not
+        depend on translations, so the data generation is left alone."""
+        if not rows:
+            return
+        now = utc_now_iso()
+        with self.connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO translation_cache (src_hash, target, translated, provider, created_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(src_hash, target) DO UPDATE SET
+                  translated=excluded.translated, provider=excluded.provider, created_at=excluded.created_at
+                """,
+                [(*r, now) for r in rows],
+            )
+
+    def posts_needing_translation(self, since: str, target: str, limit: int) -> list[sqlite3.Row]:
+        """Newest non-duplicate posts published since ``since`` still missing a stored title or summary translation."""
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                SELECT p.id, p.title, p.summary
+                FROM posts p
+                WHERE p.published_at >= ? AND p.duplicate_of IS NULL
+                  AND (SELECT COUNT(*) FROM post_translations pt
+                       WHERE pt.post_id = p.id AND pt.target = ? AND pt.field IN ('title', 'summary')) < 2
+                ORDER BY p.published_at DESC
+                LIMIT ?
+                """,
+                (since, target, limit),
+            ).fetchall()
+
+    def put_post_translations(self, rows: list[tuple[int, str, str, str]]) -> None:
+        """Store (post_id, field, target, text) rows.
+
+        Cached queries do not read translations, so the data generation is left
+        alone; the separate translation generation only changes HTTP validators.
+        """
+        if not rows:
+            return
+        now = utc_now_iso()
+        with self.connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO post_translations (post_id, field, target, text, translated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(post_id, field, target) DO UPDATE SET text=excluded.text, translated_at=excluded.translated_at
+                """,
+                [(*r, now) for r in rows],
+            )
+            conn.execute(
+                """
+                INSERT INTO store_meta (key, value) VALUES ('translation_generation', '1')
+                ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+                """
+            )
+        self._generation_checked_at = float("-inf")
+
+    def get_post_translations(self, post_ids: list[int], target: str) -> dict[int, dict[str, str]]:
+        out: dict[int, dict[str, str]] = {}
+        with self.connect() as conn:
+            for i in range(0, len(post_ids), 500):
+                batch = post_ids[i : i + 500]
+                placeholders = ",".join("?" for _ in batch)
+                for r in conn.execute(
+                    f"SELECT post_id, field, text FROM post_translations WHERE target = ? AND post_id IN ({placeholders})",
+                    (target, *batch),
+                ):
+                    out.setdefault(int(r["post_id"]), {})[r["field"]] = r["text"]
+        return out
+
+    def put_response_blobs(self, rows: list[tuple[str, bytes, float | None]], version: str) -> None:
+        """Replace all blobs with (key, body, expires_at) rows built as of ``version``; no generation bump."""
+        now = utc_now_iso()
+        with self.connect() as conn:
+            conn.execute("DELETE FROM response_blobs")
+            conn.executemany(
+                "INSERT INTO response_blobs (key, version, body, built_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                [(key, version, body, now, expires_at) for key, body, expires_at in rows],
+            )
+
+    def get_response_blob(self, key: str) -> bytes | None:
+        """Stored body for ``key`` if nothing was written since it was built and it has not expired."""
+        with self.connect() as conn:
+            row = conn.execute("SELECT version, body, expires_at FROM response_blobs WHERE key = ?", (key,)).fetchone()
+        if row is None or row["version"] != self.cache_version():
+            return None
+        if row["expires_at"] is not None and row["expires_at"] <= time.time():
+            return None
+        return bytes(row["body"])
+
+    def hot_topic_posts(self, window: str, top_topics: int, posts_per_topic: int) -> list[sqlite3.Row]:
+        """Latest posts (id, summary, content) of the top topics in the published ranking of ``window``."""
+        with self.connect() as conn:
+            topics = [
+                r["topic_id"]
+                for r in conn.execute(
+                    """
+                    SELECT topic_id FROM hot_rankings
+                    WHERE run_id = (SELECT CAST(value AS INTEGER) FROM store_meta WHERE key='published_ranking_run')
+                      AND window = ?
+                    ORDER BY hot_score DESC, topic_id
+                    LIMIT ?
+                    """,
+                    (window, top_topics),
+                )
+            ]
+            out: dict[int, sqlite3.Row] = {}
+            for topic_id in topics:
+                for r in conn.execute(
+                    """
+                    SELECT p.id, p.summary, p.content
+                    FROM topic_posts tp
+                    JOIN posts p ON p.id = tp.post_id
+                    WHERE tp.topic_id = ? AND p.duplicate_of IS NULL
+                    ORDER BY p.published_at DESC
+                    LIMIT ?
+                    """,
+                    (topic_id, posts_per_topic),
+                ):
+                    out.setdefault(int(r["id"]), r)
+        return list(out.values())
+
+    @staticmethod
+    def _burst_half_lives(conn: sqlite3.Connection) -> str | None:
+        row = conn.execute("SELECT value FROM store_meta WHERE key='burst_half_lives'").fetchone()
+        return row["value"] if row else None
+
+    def load_burst_counters(self, half_lives: tuple[float, ...]) -> list[tuple[str, str, float, bytes]]:
+        """Persisted burst counters; empty when they were written with other half-lives."""
+        with self.connect() as conn:
+            if self._burst_half_lives(conn) != json.dumps(list(half_lives)):
+                return []
+            return [
+                (r["key"], r["name"], float(r["updated"]), bytes(r["counts"]))
+                for r in conn.execute("SELECT key, name, updated, counts FROM burst_counters")
+            ]
+
+    def save_burst_counters(self, rows: list[tuple[str, str, float, bytes]], half_lives: tuple[float, ...]) -> None:
+        """Upsert changed counter rows; counters kept under other half-lives are dropped first."""
+        if not rows:
+            return
+        marker = json.dumps(list(half_lives))
+        with self.connect() as conn:
+            if self._burst_half_lives(conn) != marker:
+                conn.execute("DELETE FROM burst_counters")
+                conn.execute(
+                    """
+                    INSERT INTO store_meta (key, value) VALUES ('burst_half_lives', ?)
+                    ON CONFLICT(key) DO UPDATE SET value=excluded.value
+                    """,
+                    (marker,),
+                )
+            conn.executemany(
+                """
+                INSERT INTO burst_counters (key, name, updated, counts) VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET name=excluded.name, updated=excluded.updated, counts=excluded.counts
+                """,
+                rows,
+            )
+            self._bump_generation(conn)
+
+    def api_bursts(self, detector: Any, kind: str | None, limit: int) -> list[dict]:
+        """Entities/labels currently bursting according to ``detector`` (a ranking.burst.BurstDetector)."""
+        minute = int(time.time() // 60)
+        return self._cached(
+            "api_bursts",
+            (detector.half_lives_hours, detector.min_mentions, detector.min_z, kind, limit, minute),
+            lambda: self._api_bursts(detector, kind, limit, minute * 60.0),
+        )
+
+    def _api_bursts(self, detector: Any, kind: str | None, limit: int, now_ts: float) -> list[dict]:
+        rows = self.load_burst_counters(detector.half_lives_hours)
+        if kind:
+            rows = [r for r in rows if r[0].startswith(f"{kind}:")]
+        out = detector.scan(rows, now_ts)[:limit]
+        for item in out:
+            item["last_seen_at"] = datetime.fromtimestamp(item["last_seen_at"], timezone.utc).isoformat()
+        return out
+
+    def api_topics(self, window: str, sort: str = "hot") -> list[dict]:
+        # Hot scores decay with wall-clock time, so a cached list is reused for one minute at most.
+        minute = int(time.time() // 60)
+        return self._cached("api_topics", (window, sort, minute), lambda: self._api_topics(window, sort, minute * 60.0))
+
+    def _api_topics(self, window: str, sort: str, now_ts: float) -> list[dict]:
+        """Published rankings of a window with the recency term re-applied as of ``now_ts``.
+
+        Rows store the time-invariant part of the score (base_score) and the
+        latest post time; hot_score = base_score + weight * exp(-age / tau).
+        Rows without a base_score (written before it existed) keep their stored score.
+        """
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT hr.window, hr.topic_id, t.title, hr.hot_score,
+                       hr.cross_blogger_hot, hr.resonance, hr.breakdown_json,
+                       hr.base_score, julianday(hr.latest_post_at) AS latest_jd,
+                       rr.recency_weight, rr.recency_tau_hours
+                FROM hot_rankings hr
+                JOIN topics t ON t.topic_id = hr.topic_id
+                JOIN ranking_runs rr ON rr.run_id = hr.run_id
+                WHERE hr.run_id = (SELECT CAST(value AS INTEGER) FROM store_meta WHERE key='published_ranking_run')
+                  AND hr.window = ?
+                {"" if sort == "hot" else "ORDER BY hr.resonance DESC, hr.topic_id LIMIT 200"}
+                """,
+                (window,),
+            ).fetchall()
+        now_jd = now_ts / 86400 + _UNIX_EPOCH_JD
+        out = []
+        for r in rows:
+            item = dict(r)
+            base, latest_jd = item.pop("base_score"), item.pop("latest_jd")
+            weight, tau = item.pop("recency_weight"), item.pop("recency_tau_hours")
+            recency = None
+            if base is not None and latest_jd is not None and tau:
+                recency = math.exp(-(now_jd - latest_jd) * 24 / tau)
+                item["hot_score"] = round(base + weight * recency, 6)
+            out.append((item, recency))
+        if sort == "hot":
+            out.sort(key=lambda x: (-x[0]["hot_score"], x[0]["topic_id"]))
+            out = out[:200]
+        for item, recency in out:
+            if recency is not None:
+                breakdown = json.loads(item["breakdown_json"])
+                breakdown["R_recency"] = round(recency, 4)
+                item["breakdown_json"] = json.dumps(breakdown, ensure_ascii=False)
+        return [item for item, _ in out]
+
+    def api_topic_detail(self, topic_id: str) -> dict | None:
+        return self._cached("api_topic_detail", (topic_id,), lambda: self._api_topic_detail(topic_id))
+
+    def _api_topic_detail(self, topic_id: str) -> dict | None:
+        with self.connect() as conn:
+            topic = conn.execute("SELECT * FROM topics WHERE topic_id=?", (topic_id,)).fetchone()
+            redirected_from = None
+            if not topic:
+                redirect = conn.execute(
+                    "SELECT to_topic_id FROM topic_redirects WHERE from_topic_id=?", (topic_id,)
+                ).fetchone()
+                if redirect:
+                    redirected_from, topic_id = topic_id, redirect["to_topic_id"]
+                    topic = conn.execute("SELECT * FROM topics WHERE topic_id=?", (topic_id,)).fetchone()
+            if not topic:
+                return None
+            posts = conn.execute(
+                """
+                SELECT p.id, p.title, p.url, p.author, p.published_at, p.summary, p.blog_id
+                FROM topic_posts tp
+                JOIN posts p ON p.id = tp.post_id
+                WHERE tp.topic_id=?
+                ORDER BY datetime(p.published_at) DESC
+                LIMIT 200
+                """,
+                (topic_id,),
+            ).fetchall()
+            out = {
+                "topic": dict(topic),
+                "posts": [dict(x) for x in posts],
+            }
+            if redirected_from:
+                out["redirected_from"] = redirected_from
+            return out
+
+    def api_topic_trend(self, topic_id: str, window: str, hours: int, step_minutes: int) -> dict | None:
+        minute = int(time.time() // 60)
+        return self._cached(
+            "api_topic_trend",
+            (topic_id, window, hours, step_minutes, minute),
+            lambda: self._api_topic_trend(topic_id, window, hours, step_minutes, minute * 60.0),
+        )
+
+    def _api_topic_trend(self, topic_id: str, window: str, hours: int, step_minutes: int, now_ts: float) -> dict | None:
+        """Hot score of a topic over the last ``hours``, sampled every ``step_minutes``, plus its change points.
+
+        Between change points only the recency term moves, so samples are
+        reconstructed from the last point (base + weight * exp(-age / tau)) with
+        the published run's recency parameters.
+        """
+        start = int(now_ts - hours * 3600)
+        with self.connect() as conn:
+            redirected_from = None
+            redirect = conn.execute("SELECT to_topic_id FROM topic_redirects WHERE from_topic_id=?", (topic_id,)).fetchone()
+            if redirect:
+                redirected_from, topic_id = topic_id, redirect["to_topic_id"]
+            key = conn.execute("SELECT topic_key FROM topic_keys WHERE topic_id=?", (topic_id,)).fetchone()
+            run = conn.execute(
+                """
+                SELECT recency_weight, recency_tau_hours FROM ranking_runs
+                WHERE run_id = (SELECT CAST(value AS INTEGER) FROM store_meta WHERE key='published_ranking_run')
+                """
+            ).fetchone()
+            if key is None or run is None or run["recency_tau_hours"] is None:
+                return None
+            rows = conn.execute(
+                """
+                SELECT * FROM ranking_history
+                WHERE window = ? AND topic_key = ?
+                  AND ts >= COALESCE(
+                    (SELECT MAX(ts) FROM ranking_history WHERE window = ? AND topic_key = ? AND ts <= ?), ?)
+                  AND ts <= ?
+                ORDER BY ts
+                """,
+                (window, key["topic_key"], window, key["topic_key"], start, start, int(now_ts)),
+            ).fetchall()
+        weight, tau = float(run["recency_weight"]), float(run["recency_tau_hours"])
+        scale = _HISTORY_SCALE
+
+        def hot_at(r: sqlite3.Row, ts: float) -> float | None:
+            if not r["n_posts"]:
+                return None
+            return round(r["base"] / scale + weight * math.exp(-(ts - r["latest"]) / 3600 / tau), 4)
+
+        def iso(ts: float) -> str:
+            return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+        points = []
+        i = -1
+        step = max(1, step_minutes) * 60
+        samples = list(range(start, int(now_ts) + 1, step))
+        if samples[-1] != int(now_ts):
+            samples.append(int(now_ts))
+        for ts in samples:
+            while i + 1 < len(rows) and rows[i + 1]["ts"] <= ts:
+                i += 1
+            r = rows[i] if i >= 0 else None
+            points.append({"ts": iso(ts), "hot_score": hot_at(r, ts) if r else None, "n_posts": r["n_posts"] if r else 0})
+        changes = [
+            {
+                "ts": iso(r["ts"]),
+                "hot_score": hot_at(r, r["ts"]),
+                "D_diversity": r["d"] / scale,
+                "Q_volume": r["q"] / scale,
+                "V_velocity": r["v"] / scale,
+                "R_recency": round(math.exp(-(r["ts"] - r["latest"]) / 3600 / tau), 4) if r["n_posts"] else None,
+                "resonance": r["resonance"] / scale,
+                "n_posts": r["n_posts"],
+                "n_blogs": r["n_blogs"],
+                "n_prev": r["n_prev"],
+            }
+            for r in rows
+            if r["ts"] >= start
+        ]
+        out = {"topic_id": topic_id, "window": window, "points": points, "changes": changes}
+        if redirected_from:
+            out["redirected_from"] = redirected_from
+        return out
+
+    def api_movers(self, window: str, hours: int, limit: int) -> list[dict]:
+        minute = int(time.time() // 60)
+        return self._cached(
+            "api_movers", (window, hours, limit, minute), lambda: self._api_movers(window, hours, limit, minute * 60.0)
+        )
+
+    def _api_movers(self, window: str, hours: int, limit: int, now_ts: float) -> list[dict]:
+        """Topics of the published ranking whose hot score rose the most over the last ``hours``.
+
+        The earlier score comes from each series' last history point at that
+        time (one primary-key seek per ranked topic); topics absent then count as 0.
+        """
+        past_ts = int(now_ts - hours * 3600)
+        with self.connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT hr.topic_id, t.title, hr.base_score, julianday(hr.latest_post_at) AS latest_jd,
+                       rr.recency_weight, rr.recency_tau_hours,
+                       h.base AS past_base, h.latest AS past_latest, h.n_posts AS past_n_posts
+                FROM hot_rankings hr
+                JOIN topics t ON t.topic_id = hr.topic_id
+                JOIN ranking_runs rr ON rr.run_id = hr.run_id
+                LEFT JOIN topic_keys k ON k.topic_id = hr.topic_id
+                LEFT JOIN ranking_history h
+                  ON h.window = hr.window AND h.topic_key = k.topic_key
+                 AND h.ts = (SELECT MAX(x.ts) FROM ranking_history x
+                             WHERE x.window = hr.window AND x.topic_key = k.topic_key AND x.ts <= ?)
+                WHERE hr.run_id = (SELECT CAST(value AS INTEGER) FROM store_meta WHERE key='published_ranking_run')
+                  AND hr.window = ?
+                  AND hr.base_score IS NOT NULL
+                """,
+                (past_ts, window),
+            ).fetchall()
+        now_jd = now_ts / 86400 + _UNIX_EPOCH_JD
+        out = []
+        for r in rows:
+            weight, tau = float(r["recency_weight"]), float(r["recency_tau_hours"])
+            hot = r["base_score"] + weight * math.exp(-(now_jd - r["latest_jd"]) * 24 / tau)
+            past = 0.0
+            if r["past_n_posts"]:
+                past = r["past_base"] / _HISTORY_SCALE + weight * math.exp(-(past_ts - r["past_latest"]) / 3600 / tau)
+            out.append(
+                {
+                    "topic_id": r["topic_id"],
+                    "title": r["title"],
+                    "hot_score": round(hot, 4),
+                    "previous_hot_score": round(past, 4),
+                    "delta": round(hot - past, 4),
+                    "new": not r["past_n_posts"],
+                }
+            )
+        out.sort(key=lambda x: (-x["delta"], x["topic_id"]))
+        return out[:limit]
+
+    def api_posts(self, label: str | None, after: str | None) -> list[sqlite3.Row]:
+        sql = """
+        SELECT DISTINCT p.id, p.title, p.url, p.author, p.published_at, p.summary
+        FROM posts p
+        LEFT JOIN post_labels pl ON pl.post_id = p.id
+        WHERE 1=1
+        """
+        params: list = []
+        if label:
+            sql += " AND pl.label_id = ?"
+            params.append(label)
+        if after:
+            sql += " AND datetime(p.published_at) >= datetime(?)"
+            params.append(after)
+        sql += " ORDER BY datetime(p.published_at) DESC LIMIT 200"
+        with self.connect() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def api_entities(self, q: str) -> list[sqlite3.Row]:
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                SELECT canonical_name, entity_type, entity_id, COUNT(*) AS mentions
+                FROM post_entities
+                WHERE lower(canonical_name) LIKE lower(?)
+                GROUP BY canonical_name, entity_type, entity_id
+                ORDER BY mentions DESC
+                LIMIT 50
+                """,
+                (f"%{q}%",),
+            ).fetchall()
+
+    def api_browse_posts(self, kind: str, value: str, limit: int = 300) -> list[sqlite3.Row]:
+        with self.connect() as conn:
+            if kind == "topic":
+                return conn.execute(
+                    """
+                    SELECT DISTINCT
+                      p.id, p.title, p.url, p.author, p.blog_id, p.published_at, p.summary,
+                      COALESCE(MAX(CASE WHEN pl.primary_label = 1 THEN pl.label_id END), '') AS primary_label
+                    FROM posts p
+                    JOIN topic_posts tp ON tp.post_id = p.id
+                    JOIN topics t ON t.topic_id = tp.topic_id
+                    LEFT JOIN post_labels pl ON pl.post_id = p.id
+                    WHERE t.title = ?
+                    GROUP BY p.id, p.title, p.url, p.author, p.blog_id, p.published_at, p.summary
+                    ORDER BY datetime(p.published_at) DESC
+                    LIMIT ?
                     """,
                     (value, limit),
                 ).fetchall()
@@ -523,6 +2994,9 @@ class Store:
             ).fetchone()
 
     def api_available_dates(self, limit: int = 90) -> list[sqlite3.Row]:
+        return self._cached("api_available_dates", (limit,), lambda: self._api_available_dates(limit))
+
+    def _api_available_dates(self, limit: int) -> list[sqlite3.Row]:
         with self.connect() as conn:
             return conn.execute(
                 """
@@ -536,6 +3010,10 @@ class Store:
             ).fetchall()
 
     def api_daily_digest(self, day: str) -> dict:
+        # Shallow copy so callers may replace top-level keys without touching the cached digest.
+        return dict(self._cached("api_daily_digest", (day,), lambda: self._api_daily_digest(day)))
+
+    def _api_daily_digest(self, day: str) -> dict:
         with self.connect() as conn:
             stats_row = conn.execute(
                 """
@@ -614,6 +3092,9 @@ class Store:
         }
 
     def api_sources(self, days: int = 7) -> list[sqlite3.Row]:
+        return self._cached("api_sources", (days,), lambda: self._api_sources(days))
+
+    def _api_sources(self, days: int) -> list[sqlite3.Row]:
         with self.connect() as conn:
             return conn.execute(
                 """
@@ -662,4 +3143,5 @@ class Store:
                 conn.execute("DELETE FROM topic_posts WHERE post_id IN (SELECT id FROM posts WHERE feed_id=?)", (feed_id,))
                 conn.execute("DELETE FROM posts WHERE feed_id=?", (feed_id,))
             conn.execute("DELETE FROM feeds WHERE id=?", (feed_id,))
+            self._bump_generation(conn)
             return True
@@ -0,0 +1,76 @@
+"""JSON bodies of the hot read endpoints, shared by the API handlers and the pipeline's precomputed blobs."""
+from __future__ import annotations
+
+from typing import Callable
+
+from db.fastjson import dumps, dumps_with_raw
+from db.store import Store
+from translate.text import to_cn_text
+
+# Sorts /api/topics precomputes; any other value is ordered like "resonance".
+TOPIC_SORTS = ("hot", "resonance")
+DIGEST_SUMMARY_LIMIT = 220
+
+
+def daily_key(day: str) -> str:
+    return f"daily:{day}"
+
+
+def topics_key(window: str, sort: str) -> str:
+    return f"topics:{window}:{sort}"
+
+
+def add_zh_title_summary(
+    store: Store,
+    items: list[dict],
+    target: str,
+    summary_limit: int,
+    translate_many: Callable[[list[tuple[str, int]]], list[str]] | None = None,
+) -> bool:
+    """Set zh_title/zh_summary on post dicts from pre-translations; misses go to ``translate_many`` in one batch.
+
+    Without ``translate_many`` misses are left unset; returns whether every post got both fields.
+    """
+    stored = store.get_post_translations([int(it["id"]) for it in items if it.get("id") is not None], target)
+    pending = []
+    for it in items:
+        done = stored.get(it.get("id"), {})
+        for field, key, limit in (("title", "zh_title", 120), ("summary", "zh_summary", summary_limit)):
+            text = it.get(field) or ""
+            if field in done:
+                it[key] = to_cn_text(done[field] or text, limit=limit)
+            else:
+                pending.append((it, key, text, limit))
+    if pending and translate_many is None:
+        return False
+    zh = translate_many([(text, limit) for _, _, text, limit in pending]) if pending else []
+    for (it, key, _, _), value in zip(pending, zh):
+        it[key] = value
+    return True
+
+
+def daily_body(
+    store: Store, day: str, target: str, translate_many: Callable[[list[tuple[str, int]]], list[str]] | None = None
+) -> bytes | None:
+    """``/api/daily`` body; None when a post lacks a stored translation and no ``translate_many`` is given."""
+    digest = store.api_daily_digest(day)
+    posts = []
+    for p in digest.get("posts", []):
+        item = dict(p)
+        item["labels"] = [x for x in (p.get("label_tags") or "").split(",") if x]
+        item["topics"] = [x for x in (p.get("topic_tags") or "").split(",") if x]
+        posts.append(item)
+    if not add_zh_title_summary(store, posts, target, DIGEST_SUMMARY_LIMIT, translate_many):
+        return None
+    digest["posts"] = posts
+    return dumps(digest)
+
+
+def topics_body(store: Store, window: str, sort: str) -> bytes:
+    """``/api/topics`` body; each row's stored breakdown JSON is spliced in unparsed."""
+    items, breakdowns = [], []
+    for r in store.api_topics(window=window, sort=sort):
+        item = dict(r)
+        breakdowns.append(item.pop("breakdown_json"))
+        items.append(item)
+    return dumps_with_raw(items, "breakdown", breakdowns)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from nlp.artifact import load_bundle
+from nlp.classifier import RuleClassifier
+from nlp.entity_extractor import EntityExtractor
+from nlp.tokenizer import tokenize
+from topic_engine.topic_builder import TopicBuilder
+
+
+class Annotator:
+    """Classify, extract entities and pick a topic for batches of posts.
+
+    Stateless apart from the compiled dictionaries, so one instance per worker
+    process can annotate chunks independently of the database.
+    """
+
+    def __init__(self, config_dir: str | Path):
+        self.bundle = load_bundle(config_dir)
+        self.dictionaries = self.bundle.dictionaries
+        self.classifier = RuleClassifier(dictionaries=self.dictionaries)
+        self.entity_extractor = EntityExtractor(dictionaries=self.dictionaries)
+        self.topic_builder = TopicBuilder(cfg=self.bundle.topic_builder)
+        self.dict_version = self.dictionaries.version
+
+    def annotate(self, rows: list[tuple]) -> list[dict]:
+        """Annotate (id, title, summary, content) rows; output feeds ``Store.save_annotations``."""
+        # Tokenize once per post: the lowered text feeds the matcher, the term
+        # frequencies are persisted (post_terms) and drive topic clustering.
+        docs = [tokenize("\n".join([title or "", summary or "", content or ""])) for _, title, summary, content, *_ in rows]
+        hit_sets = [self.dictionaries.scan_lowered(doc.lowered) for doc in docs]
+        label_sets = self.classifier.classify_hits_batch(hit_sets)
+
+        out: list[dict] = []
+        for row, doc, hits, labels in zip(rows, docs, hit_sets, label_sets):
+            post_id, title = row[0], row[1]
+            entities = self.entity_extractor.extract_hits(hits)
+            topic_id, evidence = self.topic_builder.assign_topic(entities, labels)
+            topic = None
+            if topic_id:
+                topic = {
+                    "topic_id": topic_id,
+                    "topic_type": "ENTITY" if entities else "CLUSTER",
+                    "title": entities[0]["canonical"] if entities else (title or "Topic"),
+                    "primary_entity_id": entities[0]["id"] if entities else None,
+                    "evidence": evidence,
+                }
+            out.append(
+                {
+                    "post_id": post_id,
+                    "labels": labels,
+                    "entities": entities,
+                    "topic": topic,
+                    "terms": doc.tf,
+                    "n_tokens": len(doc.tokens),
+                }
+            )
+        return out
@@ -0,0 +1,109 @@
+"""Precompiled dictionary artifact, so cold starts skip YAML parsing and matcher builds.
+
+The artifact is a marshal dump of the parsed configs plus the compiled
+``CompiledDictionaries`` tables. It is named after a hash of the YAML bytes
+(and the marshal/Python version), so editing any config file simply makes the
+existing artifact invisible and loaders fall back to YAML until
+``cli.py compile-dicts`` is run again.
+"""
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from nlp.dictionary import CompiledDictionaries, load_yaml
+
+ARTIFACT_FORMAT = 1
+SOURCE_FILES = ("taxonomy.yaml", "entities.yaml", "topic_builder.yaml", "hot_config.yaml")
+
+
+@dataclass
+class DictionaryBundle:
+    dictionaries: CompiledDictionaries
+    topic_builder: dict
+    hot_config: dict
+    source_hash: str
+    from_artifact: bool = False
+
+
+def source_hash(config_dir: str | Path) -> str:
+    cdir = Path(config_dir)
+    h = hashlib.sha256(f"{ARTIFACT_FORMAT}|{marshal.version}|{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    for name in SOURCE_FILES:
+        h.update(b"\0" + name.encode() + b"\0")
+        h.update((cdir / name).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def artifact_dir(config_dir: str | Path) -> Path:
+    env_dir = os.getenv("AINEWS_DICT_CACHE_DIR", "").strip()
+    return Path(env_dir) if env_dir else Path(config_dir) / ".compiled"
+
+
+def artifact_path(config_dir: str | Path, digest: str | None = None) -> Path:
+    return artifact_dir(config_dir) / f"dicts-{digest or source_hash(config_dir)}.bin"
+
+
+def compile_bundle(config_dir: str | Path, digest: str | None = None) -> DictionaryBundle:
+    cdir = Path(config_dir)
+    return DictionaryBundle(
+        dictionaries=CompiledDictionaries.from_paths(str(cdir / "taxonomy.yaml"), str(cdir / "entities.yaml")),
+        topic_builder=load_yaml(str(cdir / "topic_builder.yaml")),
+        hot_config=load_yaml(str(cdir / "hot_config.yaml")),
+        source_hash=digest or source_hash(cdir),
+    )
+
+
+def write_artifact(config_dir: str | Path) -> dict:
+    """Compile the dictionaries and write the artifact; older artifacts in the same dir are removed."""
+    bundle = compile_bundle(config_dir)
+    path = artifact_path(config_dir, bundle.source_hash)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = marshal.dumps(
+        {
+            "format": ARTIFACT_FORMAT,
+            "source_hash": bundle.source_hash,
+            "dictionaries": bundle.dictionaries.to_state(),
+            "topic_builder": bundle.topic_builder,
+            "hot_config": bundle.hot_config,
+        }
+    )
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+    removed = 0
+    for old in path.parent.glob("dicts-*.bin"):
+        if old != path:
+            old.unlink(missing_ok=True)
+            removed += 1
+    return {
+        "path": str(path),
+        "bytes": len(payload),
+        "source_hash": bundle.source_hash,
+        "dict_version": bundle.dictionaries.version,
+        "patterns": len(bundle.dictionaries.matcher),
+        "removed_stale": removed,
+    }
+
+
+def load_bundle(config_dir: str | Path) -> DictionaryBundle:
+    """Load from the artifact when it matches the current YAML, otherwise compile from YAML."""
+    digest = source_hash(config_dir)
+    path = artifact_path(config_dir, digest)
+    try:
+        data = marshal.loads(path.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        data = None
+    if not data or data.get("format") != ARTIFACT_FORMAT or data.get("source_hash") != digest:
+        return compile_bundle(config_dir, digest)
+    return DictionaryBundle(
+        dictionaries=CompiledDictionaries.from_state(data["dictionaries"]),
+        topic_builder=data["topic_builder"],
+        hot_config=data["hot_config"],
+        source_hash=digest,
+        from_artifact=True,
+    )
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import chain
 
-import yaml
+from nlp.dictionary import KEYWORD_TIERS, CompiledDictionaries, load_yaml
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    _HAS_NUMPY = False
 
 
 @dataclass
@@ -12,30 +19,35 @@ class LabelResult:
 
 
 class RuleClassifier:
-    def __init__(self, taxonomy_path: str):
-        with open(taxonomy_path, "r", encoding="utf-8") as f:
-            self.cfg = yaml.safe_load(f)
+    def __init__(self, taxonomy_path: str | None = None, dictionaries: CompiledDictionaries | None = None):
+        if dictionaries is None:
+            dictionaries = CompiledDictionaries(taxonomy=load_yaml(taxonomy_path))
+        self.dictionaries = dictionaries
+        self.cfg = dictionaries.taxonomy
         self.boost = self.cfg["scoring"]["boost"]
         self.thresholds = self.cfg["scoring"]["thresholds"]
         self.labels = self.cfg["labels"]
+        self._tier_matrix = None
 
     def classify(self, text: str) -> list[dict]:
-        t = text.lower()
+        return self.classify_hits(self.dictionaries.scan(text))
+
+    def classify_hits(self, hits: set[int]) -> list[dict]:
+        """Score labels from matcher hits produced by ``CompiledDictionaries.scan``."""
+        d = self.dictionaries
+        touched: set[int] = set()
+        for pid in hits:
+            touched.update(d.pattern_labels.get(pid, ()))
+
         scored: list[LabelResult] = []
-        for label in self.labels:
+        for li in sorted(touched):
             s = 0.0
-            for kw in label.get("keywords_strong", []):
-                if kw.lower() in t:
-                    s += self.boost["strong"]
-            for kw in label.get("keywords_medium", []):
-                if kw.lower() in t:
-                    s += self.boost["medium"]
-            for kw in label.get("keywords_weak", []):
-                if kw.lower() in t:
-                    s += self.boost["weak"]
+            for pid, tier in d.label_postings[li]:
+                if pid in hits:
+                    s += self.boost[tier]
             if s > 0:
                 score = min(1.0, s / 3.0)
-                scored.append(LabelResult(label_id=label["id"], score=score))
+                scored.append(LabelResult(label_id=d.labels[li]["id"], score=score))
 
         if not scored:
             return []
@@ -51,3 +63,86 @@ class RuleClassifier:
             elif item.score >= secondary_min:
                 out.append({"id": item.label_id, "score": item.score, "primary": False})
         return out
+
+    def classify_batch(self, texts: list[str]) -> list[list[dict]]:
+        """Vectorized ``classify`` for many posts; returns the same lists ``classify`` would."""
+        return self.classify_hits_batch([self.dictionaries.scan(t) for t in texts])
+
+    def classify_hits_batch(self, hit_sets: list[set[int]]) -> list[list[dict]]:
+        if not _HAS_NUMPY or not hit_sets:
+            return [self.classify_hits(h) for h in hit_sets]
+        scores = self.score_batch(hit_sets)
+        primary_min = float(self.thresholds["primary_label_min"])
+        secondary_min = float(self.thresholds["secondary_label_min"])
+
+        # Stable descending sort keeps ties in taxonomy order, like list.sort in classify_hits.
+        order = np.argsort(-scores, axis=1, kind="stable")
+        ranked = np.take_along_axis(scores, order, axis=1)
+        keep = (ranked >= secondary_min) & (ranked > 0)
+        is_primary = np.zeros_like(keep)
+        if ranked.shape[1]:
+            is_primary[:, 0] = (ranked[:, 0] >= primary_min) & (ranked[:, 0] > 0)
+        keep |= is_primary
+
+        label_ids = [label["id"] for label in self.dictionaries.labels]
+        out: list[list[dict]] = [[] for _ in hit_sets]
+        rows, cols = np.nonzero(keep)
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            out[r].append({"id": label_ids[order[r, c]], "score": float(ranked[r, c]), "primary": bool(is_primary[r, c])})
+        return out
+
+    def score_batch(self, hit_sets: list[set[int]]) -> "np.ndarray":
+        """Label scores (posts × labels) for a batch of matcher hit sets.
+
+        The hits form a sparse post × keyword matrix (CSR rows/cols). Multiplying it
+        by the precomputed keyword → (label, tier) count matrix gives per-tier hit
+        counts; the ``scoring.boost`` tier weights are then folded in tier order
+        (strong, medium, weak), the same accumulation order as ``classify_hits``,
+        so the float scores and threshold decisions are identical.
+        """
+        d = self.dictionaries
+        n_tiers = len(KEYWORD_TIERS)
+        width = len(d.labels) * n_tiers
+        n = len(hit_sets)
+        t_indptr, t_indices, t_data = self._keyword_tier_matrix()
+
+        # Sparse post × keyword hits (COO), expanded through the keyword's CSR row of the
+        # keyword → (label, tier) matrix, then reduced with one bincount.
+        lengths = np.fromiter((len(h) for h in hit_sets), dtype=np.int64, count=n)
+        cols = np.fromiter(chain.from_iterable(hit_sets), dtype=np.int64, count=int(lengths.sum()))
+        rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        fanout = t_indptr[cols + 1] - t_indptr[cols]
+        total = int(fanout.sum())
+        counts = np.zeros(n * width, dtype=np.int64)
+        if total:
+            starts = np.repeat(t_indptr[cols], fanout)
+            offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+            entry = starts + offsets
+            flat = np.repeat(rows, fanout) * width + t_indices[entry]
+            counts = np.bincount(flat, weights=t_data[entry], minlength=n * width).astype(np.int64)
+        counts = counts.reshape(n, len(d.labels), n_tiers)
+
+        s = np.zeros((n, len(d.labels)), dtype=np.float64)
+        for ti, tier in enumerate(KEYWORD_TIERS):
+            boost = float(self.boost[tier])
+            tier_counts = counts[:, :, ti]
+            for k in range(int(tier_counts.max(initial=0))):
+                s = np.where(tier_counts > k, s + boost, s)
+        return np.where(s > 0, np.minimum(1.0, s / 3.0), 0.0)
+
+    def _keyword_tier_matrix(self) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """CSR (indptr, indices, data) of keyword → label*3+tier hit multiplicities."""
+        if self._tier_matrix is None:
+            d = self.dictionaries
+            tiers = {t: i for i, t in enumerate(KEYWORD_TIERS)}
+            per_pattern: list[dict[int, int]] = [{} for _ in range(len(d.matcher))]
+            for li, postings in enumerate(d.label_postings):
+                for pid, tier in postings:
+                    col = li * len(KEYWORD_TIERS) + tiers[tier]
+                    per_pattern[pid][col] = per_pattern[pid].get(col, 0) + 1
+            indptr = np.zeros(len(per_pattern) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(x) for x in per_pattern])
+            indices = np.fromiter((c for x in per_pattern for c in x), dtype=np.int64, count=int(indptr[-1]))
+            data = np.fromiter((v for x in per_pattern for v in x.values()), dtype=np.float64, count=int(indptr[-1]))
+            self._tier_matrix = (indptr, indices, data)
+        return self._tier_matrix
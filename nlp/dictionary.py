@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import json
+
+import yaml
+
+from nlp.matcher import KeywordMatcher
+
+KEYWORD_TIERS = ("strong", "medium", "weak")
+
+
+def load_yaml(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def _word_boundary(cfg: dict) -> bool:
+    return bool((cfg.get("matching") or {}).get("word_boundary", False))
+
+
+class CompiledDictionaries:
+    """Taxonomy keywords and entity aliases compiled into one KeywordMatcher.
+
+    ``scan`` lowercases the text once and returns the set of matched pattern
+    ids; ``RuleClassifier.classify_hits`` and ``EntityExtractor.extract_hits``
+    turn that set into labels and entities through the inverted tables below,
+    so a post is scanned once no matter how large the dictionaries are.
+    """
+
+    def __init__(self, taxonomy: dict | None = None, entities: dict | None = None) -> None:
+        self.taxonomy = taxonomy or {}
+        self.entities_cfg = entities or {}
+        self.labels: list[dict] = list(self.taxonomy.get("labels") or [])
+        self.entities: list[dict] = list(self.entities_cfg.get("entities") or [])
+        self.matcher = KeywordMatcher()
+
+        label_wb = _word_boundary(self.taxonomy)
+        # Per label, (pattern id, tier) in the order keywords are listed: scores are summed
+        # in this order so floating-point results match the original per-keyword scan.
+        self.label_postings: list[list[tuple[int, str]]] = []
+        self.pattern_labels: dict[int, list[int]] = {}
+        for li, label in enumerate(self.labels):
+            postings: list[tuple[int, str]] = []
+            for tier in KEYWORD_TIERS:
+                for kw in label.get(f"keywords_{tier}", []) or []:
+                    pid = self.matcher.add(kw, label_wb)
+                    postings.append((pid, tier))
+                    refs = self.pattern_labels.setdefault(pid, [])
+                    if not refs or refs[-1] != li:
+                        refs.append(li)
+            self.label_postings.append(postings)
+
+        entity_wb = _word_boundary(self.entities_cfg)
+        self.pattern_entities: dict[int, list[int]] = {}
+        for ei, ent in enumerate(self.entities):
+            for term in list(ent.get("aliases", []) or []) + list(ent.get("trigger_keywords", []) or []):
+                pid = self.matcher.add(term, entity_wb)
+                refs = self.pattern_entities.setdefault(pid, [])
+                if not refs or refs[-1] != ei:
+                    refs.append(ei)
+        self.matcher.compile()
+        self._version: str | None = None
+
+    @classmethod
+    def from_paths(cls, taxonomy_path: str | None = None, entities_path: str | None = None) -> "CompiledDictionaries":
+        return cls(
+            taxonomy=load_yaml(taxonomy_path) if taxonomy_path else None,
+            entities=load_yaml(entities_path) if entities_path else None,
+        )
+
+    def to_state(self) -> dict:
+        """Everything ``from_state`` needs, as marshal-safe containers."""
+        return {
+            "taxonomy": self.taxonomy,
+            "entities": self.entities_cfg,
+            "matcher": self.matcher.to_state(),
+            "label_postings": self.label_postings,
+            "pattern_labels": self.pattern_labels,
+            "pattern_entities": self.pattern_entities,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "CompiledDictionaries":
+        d = cls.__new__(cls)
+        d.taxonomy = state["taxonomy"]
+        d.entities_cfg = state["entities"]
+        d.labels = list(d.taxonomy.get("labels") or [])
+        d.entities = list(d.entities_cfg.get("entities") or [])
+        d.matcher = KeywordMatcher.from_state(state["matcher"])
+        d.label_postings = [[(pid, tier) for pid, tier in postings] for postings in state["label_postings"]]
+        d.pattern_labels = state["pattern_labels"]
+        d.pattern_entities = state["pattern_entities"]
+        d._version = state["version"]
+        return d
+
+    @property
+    def version(self) -> str:
+        """Content hash of everything that influences annotation output."""
+        if self._version is None:
+            payload = json.dumps(self.term_map(), sort_keys=True, ensure_ascii=False).encode("utf-8")
+            self._version = hashlib.sha256(payload).hexdigest()[:16]
+        return self._version
+
+    def term_map(self) -> dict:
+        """Serializable description of what every term contributes, used to diff versions.
+
+        ``terms`` maps "<word_boundary>|<term>" to the sorted label/entity references the
+        term feeds; ``global`` holds settings that affect every post (boosts, thresholds).
+        """
+        terms: dict[str, list[str]] = {}
+        for li, postings in enumerate(self.label_postings):
+            label_id = self.labels[li]["id"]
+            for pid, tier in postings:
+                text, wb = self.matcher.patterns[pid]
+                terms.setdefault(f"{int(wb)}|{text}", []).append(f"L:{label_id}:{tier}")
+        for pid, ents in self.pattern_entities.items():
+            text, wb = self.matcher.patterns[pid]
+            for ei in ents:
+                ent = self.entities[ei]
+                terms.setdefault(f"{int(wb)}|{text}", []).append(f"E:{ent['id']}:{ent['canonical']}:{ent['type']}")
+        scoring = self.taxonomy.get("scoring") or {}
+        return {
+            "global": {"boost": scoring.get("boost"), "thresholds": scoring.get("thresholds")},
+            # Order decides tie-breaks between labels and which entity names a topic.
+            "label_order": [label["id"] for label in self.labels],
+            "entity_order": [ent["id"] for ent in self.entities],
+            "terms": {k: sorted(v) for k, v in terms.items()},
+        }
+
+    def scan(self, text: str) -> set[int]:
+        return self.matcher.find(text.lower())
+
+    def scan_lowered(self, lowered: str) -> set[int]:
+        return self.matcher.find(lowered)
+
+
+def diff_term_maps(old: dict, new: dict) -> tuple[bool, set[str]]:
+    """Compare two ``term_map`` snapshots.
+
+    Returns (full, terms): ``full`` is true when a global setting changed and
+    every post must be re-annotated; otherwise ``terms`` holds the lowercased
+    terms whose contribution was added, removed or changed — only posts
+    containing one of them can annotate differently.
+    """
+    if old.get("global") != new.get("global"):
+        return True, set()
+    for key in ("label_order", "entity_order"):
+        new_ids = set(new.get(key) or [])
+        old_ids = set(old.get(key) or [])
+        if [x for x in old.get(key) or [] if x in new_ids] != [x for x in new.get(key) or [] if x in old_ids]:
+            return True, set()
+    old_terms = old.get("terms") or {}
+    new_terms = new.get("terms") or {}
+    changed: set[str] = set()
+    for key in set(old_terms) | set(new_terms):
+        if old_terms.get(key) != new_terms.get(key):
+            changed.add(key.split("|", 1)[1])
+    if "" in changed:
+        # An empty term matches every post.
+        return True, set()
+    return False, changed
@@ -1,35 +1,34 @@
 from __future__ import annotations
 
-import yaml
+from nlp.dictionary import CompiledDictionaries, load_yaml
 
 
 class EntityExtractor:
-    def __init__(self, entity_path: str):
-        with open(entity_path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
-        self.entities = cfg["entities"]
+    def __init__(self, entity_path: str | None = None, dictionaries: CompiledDictionaries | None = None):
+        if dictionaries is None:
+            dictionaries = CompiledDictionaries(entities=load_yaml(entity_path))
+        self.dictionaries = dictionaries
+        self.entities = dictionaries.entities
 
     def extract(self, text: str) -> list[dict]:
-        t = text.lower()
+        return self.extract_hits(self.dictionaries.scan(text))
+
+    def extract_hits(self, hits: set[int]) -> list[dict]:
+        """Resolve entities from matcher hits produced by ``CompiledDictionaries.scan``."""
+        d = self.dictionaries
+        matched: set[int] = set()
+        for pid in hits:
+            matched.update(d.pattern_entities.get(pid, ()))
+
         out: list[dict] = []
-        for ent in self.entities:
-            matched = False
-            for alias in ent.get("aliases", []):
-                if alias.lower() in t:
-                    matched = True
-                    break
-            if not matched:
-                for kw in ent.get("trigger_keywords", []):
-                    if kw.lower() in t:
-                        matched = True
-                        break
-            if matched:
-                out.append(
-                    {
-                        "id": ent["id"],
-                        "canonical": ent["canonical"],
-                        "type": ent["type"],
-                        "confidence": 0.9,
-                    }
-                )
+        for ei in sorted(matched):
+            ent = self.entities[ei]
+            out.append(
+                {
+                    "id": ent["id"],
+                    "canonical": ent["canonical"],
+                    "type": ent["type"],
+                    "confidence": 0.9,
+                }
+            )
         return out
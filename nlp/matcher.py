@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.terminal = False
+
+
+def _trie_regex(node: _TrieNode) -> str:
+    alts = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.children.items())]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if node.terminal:
+        # Greedy optional: the longest pattern wins, shorter ones are recovered as prefixes.
+        return body + "?" if len(alts) == 1 and len(body) == 1 else "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """Find every occurrence of many literal patterns in one pass over the text.
+
+    Patterns are compiled into a single trie-shaped regex wrapped in a
+    lookahead, so the regex engine reports the longest pattern starting at each
+    position; every shorter pattern that is a prefix of it is recovered from a
+    precomputed table. This yields exactly the set of patterns for which
+    ``pattern in text`` holds, in one C-level scan instead of one scan per
+    pattern. Patterns flagged with ``word_boundary`` additionally require
+    non-word characters (or the text edge) on both sides.
+
+    Input text must already be lowercased; patterns are lowercased on build.
+    """
+
+    def __init__(self, patterns: Iterable[tuple[str, bool]] = ()) -> None:
+        self.patterns: list[tuple[str, bool]] = []
+        self._ids: dict[tuple[str, bool], int] = {}
+        for text, word_boundary in patterns:
+            self.add(text, word_boundary)
+        self._compiled = False
+        self._source = ""
+        self._regex: re.Pattern | None = None
+        self._by_string: dict[str, list[int]] = {}
+        self._prefixes: dict[str, tuple[str, ...]] = {}
+        self._always: tuple[int, ...] = ()
+
+    def add(self, text: str, word_boundary: bool = False) -> int:
+        key = (str(text).lower(), bool(word_boundary))
+        pid = self._ids.get(key)
+        if pid is None:
+            pid = self._ids[key] = len(self.patterns)
+            self.patterns.append(key)
+            self._compiled = False
+        return pid
+
+    def id_of(self, text: str, word_boundary: bool = False) -> int:
+        return self._ids[(str(text).lower(), bool(word_boundary))]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def compile(self) -> None:
+        by_string: dict[str, list[int]] = {}
+        for pid, (text, _) in enumerate(self.patterns):
+            by_string.setdefault(text, []).append(pid)
+        # `"" in t` is always true; keep that behaviour without putting "" in the regex.
+        self._always = tuple(by_string.pop("", ()))
+        self._by_string = by_string
+
+        root = _TrieNode()
+        for text in by_string:
+            node = root
+            for ch in text:
+                node = node.children.setdefault(ch, _TrieNode())
+            node.terminal = True
+
+        prefixes: dict[str, tuple[str, ...]] = {}
+        for text in by_string:
+            prefixes[text] = tuple(text[:i] for i in range(1, len(text) + 1) if text[:i] in by_string)
+        self._prefixes = prefixes
+        source = _trie_regex(root)
+        self._source = f"(?=({source}))" if source else ""
+        self._regex = re.compile(self._source) if source else None
+        self._compiled = True
+
+    def to_state(self) -> dict:
+        """Compiled tables as plain containers (marshal-safe), see ``from_state``."""
+        if not self._compiled:
+            self.compile()
+        return {
+            "patterns": [list(p) for p in self.patterns],
+            "source": self._source,
+            "by_string": self._by_string,
+            "prefixes": self._prefixes,
+            "always": self._always,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "KeywordMatcher":
+        """Rebuild a compiled matcher without walking the trie; the regex compiles on first use."""
+        m = cls()
+        m.patterns = [(text, bool(wb)) for text, wb in state["patterns"]]
+        m._ids = {p: i for i, p in enumerate(m.patterns)}
+        m._source = state["source"]
+        m._by_string = state["by_string"]
+        m._prefixes = state["prefixes"]
+        m._always = tuple(state["always"])
+        m._compiled = True
+        return m
+
+    def find(self, lowered: str) -> set[int]:
+        """Return ids of all patterns occurring in ``lowered``."""
+        if not self._compiled:
+            self.compile()
+        found: set[int] = set(self._always)
+        if self._regex is None:
+            if not self._source:
+                return found
+            self._regex = re.compile(self._source)
+        by_string = self._by_string
+        patterns = self.patterns
+        n = len(lowered)
+        for m in self._regex.finditer(lowered):
+            start = m.start()
+            for s in self._prefixes[m.group(1)]:
+                for pid in by_string[s]:
+                    if pid in found:
+                        continue
+                    if patterns[pid][1]:
+                        end = start + len(s)
+                        if (start > 0 and _is_word_char(s[0]) and _is_word_char(lowered[start - 1])) or (
+                            end < n and _is_word_char(s[-1]) and _is_word_char(lowered[end])
+                        ):
+                            continue
+                    found.add(pid)
+        return found
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+# Word tokens keep inner hyphens ("gpt-4o", "state-of-the-art") but drop stray ones.
+_WORD = re.compile(r"\w+(?:-\w+)*")
+# Hiragana/katakana, CJK ideographs (+ext A, compatibility) and Hangul syllables.
+_CJK_CHARS = "぀-ヿ㐀-䶿一-鿿豈-﫿가-힯"
+_CJK_RUN = re.compile(f"[{_CJK_CHARS}]+")
+_HAS_CJK = re.compile(f"[{_CJK_CHARS}]")
+# Longer "words" are hashes, base64 blobs and the like; not worth a vocabulary entry.
+MAX_TOKEN_CHARS = 64
+
+
+@dataclass
+class TokenizedText:
+    lowered: str
+    tokens: list[str]
+    tf: dict[str, int]
+
+
+def _cjk_bigrams(run: str) -> list[str]:
+    if len(run) == 1:
+        return [run]
+    return [run[i : i + 2] for i in range(len(run) - 1)]
+
+
+def tokenize(text: str) -> TokenizedText:
+    """Lowercase once and split into word tokens; CJK runs (no spaces) become overlapping bigrams."""
+    lowered = text.lower()
+    tokens: list[str] = []
+    for word in _WORD.findall(lowered):
+        if not _HAS_CJK.search(word):
+            tokens.append(word)
+            continue
+        pos = 0
+        for m in _CJK_RUN.finditer(word):
+            tokens.extend(_WORD.findall(word[pos : m.start()]))
+            tokens.extend(_cjk_bigrams(m.group()))
+            pos = m.end()
+        tokens.extend(_WORD.findall(word[pos:]))
+    tokens = [t for t in tokens if len(t) <= MAX_TOKEN_CHARS]
+    return TokenizedText(lowered=lowered, tokens=tokens, tf=dict(Counter(tokens)))
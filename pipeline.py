@@ -1,17 +1,32 @@
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from dataclasses import dataclass
-from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from itertools import count
 
 from crawler.fetcher import RawEntry, fetch_feed
 from crawler.fulltext import CrawlerConfig, fetch_fulltext
 from crawler.opml import parse_opml
-from db.store import PostRecord, Store
-from nlp.classifier import RuleClassifier
-from nlp.entity_extractor import EntityExtractor
+from db.mentions import load_burst_detector, mention_times, observe_bursts
+from db.store import FTS_MIN_TERM_CHARS, PostRecord, Store
+from db.views import TOPIC_SORTS, daily_body, daily_key, topics_body, topics_key
+from nlp.annotator import Annotator
+from nlp.dictionary import diff_term_maps
+from nlp.matcher import KeywordMatcher
 from processor.cleaner import canonicalize_url, normalize_text, stable_hash
+from ranking.burst import BurstDetector
 from ranking.hot_score import HotScorer
-from topic_engine.topic_builder import TopicBuilder
+from topic_engine.keyword_cluster import KeywordClusterer
+from topic_engine.maintenance import episode_id, is_episode, match_episode, plan_merges, split_episodes, topic_kind
+from topic_engine.related import entity_pairs, npmi, related_topics
+from topic_engine.semantic import _HAS_NUMPY as _HAS_SEMANTIC, SemanticClusterer
+from translate.service import RateBudget, TranslateConfig, build_translator
+from translate.text import extract_paragraphs, paragraph_segments, source_segment
 
 
 @dataclass
@@ -20,17 +35,77 @@ class PipelineConfig:
     opml_path: str
     config_dir: str = "config"
     crawler_config: str = "config/crawler.yaml"
+    translate_config: str = "config/translate.yaml"
+    slow_query_ms: float | None = 250.0
+    annotate_workers: int = 0  # 0 = one per CPU core
+    annotate_chunk_size: int = 500
+
+
+_worker_annotator: Annotator | None = None
+
+
+def _init_annotate_worker(config_dir: str) -> None:
+    global _worker_annotator
+    _worker_annotator = Annotator(config_dir)
+
+
+def _annotate_chunk(rows: list[tuple]) -> list[dict]:
+    assert _worker_annotator is not None
+    return _worker_annotator.annotate(rows)
+
+
+def _score_windows(scorer: HotScorer, rows: list, as_of: datetime) -> dict[str, list[tuple]]:
+    """Score ``topic_window_stats`` rows into per-window ranking rows for ``Store.stage_rankings``."""
+    rankings: dict[str, list[tuple]] = {}
+    for i, w in enumerate(scorer.windows()):
+        name = w["name"]
+        active = [r for r in rows if r[f"n_posts_{i}"]]
+        scored = scorer.score_batch(
+            name,
+            [int(r[f"n_posts_{i}"]) for r in active],
+            [int(r[f"n_blogs_{i}"]) for r in active],
+            [int(r[f"n_prev_{i}"]) for r in active],
+            [str(r[f"latest_post_at_{i}"]) for r in active],
+            [float(r[f"latest_jd_{i}"]) for r in active],
+            as_of,
+        )
+        rankings[name] = [
+            (str(r["topic_id"]), hot, breakdown, cross_hot, resonance, base, str(r[f"latest_post_at_{i}"]))
+            for r, (hot, breakdown, resonance, cross_hot, base) in zip(active, scored)
+        ]
+    return rankings
+
+
+_worker_backfill: tuple[Store, HotScorer] | None = None
+
+
+def _init_backfill_worker(snapshot_path: str, hot_config: dict) -> None:
+    global _worker_backfill
+    _worker_backfill = (Store(snapshot_path, slow_query_ms=None, read_only=True), HotScorer(cfg=hot_config))
+
+
+def _backfill_rankings_at(as_of: str) -> tuple[str, dict[str, list[tuple]]]:
+    assert _worker_backfill is not None
+    store, scorer = _worker_backfill
+    when = datetime.fromisoformat(as_of)
+    rows = store.topic_window_stats(when, [int(w["hours"]) for w in scorer.windows()], historical=True)
+    return as_of, _score_windows(scorer, rows, when)
 
 
 class DailyPipeline:
     def __init__(self, cfg: PipelineConfig):
         self.cfg = cfg
-        cdir = Path(cfg.config_dir)
-        self.store = Store(cfg.db_path)
-        self.classifier = RuleClassifier(str(cdir / "taxonomy.yaml"))
-        self.entity_extractor = EntityExtractor(str(cdir / "entities.yaml"))
-        self.topic_builder = TopicBuilder(str(cdir / "topic_builder.yaml"))
-        self.hot_scorer = HotScorer(str(cdir / "hot_config.yaml"))
+        self.store = Store(cfg.db_path, slow_query_ms=cfg.slow_query_ms)
+        self.annotator = Annotator(cfg.config_dir)
+        self.dictionaries = self.annotator.dictionaries
+        self.classifier = self.annotator.classifier
+        self.entity_extractor = self.annotator.entity_extractor
+        self.topic_builder = self.annotator.topic_builder
+        self.hot_scorer = HotScorer(cfg=self.annotator.bundle.hot_config)
+        self._semantic: SemanticClusterer | None = None
+        self._keyword: KeywordClusterer | None = None
+        self._bursts: BurstDetector | None = None
+        self._next_cluster_id: dict[str, count] = {}
 
     def init(self) -> None:
         self.store.init_db()
@@ -39,6 +114,7 @@ class DailyPipeline:
         feed_urls = parse_opml(self.cfg.opml_path)
         total_entries = 0
         total_inserted = 0
+        total_duplicates = 0
 
         for feed_url in feed_urls:
             feed_id = self.store.upsert_feed(feed_url)
@@ -50,6 +126,7 @@ class DailyPipeline:
                 posts = [self._to_post_record(feed_id, e) for e in entries]
                 inserted = self.store.insert_posts(posts)
                 total_inserted += len(inserted)
+                total_duplicates += self.store.count_duplicates(inserted)
             except Exception:
                 ok = False
             self.store.mark_feed_fetch(feed_id, ok)
@@ -58,41 +135,418 @@ class DailyPipeline:
             "feeds": len(feed_urls),
             "entries": total_entries,
             "inserted": total_inserted,
+            "near_duplicates": total_duplicates,
         }
 
     def run_annotate_and_topics(self) -> dict:
-        with self.store.connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT p.id, p.title, p.summary, p.content
-                FROM posts p
-                WHERE NOT EXISTS (SELECT 1 FROM post_labels pl WHERE pl.post_id = p.id)
-                """
-            ).fetchall()
+        """Annotate unlabeled posts chunk by chunk, fanning chunks out to a process pool.
+
+        At most two chunks per worker are in flight, so peak memory is bounded by
+        the chunk size rather than the backlog; results are written one
+        transaction per chunk as workers finish them.
+        """
+        chunk_size = max(1, self.cfg.annotate_chunk_size)
+        workers = self.cfg.annotate_workers or os.cpu_count() or 1
+        version = self.annotator.dict_version
+        self.store.record_dict_version(version, self.dictionaries.term_map())
+        chunks = self.store.iter_unlabeled_posts(chunk_size)
+        first = next(chunks, None)
+        if first is None:
+            return {"annotated": 0, "topic_bound": 0, "chunks": 0, "workers": 0}
 
+        annotated = 0
         bound = 0
-        for row in rows:
-            post_id = int(row["id"])
-            text = "\n".join([row["title"] or "", row["summary"] or "", row["content"] or ""])
-            labels = self.classifier.classify(text)
-            entities = self.entity_extractor.extract(text)
-            self.store.add_labels(post_id, labels)
-            self.store.add_entities(post_id, entities)
-
-            keywords = set(normalize_text(text).split())
-            topic_id, evidence = self.topic_builder.assign_topic(entities, labels, keywords)
-            if topic_id:
-                title = entities[0]["canonical"] if entities else row["title"]
-                primary_entity = entities[0]["id"] if entities else None
-                self.store.upsert_topic(topic_id, "ENTITY" if entities else "CLUSTER", title, primary_entity)
-                self.store.bind_post_topic(topic_id, post_id, 1.0, evidence)
-                bound += 1
+        n_chunks = 0
+        # Counters rebuilt from stored annotations must not include this run's, which are counted as saved.
+        self._burst_detector()
+        self._seed_cooccurrences()
+
+        def write(results: list[dict]) -> None:
+            nonlocal annotated, bound, n_chunks
+            bound += self.store.save_annotations(results, dict_version=version)
+            bound += self._bind_topic_clusters(results)
+            times = mention_times(self.store, results)
+            self._observe_bursts(results, times)
+            self._count_cooccurrences(results, times)
+            annotated += len(results)
+            n_chunks += 1
+
+        # Not worth spawning processes for a single partial chunk.
+        if workers <= 1 or len(first) < chunk_size:
+            write(self.annotator.annotate(first))
+            for rows in chunks:
+                write(self.annotator.annotate(rows))
+            return {"annotated": annotated, "topic_bound": bound, "chunks": n_chunks, "workers": 1}
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_annotate_worker,
+            initargs=(str(self.cfg.config_dir),),
+        ) as pool:
+            pending: set[Future] = {pool.submit(_annotate_chunk, first)}
+            exhausted = False
+            while pending:
+                while not exhausted and len(pending) < workers * 2:
+                    rows = next(chunks, None)
+                    if rows is None:
+                        exhausted = True
+                        break
+                    pending.add(pool.submit(_annotate_chunk, rows))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    write(fut.result())
+
+        return {"annotated": annotated, "topic_bound": bound, "chunks": n_chunks, "workers": workers}
+
+    def _cluster_cfg(self, kind: str) -> dict:
+        return self.topic_builder.cfg.get(f"{kind}_cluster") or {}
+
+    def _cluster_since(self, kind: str) -> str:
+        hours = float(self._cluster_cfg(kind).get("window_hours", 72))
+        return (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+
+    def _semantic_engine(self) -> SemanticClusterer | None:
+        """Clusterer loaded with clusters active within ``window_hours``; None when disabled."""
+        cfg = self._cluster_cfg("semantic")
+        if not cfg.get("enabled") or not _HAS_SEMANTIC:
+            return None
+        if self._semantic is None:
+            engine = SemanticClusterer.from_config(cfg)
+            for r in self.store.load_semantic_clusters(self._cluster_since("semantic")):
+                engine.load(int(r["cluster_id"]), r["centroid"], int(r["n_posts"]))
+            self._semantic = engine
+            self._next_cluster_id["semantic"] = count(self.store.max_cluster_id("semantic") + 1)
+        return self._semantic
+
+    def _keyword_engine(self) -> KeywordClusterer | None:
+        cfg = self._cluster_cfg("keyword")
+        if not cfg.get("enabled"):
+            return None
+        if self._keyword is None:
+            engine = KeywordClusterer.from_config(cfg)
+            clusters, terms = self.store.load_keyword_clusters(self._cluster_since("keyword"))
+            counts: dict[int, dict[str, int]] = {}
+            for r in terms:
+                counts.setdefault(int(r["cluster_id"]), {})[r["term"]] = int(r["count"])
+            for r in clusters:
+                engine.load(int(r["cluster_id"]), int(r["n_posts"]), counts.get(int(r["cluster_id"]), {}))
+            self._keyword = engine
+            self._next_cluster_id["keyword"] = count(self.store.max_cluster_id("keyword") + 1)
+        return self._keyword
+
+    def _burst_detector(self) -> BurstDetector | None:
+        if self._bursts is None:
+            self._bursts = load_burst_detector(self.store, self.hot_scorer.cfg.get("burst") or {})
+        return self._bursts
+
+    def _observe_bursts(self, annotations: list[dict], times: dict[int, float], weight: float = 1.0) -> None:
+        detector = self._burst_detector()
+        if detector is not None and annotations:
+            observe_bursts(self.store, detector, annotations, times, weight)
+
+    def _related_cfg(self) -> dict:
+        return self.topic_builder.cfg.get("related_topics") or {}
+
+    def _count_cooccurrences(self, annotations: list[dict], times: dict[int, float], weight: float = 1.0) -> None:
+        """Add annotated posts' entity pairs to the decayed co-occurrence counts (retract them with ``weight`` -1)."""
+        cfg = self._related_cfg()
+        if not cfg.get("enabled", True):
+            return
+        max_entities = int(cfg.get("max_entities_per_post", 12))
+        posts = [
+            (times[a["post_id"]], entity_pairs([e["id"] for e in a.get("entities", [])], max_entities))
+            for a in annotations
+            if a["post_id"] in times
+        ]
+        self.store.add_entity_cooccurrences(posts, float(cfg.get("half_life_days", 30)), weight)
+
+    def _seed_cooccurrences(self, rebuild: bool = False) -> int | None:
+        """Recount co-occurrences from the stored annotations; returns the posts counted.
+
+        Without ``rebuild`` this only happens when no counts are stored under the
+        configured half-life (first run, or the half-life changed); None when
+        nothing was recounted.
+        """
+        cfg = self._related_cfg()
+        half_life = float(cfg.get("half_life_days", 30))
+        if not cfg.get("enabled", True) or (not rebuild and self.store.entity_cooccurrences_current(half_life)):
+            return None
+        self.store.reset_entity_cooccurrences(half_life)
+        posts = 0
+        for chunk in self.store.iter_saved_annotations():
+            self._count_cooccurrences(chunk, mention_times(self.store, chunk))
+            posts += len(chunk)
+        return posts
+
+    def run_related_topics(self, rebuild: bool = False) -> dict:
+        """Precompute the related-topic lists served by ``/api/topics/{id}/related``.
+
+        Each topic active within ``active_days`` is described by its top
+        ``profile_entities`` entities; entities are associated by the NPMI of
+        their decayed co-occurrence counts (at least ``min_pair_posts`` shared
+        posts and ``min_npmi``), and topics are scored through those associations.
+        The counts are recounted from the stored annotations first with
+        ``rebuild``, or when there are none yet.
+        """
+        cfg = self._related_cfg()
+        if not cfg.get("enabled", True):
+            return {"topics": 0, "rows": 0}
+        recounted = self._seed_cooccurrences(rebuild)
+        since = (datetime.now(timezone.utc) - timedelta(days=float(cfg.get("active_days", 30)))).isoformat()
+        profiles = self.store.topic_entity_profiles(since, int(cfg.get("profile_entities", 5)))
+        entities = {e for profile in profiles.values() for e, _ in profile}
+        pairs, singles, total = self.store.entity_cooccurrence_counts(
+            entities, float(cfg.get("half_life_days", 30)), float(cfg.get("min_pair_posts", 2))
+        )
+        min_npmi = float(cfg.get("min_npmi", 0.1))
+        neighbors: dict[str, dict[str, float]] = {e: {e: 1.0} for e in entities}
+        for (a, b), c_ab in pairs.items():
+            assoc = npmi(c_ab, singles.get(a, 0.0), singles.get(b, 0.0), total)
+            if assoc >= min_npmi:
+                neighbors.setdefault(a, {a: 1.0})[b] = assoc
+                neighbors.setdefault(b, {b: 1.0})[a] = assoc
+        related = related_topics(profiles, neighbors, int(cfg.get("top_k", 10)))
+        rows = self.store.replace_topic_related(related)
+        return {
+            "topics": len(related),
+            "rows": rows,
+            "entity_pairs": sum(len(n) - 1 for n in neighbors.values()) // 2,
+            "recounted_posts": recounted,
+        }
+
+    def _bind_topic_clusters(self, annotations: list[dict]) -> int:
+        """Cluster posts that got no entity topic; returns the number of posts bound.
+
+        Follows ``priority_order``: semantic clusters first, then keyword clusters
+        for posts still without a topic. Runs in this process because cluster
+        state is shared across chunks; posts are assigned in published order.
+        """
+        semantic = self._semantic_engine()
+        keyword = self._keyword_engine()
+        if semantic is None and keyword is None:
+            return 0
+        pending = [a for a in annotations if a.get("topic") is None and a.get("terms")]
+        if not pending:
+            return 0
+        idf = self.store.term_idf(t for a in pending for t in a["terms"])
+        brief = self.store.get_posts_brief([a["post_id"] for a in pending])
+        pending.sort(key=lambda a: (brief[a["post_id"]]["published_at"], a["post_id"]))
+        bound: set[int] = set()
+        for kind, engine in (("semantic", semantic), ("keyword", keyword)):
+            if engine is None:
+                continue
+            # Posts already clustered (re-annotation) keep their cluster and only get rebound.
+            members, rebound = self.store.rebind_cluster_members(kind, [a["post_id"] for a in pending])
+            bound |= rebound
+            todo = [a for a in pending if a["post_id"] not in members and a["post_id"] not in bound]
+            if todo:
+                if kind == "semantic":
+                    bound |= self._assign_semantic(engine, todo, idf, brief)
+                else:
+                    bound |= self._assign_keyword(engine, todo, idf, brief)
+        return len(bound)
+
+    @staticmethod
+    def _track_span(spans: dict[int, tuple[str, str]], cluster_id: int, published: str) -> None:
+        first, last = spans.get(cluster_id, (published, published))
+        spans[cluster_id] = (min(first, published), max(last, published))
+
+    def _assign_semantic(self, engine: SemanticClusterer, posts: list[dict], idf: dict, brief: dict) -> set[int]:
+        post_ids: list[int] = []
+        vecs = []
+        for a in posts:
+            vec = engine.vectorize(a["terms"], idf)
+            if vec is not None:
+                post_ids.append(a["post_id"])
+                vecs.append(vec)
+        spans: dict[int, tuple[str, str]] = {}
+        rows: list[tuple[int, int, float]] = []
+        ids = self._next_cluster_id["semantic"]
+        for post_id, (cluster_id, sim) in zip(post_ids, engine.assign_batch(vecs, lambda: next(ids))):
+            self._track_span(spans, cluster_id, brief[post_id]["published_at"])
+            rows.append((cluster_id, post_id, sim))
+        clusters = [
+            (cid, engine.centroid_blob(cid), engine.cluster_size(cid), first, last) for cid, (first, last) in spans.items()
+        ]
+        min_size = int(self._cluster_cfg("semantic").get("min_cluster_size", 2))
+        return self.store.save_semantic_clusters(clusters, rows, min_size)
 
+    def _assign_keyword(self, engine: KeywordClusterer, posts: list[dict], idf: dict, brief: dict) -> set[int]:
+        spans: dict[int, tuple[str, str]] = {}
+        rows: list[tuple[int, int, float]] = []
+        ids = self._next_cluster_id["keyword"]
+        for a in posts:
+            keywords = engine.salient(a["terms"], idf)
+            if not keywords:
+                continue
+            cluster_id, share = engine.assign(keywords, lambda: next(ids))
+            self._track_span(spans, cluster_id, brief[a["post_id"]]["published_at"])
+            rows.append((cluster_id, a["post_id"], share))
+        clusters = [(cid, engine.n_posts[cid], first, last) for cid, (first, last) in spans.items()]
+        if self.topic_builder.cfg.get("fallback", {}).get("create_single_post_topic", False):
+            min_size = 1
+        else:
+            min_size = int(self._cluster_cfg("keyword").get("min_cluster_size", 2))
+        return self.store.save_keyword_clusters(clusters, engine.take_dirty_terms(), rows, min_size)
+
+    def run_topic_maintenance(self) -> dict:
+        """Merge and split topics that received posts since the previous pass.
+
+        Merges (``topic_merge_rules``) join topics sharing most of their posts,
+        entity topics naming the same canonical entity, and cluster topics whose
+        post vectors are at least ``merge_if_embedding_similarity`` similar; the
+        connected groups come from a union-find and merged ids redirect to the
+        survivor. Splits (``topic_split_rules``) cut entity topics into episodes
+        at gaps longer than ``max_time_gap_days``: the latest episode keeps the
+        topic id, earlier ones move to ``<topic_id>@<first date>``.
+        """
+        dirty, checkpoint = self.store.topics_changed_since_maintenance()
+        merge_cfg = self.topic_builder.cfg.get("topic_merge_rules") or {}
+        split_cfg = self.topic_builder.cfg.get("topic_split_rules") or {}
+
+        edges = self.store.topic_overlap_pairs(dirty, min_share=0.5) if dirty else []
+        if dirty and merge_cfg.get("merge_if_same_entity"):
+            edges += self.store.same_entity_topic_pairs(dirty)
+        min_sim = merge_cfg.get("merge_if_embedding_similarity")
+        if dirty and min_sim is not None and _HAS_SEMANTIC:
+            edges += self._similar_cluster_topics(dirty, float(min_sim))
+        topics = self.store.get_topic_rows(t for edge in edges for t in edge)
+        merged = moved = 0
+        gone: set[str] = set()
+        for keep, others in plan_merges(edges, topics):
+            moved += self.store.merge_topics(keep, others, reason="merge")
+            merged += len(others)
+            gone.update(others)
+
+        gap = split_cfg.get("max_time_gap_days")
+        split_topics = episodes_created = 0
+        if gap is not None:
+            for topic_id in dirty:
+                if topic_id in gone or topic_kind(topic_id) != "entity" or is_episode(topic_id):
+                    continue
+                posts = self.store.topic_posts_with_times([topic_id])[topic_id]
+                episodes = split_episodes(posts, float(gap))
+                if len(episodes) < 2:
+                    continue
+                split_topics += 1
+                for episode in episodes[:-1]:
+                    existing = self.store.topic_episodes(topic_id)
+                    target = match_episode(episode, existing, float(gap))
+                    if target is None:
+                        target = episode_id(topic_id, episode[0][1])
+                        episodes_created += 1
+                    self.store.move_posts_to_episode(topic_id, target, [pid for pid, _ in episode])
+
+        self.store.set_topic_maintenance_checkpoint(checkpoint)
         return {
-            "annotated": len(rows),
-            "topic_bound": bound,
+            "dirty_topics": len(dirty),
+            "merged_topics": merged,
+            "posts_moved": moved,
+            "split_topics": split_topics,
+            "episodes_created": episodes_created,
         }
 
+    def _similar_cluster_topics(self, dirty: list[str], min_sim: float) -> list[tuple[str, str]]:
+        """Pairs (dirty cluster topic, active cluster topic) whose mean post vectors are similar."""
+        mine = [t for t in dirty if topic_kind(t) in ("semantic", "keyword")]
+        if not mine:
+            return []
+        engine = self._semantic_engine() or SemanticClusterer.from_config(self._cluster_cfg("semantic"))
+        window = max(float(self._cluster_cfg(k).get("window_hours", 72)) for k in ("semantic", "keyword"))
+        since = (datetime.now(timezone.utc) - timedelta(hours=window)).isoformat()
+        candidates = sorted(set(self.store.active_cluster_topics(since)) | set(mine))
+        members = self.store.topic_posts_with_times(candidates, limit_per_topic=50)
+        terms = self.store.get_post_terms(sorted({pid for posts in members.values() for pid, _ in posts}))
+        idf = self.store.term_idf(t for tf in terms.values() for t in tf)
+        vectors = {pid: engine.vectorize(tf, idf) for pid, tf in terms.items()}
+        topic_vecs = engine.mean_vectors(
+            {t: [vectors[pid] for pid, _ in posts if vectors.get(pid) is not None] for t, posts in members.items()}
+        )
+        return engine.similar_pairs(topic_vecs, [t for t in mine if t in topic_vecs], min_sim)
+
+    def run_reannotate(self) -> dict:
+        """Re-annotate only posts a dictionary edit can affect; safe to interrupt and re-run.
+
+        For every dictionary version still stamped on some posts, the stored term
+        snapshot is diffed against the current one. Posts containing an added,
+        removed or re-mapped term (found through the trigram FTS index, or a scan
+        for very short terms) are re-annotated in ID order with the job's
+        checkpoint advanced after each chunk; the rest are simply re-stamped.
+        """
+        version = self.annotator.dict_version
+        term_map = self.dictionaries.term_map()
+        self.store.record_dict_version(version, term_map)
+        chunk_size = max(1, self.cfg.annotate_chunk_size)
+
+        jobs = []
+        for old in self.store.stale_dict_versions(version):
+            old_map = self.store.get_dict_term_map(old)
+            full, terms = diff_term_maps(old_map, term_map) if old_map is not None else (True, set())
+            job = self.store.start_reannotate_job(old, version, full, len(terms))
+            stamped = self.store.post_ids_with_dict_version(old)
+            candidates = stamped if full else self._posts_containing(terms, stamped, chunk_size)
+            self.store.update_reannotate_job(int(job["id"]), candidates=len(candidates))
+
+            last_id = int(job["last_post_id"])
+            done = int(job["reannotated"])
+            todo = [pid for pid in candidates if pid > last_id]
+            if todo:
+                # Counters rebuilt from stored annotations must not include the re-annotations.
+                self._burst_detector()
+                self._seed_cooccurrences()
+            for i in range(0, len(todo), chunk_size):
+                ids = todo[i : i + chunk_size]
+                rows = self.store.get_posts_for_annotation(ids)
+                results = self.annotator.annotate(rows)
+                previous = self.store.saved_annotations(ids)
+                self.store.save_annotations(results, dict_version=version, replace=True)
+                self._bind_topic_clusters(results)
+                self._recount(previous, results)
+                done += len(rows)
+                self.store.update_reannotate_job(int(job["id"]), last_post_id=ids[-1], reannotated=done)
+
+            restamped = self.store.restamp_dict_version(old, version)
+            self.store.update_reannotate_job(int(job["id"]), status="done")
+            jobs.append(
+                {
+                    "from_version": old,
+                    "full_rescan": full,
+                    "changed_terms": len(terms),
+                    "stale_posts": len(stamped),
+                    "reannotated": done,
+                    "restamped": restamped,
+                }
+            )
+        return {"version": version, "jobs": jobs}
+
+    def _recount(self, previous: list[dict], results: list[dict]) -> None:
+        """Swap re-annotated posts' old mentions and entity pairs for their new ones in the burst and co-occurrence counters."""
+        counted = {a["post_id"] for a in previous}
+        current = [a for a in results if a["post_id"] in counted]
+        times = mention_times(self.store, previous)
+        self._observe_bursts(previous, times, weight=-1.0)
+        self._observe_bursts(current, times)
+        self._count_cooccurrences(previous, times, weight=-1.0)
+        self._count_cooccurrences(current, times)
+
+    def _posts_containing(self, terms: set[str], post_ids: list[int], chunk_size: int) -> list[int]:
+        """Subset of ``post_ids`` whose text contains any of ``terms`` (case-insensitive)."""
+        if not terms or not post_ids:
+            return []
+        fts = self.store.fts_available()
+        indexed = {t for t in terms if len(t) >= FTS_MIN_TERM_CHARS} if fts else set()
+        found: set[int] = self.store.fts_post_ids(indexed) if indexed else set()
+
+        rest = terms - indexed
+        if rest:
+            matcher = KeywordMatcher((t, False) for t in rest)
+            for i in range(0, len(post_ids), chunk_size):
+                for pid, title, summary, content in self.store.get_posts_for_annotation(post_ids[i : i + chunk_size]):
+                    if matcher.find("\n".join([title, summary, content]).lower()):
+                        found.add(pid)
+        wanted = set(post_ids)
+        return sorted(pid for pid in found if pid in wanted)
+
     def run_fulltext_enrich(self, batch_size: int = 100) -> dict:
         """Batch-enrich posts that have short content by fetching their full text."""
         crawler_cfg = CrawlerConfig.from_yaml(self.cfg.crawler_config)
@@ -125,26 +579,197 @@ class DailyPipeline:
             "failed": failed,
         }
 
-    def run_rankings(self) -> dict:
-        out = {}
+    def run_translate(self) -> dict:
+        """Pre-translate recent posts so API handlers only read stored translations.
+
+        Titles and summaries of posts published within ``lookback_days`` go to
+        ``post_translations``; optionally, paragraphs of the latest posts of hot
+        topics are translated into the translation cache, cut exactly as the
+        post page cuts them. Provider requests stop when the per-run budget is
+        spent; untranslated posts are picked up by the next run.
+        """
+        cfg = TranslateConfig.from_yaml(self.cfg.translate_config)
+        if not cfg.pretranslate_enabled:
+            return {"skipped": True, "reason": "pretranslate disabled in config"}
+        budget = RateBudget(cfg.max_requests, cfg.max_chars, cfg.min_request_interval)
+        translator = build_translator(self.store, cfg, budget=budget)
+        if not translator.provider.persistent:
+            return {"skipped": True, "reason": f"provider {translator.provider.name} output is not stored"}
+
+        since = (datetime.now(timezone.utc) - timedelta(days=cfg.lookback_days)).isoformat()
+        posts = self.store.posts_needing_translation(since, cfg.target, cfg.max_posts_per_run)
+        # Titles first: when the budget runs out, summaries are what waits.
+        fields = [(int(r["id"]), "title", r["title"]) for r in posts] + [(int(r["id"]), "summary", r["summary"]) for r in posts]
+        translated = translator.translate_many(source_segment(text) for _, _, text in fields)
+        rows = [(pid, field, cfg.target, zh) for (pid, field, _), zh in zip(fields, translated) if zh is not None]
+        self.store.put_post_translations(rows)
+
+        paragraph_posts = paragraphs = 0
+        if cfg.paragraphs_enabled and not budget.exhausted:
+            for post in self.store.hot_topic_posts(
+                cfg.paragraphs_window, cfg.paragraphs_top_topics, cfg.paragraphs_posts_per_topic
+            ):
+                content = post["content"] or ""
+                # Shorter content makes the post page fetch the full text, which is not stored here.
+                if len(content.strip()) < 500:
+                    continue
+                segments = paragraph_segments(extract_paragraphs(content, max_paragraphs=220))
+                done = translator.translate_many(source_segment(seg) for seg in segments)
+                paragraph_posts += 1
+                paragraphs += sum(1 for zh in done if zh)
+                if budget.exhausted:
+                    break
+
+        return {
+            "posts": len(posts),
+            "fields_stored": len(rows),
+            "paragraph_posts": paragraph_posts,
+            "paragraphs": paragraphs,
+            "provider_requests": translator.stats["provider_calls"],
+            "cache_hits": translator.stats["cache_hits"],
+            "budget_exhausted": budget.exhausted,
+        }
+
+    def run_response_blobs(self) -> dict:
+        """Precompute the JSON bodies of ``/api/daily`` (recent days) and ``/api/topics`` (every window and sort).
+
+        Bodies come from the same code as the API handlers and carry the store's
+        cache version, taken before building: any later write makes them stale and
+        the API builds responses itself again. A digest with a post lacking a
+        stored translation is skipped, since the API would translate it on demand.
+        Ranking bodies expire after ``topics_max_age_seconds`` as hot scores decay.
+        """
+        cfg = self.hot_scorer.cfg.get("response_blobs") or {}
+        if not cfg.get("enabled", True):
+            return {"skipped": True, "reason": "response_blobs disabled in config"}
+        target = TranslateConfig.from_yaml(self.cfg.translate_config).target
+        version = self.store.cache_version()
+
+        rows: list[tuple[str, bytes, float | None]] = []
+        skipped_days = 0
+        for r in self.store.api_available_dates(limit=int(cfg.get("daily_days", 14))):
+            body = daily_body(self.store, r["day"], target)
+            if body is None:
+                skipped_days += 1
+            else:
+                rows.append((daily_key(r["day"]), body, None))
+        n_daily = len(rows)
+        expires_at = time.time() + float(cfg.get("topics_max_age_seconds", 300))
         for w in self.hot_scorer.windows():
-            name = w["name"]
-            hours = int(w["hours"])
-            self.store.clear_window_rankings(name)
-            rows = self.store.list_topics_with_stats(hours)
-
-            n = 0
-            for r in rows:
-                n_posts = int(r["n_posts"])
-                n_blogs = int(r["n_blogs"])
-                n_prev = int(r["n_prev"])
-                latest_post = str(r["latest_post_at"])
-                hot, breakdown, resonance = self.hot_scorer.score_topic(n_posts, n_blogs, n_prev, latest_post)
-                cross_hot = self.hot_scorer.is_cross_blogger_hot(name, n_posts, n_blogs)
-                self.store.insert_ranking(name, str(r["topic_id"]), hot, breakdown, cross_hot, resonance)
-                n += 1
-            out[name] = n
-        return out
+            for sort in TOPIC_SORTS:
+                rows.append((topics_key(w["name"], sort), topics_body(self.store, w["name"], sort), expires_at))
+        self.store.put_response_blobs(rows, version)
+        return {
+            "daily": n_daily,
+            "daily_skipped": skipped_days,
+            "topics": len(rows) - n_daily,
+            "bytes": sum(len(body) for _, body, _ in rows),
+        }
+
+    def run_rankings(self, as_of: datetime | None = None, full: bool = False) -> dict:
+        """Rank topics for every window, scored as of a single timestamp.
+
+        Incremental by default: only topics in ranking_dirty_topics (bindings
+        added, removed or marked duplicate) and topics with a post that crossed
+        a window boundary since the published run are re-scored; every other row
+        is carried over, as its score only changes through the recency decay the
+        API applies at read time. A full run happens with ``full``, on the first
+        run, after a rollback or when the scoring config changed.
+
+        The run is staged in full and then published by swapping a single
+        pointer, so readers never see a partial ranking; older runs are kept
+        for ``rollback-rankings`` up to ``publication.keep_runs``.
+        """
+        as_of = (as_of or datetime.now(timezone.utc)).astimezone(timezone.utc).replace(microsecond=0)
+        windows = self.hot_scorer.windows()
+        hours = [int(w["hours"]) for w in windows]
+        weight, tau = self.hot_scorer.recency_params()
+        params = {"recency_weight": weight, "recency_tau_hours": tau, "config_hash": self.hot_scorer.config_hash()}
+
+        dirty = self.store.ranking_dirty_topics()
+        base_run = None if full else self._incremental_base_run(params["config_hash"], as_of)
+        if base_run is None:
+            rows = self.store.topic_window_stats(as_of, hours)
+            rescored: set[str] = set()
+        else:
+            prev_as_of = datetime.fromisoformat(base_run["as_of"])
+            rescored = set(dirty) | self.store.topics_crossing_windows(prev_as_of, as_of, hours)
+            rows = self.store.topic_window_stats(as_of, hours, topic_ids=rescored) if rescored else []
+
+        rankings = _score_windows(self.hot_scorer, rows, as_of)
+        run_id = self.store.stage_rankings(
+            as_of.isoformat(),
+            rankings,
+            params,
+            carry_from=None if base_run is None else int(base_run["run_id"]),
+            rescored=rescored,
+        )
+        self.store.publish_ranking_run(
+            run_id, clear_dirty=dirty, rankings=rankings, rescored=None if base_run is None else rescored
+        )
+        publication = self.hot_scorer.cfg.get("publication") or {}
+        pruned = self.store.prune_ranking_runs(int(publication.get("keep_runs", 5)))
+        self.store.prune_ranking_history(float(publication.get("history_days", 90)))
+        return {
+            "run_id": run_id,
+            "mode": "full" if base_run is None else "incremental",
+            "rescored_topics": len(rows),
+            "windows": {name: len(ranked) for name, ranked in rankings.items()},
+            "pruned_runs": pruned,
+        }
+
+    def run_backfill_rankings(
+        self, start: datetime, end: datetime, step_hours: float = 24.0, workers: int = 0
+    ) -> dict:
+        """Recompute rankings as of every ``step_hours`` from ``start`` to ``end`` into ranking history.
+
+        Workers read a ``VACUUM INTO`` snapshot opened read-only, so the live
+        database is neither locked nor read mid-change; only posts published by
+        each as-of time count. Topic membership is today's, since bindings are
+        not versioned. Published rankings are not touched.
+        """
+        start = start.astimezone(timezone.utc).replace(microsecond=0)
+        end = min(end, datetime.now(timezone.utc)).astimezone(timezone.utc).replace(microsecond=0)
+        step = timedelta(hours=step_hours)
+        times = []
+        t = start
+        while t <= end:
+            times.append(t.isoformat())
+            t += step
+        if not times:
+            return {"snapshots": 0, "history_points": 0, "workers": 0}
+
+        workers = min(workers or os.cpu_count() or 1, len(times))
+        tmp_dir = tempfile.mkdtemp(prefix="backfill-", dir=self.store.db_path.parent)
+        try:
+            snapshot = os.path.join(tmp_dir, "snapshot.db")
+            self.store.snapshot(snapshot)
+            if workers <= 1:
+                _init_backfill_worker(snapshot, self.hot_scorer.cfg)
+                points = self.store.write_backfilled_history(map(_backfill_rankings_at, times), times[0], times[-1])
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_backfill_worker,
+                    initargs=(snapshot, self.hot_scorer.cfg),
+                ) as pool:
+                    # map() yields in as-of order while workers run ahead, which the history diff needs.
+                    points = self.store.write_backfilled_history(
+                        pool.map(_backfill_rankings_at, times), times[0], times[-1]
+                    )
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return {"snapshots": len(times), "from": times[0], "to": times[-1], "history_points": points, "workers": workers}
+
+    def _incremental_base_run(self, config_hash: str, as_of: datetime):
+        """The published run to carry rows from, or None if the next run must be full."""
+        run_id = self.store.published_ranking_run()
+        if run_id is None or run_id != self.store.latest_ranking_run():
+            return None
+        run = self.store.get_ranking_run(run_id)
+        if run["config_hash"] != config_hash or datetime.fromisoformat(run["as_of"]) > as_of:
+            return None
+        return run
 
     @staticmethod
     def _to_post_record(feed_id: int, e: RawEntry) -> PostRecord:
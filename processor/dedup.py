@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import struct
+import zlib
+
+from nlp.tokenizer import tokenize
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    _HAS_NUMPY = False
+
+_MASK64 = (1 << 64) - 1
+
+
+class MinHashDeduper:
+    """MinHash signatures over token shingles, banded for LSH lookups.
+
+    Each post's title + body is tokenized, cut into ``shingle_size``-token
+    shingles and hashed with ``num_perm`` multiply-shift hash functions; the
+    per-function minimum forms the signature. Splitting the signature into
+    ``bands`` bands of ``num_perm / bands`` rows gives bucket keys: two posts
+    sharing any bucket are candidates, and candidates whose estimated Jaccard
+    similarity is at least ``threshold`` are near-duplicates. With the
+    defaults (16 bands × 8 rows) a pair at similarity 0.8 shares a bucket with
+    probability ~0.9, while pairs below 0.5 rarely do.
+
+    Hash parameters come from a fixed seed, so signatures stored in the
+    database stay comparable across processes and releases.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.8,
+        shingle_size: int = 3,
+        min_tokens: int = 30,
+        seed: int = 20240601,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_tokens = min_tokens
+        rnd = random.Random(seed)
+        self._a = [rnd.getrandbits(64) | 1 for _ in range(num_perm)]
+        self._b = [rnd.getrandbits(64) for _ in range(num_perm)]
+        if _HAS_NUMPY:
+            self._np_a = np.array(self._a, dtype=np.uint64)[:, None]
+            self._np_b = np.array(self._b, dtype=np.uint64)[:, None]
+
+    def shingles(self, text: str) -> list[int]:
+        tokens = tokenize(text).tokens
+        if len(tokens) < self.min_tokens:
+            return []
+        k = self.shingle_size
+        return sorted({zlib.crc32(" ".join(tokens[i : i + k]).encode("utf-8")) for i in range(len(tokens) - k + 1)})
+
+    def signature(self, text: str) -> list[int] | None:
+        """MinHash signature (num_perm uint32 values), or None for texts too short to compare."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        if _HAS_NUMPY:
+            x = np.array(shingles, dtype=np.uint64)[None, :]
+            with np.errstate(over="ignore"):
+                hashed = (self._np_a * x + self._np_b) >> np.uint64(32)
+            return hashed.min(axis=1).astype(np.uint32).tolist()
+        return [min(((a * x + b) & _MASK64) >> 32 for x in shingles) for a, b in zip(self._a, self._b)]
+
+    def band_keys(self, signature: list[int]) -> list[int]:
+        """One signed 64-bit bucket key per band (fits an SQLite INTEGER)."""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows : (band + 1) * self.rows]
+            digest = hashlib.blake2b(struct.pack(f"<{self.rows}I", *chunk), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def pack(self, signature: list[int]) -> bytes:
+        return struct.pack(f"<{self.num_perm}I", *signature)
+
+    def unpack(self, blob: bytes) -> list[int]:
+        return list(struct.unpack(f"<{self.num_perm}I", blob))
+
+    @staticmethod
+    def similarity(a: list[int], b: list[int]) -> float:
+        """Estimated Jaccard similarity: the fraction of equal signature positions."""
+        return sum(1 for x, y in zip(a, b) if x == y) / max(1, len(a))
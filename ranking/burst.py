@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    _HAS_NUMPY = False
+
+
+class BurstDetector:
+    """Online burst detection on exponentially decayed mention counters.
+
+    Every entity and label (keys like ``entity:<id>`` / ``label:<id>``) has one
+    counter per half-life, ``c_k(t) = sum(exp(-l_k * (t - t_i)))`` over its
+    mentions, stored as a row of a dense float64 array together with the time
+    the row was last brought up to date. A mention costs O(len(half_lives))
+    however long the history; mentions older than the row's time are added
+    pre-decayed, so arrival order does not matter.
+
+    ``c_k * l_k`` estimates the mention rate over roughly the last half-life.
+    The longest half-life is the baseline: a key bursts when a shorter-term
+    counter exceeds the count the baseline rate predicts for that horizon,
+    scored as a Poisson z-value ``(observed - expected) / sqrt(expected + 1)``.
+    """
+
+    def __init__(
+        self, half_lives_hours: tuple[float, ...] = (1.0, 6.0, 168.0), min_mentions: float = 3.0, min_z: float = 3.0
+    ) -> None:
+        if not _HAS_NUMPY:
+            raise RuntimeError("burst detection requires numpy")
+        if len(half_lives_hours) < 2:
+            raise ValueError("need at least one short half-life and a baseline")
+        self.half_lives_hours = tuple(float(h) for h in sorted(half_lives_hours))
+        # Decay rates per second.
+        self.rates = np.array([math.log(2) / (h * 3600) for h in self.half_lives_hours])
+        self.min_mentions = float(min_mentions)
+        self.min_z = float(min_z)
+        self.keys: list[str] = []
+        self.names: list[str] = []
+        self._row: dict[str, int] = {}
+        self.counts = np.zeros((64, len(self.rates)))
+        self.updated = np.zeros(64)
+        self._dirty: set[int] = set()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "BurstDetector":
+        return cls(
+            half_lives_hours=tuple(cfg.get("half_lives_hours", (1.0, 6.0, 168.0))),
+            min_mentions=float(cfg.get("min_mentions", 3.0)),
+            min_z=float(cfg.get("min_z", 3.0)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _add_row(self, key: str, name: str) -> int:
+        row = len(self.keys)
+        if row == len(self.updated):
+            self.counts = np.vstack([self.counts, np.zeros_like(self.counts)])
+            self.updated = np.concatenate([self.updated, np.zeros_like(self.updated)])
+        self.keys.append(key)
+        self.names.append(name)
+        self._row[key] = row
+        return row
+
+    def load(self, key: str, name: str, updated: float, counts: bytes) -> None:
+        """Restore a persisted counter row; rows written with other half-lives are ignored."""
+        values = np.frombuffer(counts, dtype="<f8")
+        if len(values) != len(self.rates):
+            return
+        row = self._row.get(key)
+        if row is None:
+            row = self._add_row(key, name)
+        self.counts[row] = values
+        self.updated[row] = updated
+
+    def observe(self, key: str, ts: float, name: str = "", weight: float = 1.0) -> None:
+        """Count one mention of ``key`` at Unix time ``ts``; a ``weight`` of -1 retracts one."""
+        row = self._row.get(key)
+        if row is None:
+            row = self._add_row(key, name or key)
+            self.updated[row] = ts
+        elif name:
+            self.names[row] = name
+        last = self.updated[row]
+        if ts >= last:
+            self.counts[row] = self.counts[row] * np.exp(-self.rates * (ts - last)) + weight
+            self.updated[row] = ts
+        else:
+            self.counts[row] += weight * np.exp(-self.rates * (last - ts))
+        self._dirty.add(row)
+
+    def take_dirty(self) -> list[tuple[str, str, float, bytes]]:
+        """(key, name, updated, counts blob) rows changed since the last call, for persistence."""
+        rows = [
+            (self.keys[i], self.names[i], float(self.updated[i]), self.counts[i].astype("<f8").tobytes())
+            for i in sorted(self._dirty)
+        ]
+        self._dirty.clear()
+        return rows
+
+    def scan(self, rows: list[tuple[str, str, float, bytes]], now: float) -> list[dict]:
+        """Bursting keys among persisted (key, name, updated, counts) rows as of ``now``, strongest first."""
+        width = len(self.rates)
+        rows = [r for r in rows if len(r[3]) == width * 8]
+        if not rows:
+            return []
+        counts = np.frombuffer(b"".join(r[3] for r in rows), dtype="<f8").reshape(len(rows), width)
+        updated = np.array([r[2] for r in rows])
+        age = np.maximum(0.0, now - updated)[:, None]
+        counts = counts * np.exp(-self.rates[None, :] * age)
+
+        # Baseline rate (per second) predicts each shorter counter's steady-state value.
+        base_rate = counts[:, -1] * self.rates[-1]
+        expected = base_rate[:, None] / self.rates[None, :-1]
+        observed = counts[:, :-1]
+        z = (observed - expected) / np.sqrt(expected + 1.0)
+        z = np.where(observed >= self.min_mentions, z, -np.inf)
+        best = z.argmax(axis=1)
+        best_z = z[np.arange(len(rows)), best]
+
+        out = []
+        for i in np.nonzero(best_z >= self.min_z)[0].tolist():
+            key, name = rows[i][0], rows[i][1]
+            kind, _, ident = key.partition(":")
+            out.append(
+                {
+                    "key": key,
+                    "kind": kind,
+                    "id": ident,
+                    "name": name,
+                    "z": round(float(best_z[i]), 3),
+                    "horizon_hours": self.half_lives_hours[int(best[i])],
+                    "mentions": {
+                        f"{h:g}h": round(float(c), 3) for h, c in zip(self.half_lives_hours, counts[i].tolist())
+                    },
+                    "rate_per_hour": {
+                        f"{h:g}h": round(float(c * r * 3600), 4)
+                        for h, c, r in zip(self.half_lives_hours, counts[i].tolist(), self.rates.tolist())
+                    },
+                    "last_seen_at": float(updated[i]),
+                }
+            )
+        out.sort(key=lambda x: (-x["z"], x["key"]))
+        return out
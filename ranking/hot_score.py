@@ -1,24 +1,38 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import math
 from datetime import datetime, timezone
 
 import yaml
 
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    _HAS_NUMPY = False
+
+_UNIX_EPOCH_JD = 2440587.5
+
 
 def _parse_iso(ts: str) -> datetime:
     return datetime.fromisoformat(ts.replace("Z", "+00:00")).astimezone(timezone.utc)
 
 
 class HotScorer:
-    def __init__(self, cfg_path: str):
-        with open(cfg_path, "r", encoding="utf-8") as f:
-            self.cfg = yaml.safe_load(f)
+    def __init__(self, cfg_path: str | None = None, cfg: dict | None = None):
+        if cfg is None:
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                cfg = yaml.safe_load(f)
+        self.cfg = cfg
 
     def windows(self) -> list[dict]:
         return self.cfg["windows"]
 
-    def score_topic(self, n_posts: int, n_blogs: int, n_prev: int, latest_post_at: str) -> tuple[float, dict, float]:
+    def score_topic(
+        self, n_posts: int, n_blogs: int, n_prev: int, latest_post_at: str, as_of: datetime | None = None
+    ) -> tuple[float, dict, float]:
         w = self.cfg["hot_score"]["weights"]
         caps = self.cfg["hot_score"]["caps"]
         vel_cfg = self.cfg["hot_score"]["velocity"]
@@ -30,7 +44,7 @@ class HotScorer:
         growth_ratio = (n_posts - n_prev) / max(vel_cfg["epsilon"], n_prev)
         v = max(0.0, min(growth_ratio, vel_cfg["max_ratio"])) / vel_cfg["max_ratio"]
 
-        delta_hours = (datetime.now(timezone.utc) - _parse_iso(latest_post_at)).total_seconds() / 3600
+        delta_hours = ((as_of or datetime.now(timezone.utc)) - _parse_iso(latest_post_at)).total_seconds() / 3600
         r = math.exp(-delta_hours / rec["tau_hours"])
 
         hot = w["D_diversity"] * d + w["Q_volume"] * q + w["V_velocity"] * v + w["R_recency"] * r
@@ -48,6 +62,91 @@ class HotScorer:
         }
         return round(hot, 6), breakdown, round(resonance, 6)
 
+    def score_batch(
+        self,
+        window: str,
+        n_posts: list[int],
+        n_blogs: list[int],
+        n_prev: list[int],
+        latest_post_at: list[str],
+        latest_jd: list[float],
+        as_of: datetime,
+    ) -> list[tuple[float, dict, float, bool, float]]:
+        """Score all topics of one window at ``as_of``.
+
+        Returns (hot, breakdown, resonance, cross_hot, base) per topic, where
+        base is the score without its recency term. Same formula as
+        ``score_topic``, computed column-wise; recency uses the julian day of
+        the latest post so no timestamps are parsed per topic.
+        """
+        if not _HAS_NUMPY:
+            out = []
+            weight, tau = self.recency_params()
+            as_of_jd = as_of.timestamp() / 86400 + _UNIX_EPOCH_JD
+            for n, b, p, latest, jd in zip(n_posts, n_blogs, n_prev, latest_post_at, latest_jd):
+                hot, breakdown, resonance = self.score_topic(n, b, p, latest, as_of)
+                base = hot - weight * math.exp(-(as_of_jd - jd) * 24 / tau)
+                out.append((hot, breakdown, resonance, self.is_cross_blogger_hot(window, n, b), round(base, 6)))
+            return out
+        w = self.cfg["hot_score"]["weights"]
+        caps = self.cfg["hot_score"]["caps"]
+        vel_cfg = self.cfg["hot_score"]["velocity"]
+        rec = self.cfg["hot_score"]["recency"]
+
+        posts = np.asarray(n_posts, dtype=np.float64)
+        blogs = np.asarray(n_blogs, dtype=np.float64)
+        prev = np.asarray(n_prev, dtype=np.float64)
+
+        d = np.minimum(1.0, np.log1p(blogs) / math.log(1 + caps["M_blogs"]))
+        q = np.minimum(1.0, np.log1p(posts) / math.log(1 + caps["M_posts"]))
+        growth_ratio = (posts - prev) / np.maximum(vel_cfg["epsilon"], prev)
+        v = np.clip(growth_ratio, 0.0, vel_cfg["max_ratio"]) / vel_cfg["max_ratio"]
+        as_of_jd = as_of.timestamp() / 86400 + _UNIX_EPOCH_JD
+        delta_hours = (as_of_jd - np.asarray(latest_jd, dtype=np.float64)) * 24
+        r = np.exp(-delta_hours / rec["tau_hours"])
+
+        base = w["D_diversity"] * d + w["Q_volume"] * q + w["V_velocity"] * v
+        hot = base + w["R_recency"] * r
+        resonance = blogs / np.sqrt(np.maximum(1.0, posts))
+
+        rule = next((x for x in self.cfg["cross_blogger_hot"]["rules"] if x["window"] == window), None)
+        if rule is None:
+            cross = np.zeros(len(posts), dtype=bool)
+        else:
+            cross = (blogs >= rule["min_blogs"]) & (posts >= rule["min_posts"])
+
+        return [
+            (
+                round(h, 6),
+                {
+                    "D_diversity": round(dd, 4),
+                    "Q_volume": round(qq, 4),
+                    "V_velocity": round(vv, 4),
+                    "R_recency": round(rr, 4),
+                    "n_posts": n,
+                    "n_blogs": b,
+                    "n_prev": p,
+                    "latest_post_at": latest,
+                },
+                round(res, 6),
+                c,
+                round(bs, 6),
+            )
+            for h, dd, qq, vv, rr, res, c, bs, n, b, p, latest in zip(
+                hot.tolist(), d.tolist(), q.tolist(), v.tolist(), r.tolist(), resonance.tolist(), cross.tolist(),
+                base.tolist(), n_posts, n_blogs, n_prev, latest_post_at,
+            )
+        ]
+
+    def recency_params(self) -> tuple[float, float]:
+        """(weight, tau_hours) of the recency term, which decays as exp(-age_hours / tau)."""
+        return float(self.cfg["hot_score"]["weights"]["R_recency"]), float(self.cfg["hot_score"]["recency"]["tau_hours"])
+
+    def config_hash(self) -> str:
+        """Fingerprint of everything that affects scores; runs with a different one are not reused."""
+        scoring = {k: self.cfg.get(k) for k in ("windows", "hot_score", "cross_blogger_hot")}
+        return hashlib.sha256(json.dumps(scoring, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
     def is_cross_blogger_hot(self, window: str, n_posts: int, n_blogs: int) -> bool:
         for r in self.cfg["cross_blogger_hot"]["rules"]:
             if r["window"] == window:
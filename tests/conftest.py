@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# api.app builds its store at import time; point it at a scratch database and the offline provider.
+os.environ.setdefault("AINEWS_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="ainews-tests-"), "api.db"))
+os.environ.setdefault("AINEWS_TRANSLATE_PROVIDER", "local")
+os.environ.setdefault("AINEWS_DICT_CACHE_DIR", tempfile.mkdtemp(prefix="ainews-dicts-"))
+
+from db.store import Store  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Store:
+    s = Store(str(tmp_path / "ainews.db"), slow_query_ms=None)
+    s.init_db()
+    return s
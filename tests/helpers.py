@@ -0,0 +1,52 @@
+"""Builders for test databases."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from db.store import PostRecord, Store
+from processor.cleaner import canonicalize_url, normalize_text, stable_hash
+
+ROOT = Path(__file__).resolve().parents[1]
+CONFIG_DIR = ROOT / "config"
+
+# Distinct wording per post, so near-duplicate detection never links test posts.
+_WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike november oscar papa "
+    "quebec romeo sierra tango uniform victor whiskey xray yankee zulu amber basil cedar dune ember fjord"
+).split()
+
+
+def hours_ago(hours: float) -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=hours)
+
+
+def add_posts(store: Store, posts: list[dict], feed_url: str = "https://example.com/feed.xml") -> list[int]:
+    """Insert posts given as dicts (title, summary, content, published_at, url); returns their ids."""
+    feed_id = store.upsert_feed(feed_url, "Example", "https://example.com")
+    records = []
+    for p in posts:
+        n = store.post_count() + len(records)
+        filler = " ".join(_WORDS[(n * 7 + k) % len(_WORDS)] + str(n) for k in range(12))
+        title = p.get("title") or f"Post {n} {filler}"
+        summary = p.get("summary") or f"Summary {n} {filler}"
+        content = p.get("content", "")
+        url = p.get("url") or f"https://example.com/posts/{n}"
+        published = p.get("published_at") or hours_ago(1)
+        records.append(
+            PostRecord(
+                feed_id=feed_id,
+                blog_id=p.get("blog_id") or f"blog{n % 3}",
+                guid=url,
+                title=title,
+                url=url,
+                canonical_url=canonicalize_url(url),
+                author="",
+                published_at=published.isoformat() if isinstance(published, datetime) else published,
+                summary=summary,
+                content=content,
+                title_norm=normalize_text(title),
+                content_hash=stable_hash(normalize_text(title), normalize_text(summary), normalize_text(content)),
+            )
+        )
+    return store.insert_posts(records)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ranking.burst import BurstDetector
+
+HOUR = 3600.0
+T0 = 1_700_000_000.0
+
+
+def _counts(detector: BurstDetector, now: float) -> dict[str, np.ndarray]:
+    rows = detector.take_dirty()
+    return {
+        key: np.frombuffer(blob, dtype="<f8") * np.exp(-detector.rates * (now - updated))
+        for key, _, updated, blob in rows
+    }
+
+
+def test_counters_halve_each_half_life():
+    detector = BurstDetector(half_lives_hours=(1.0, 6.0, 168.0))
+    detector.observe("entity:a", T0)
+    counts = _counts(detector, T0 + 6 * HOUR)["entity:a"]
+    assert counts == pytest.approx([2.0**-6, 0.5, 2.0 ** (-6 / 168)])
+
+
+def test_arrival_order_does_not_matter():
+    in_order, shuffled = BurstDetector(), BurstDetector()
+    times = [T0 + h * HOUR for h in (0, 2, 3, 7)]
+    for ts in times:
+        in_order.observe("entity:a", ts)
+    for ts in reversed(times):
+        shuffled.observe("entity:a", ts)
+    now = T0 + 10 * HOUR
+    assert _counts(shuffled, now)["entity:a"] == pytest.approx(_counts(in_order, now)["entity:a"])
+
+
+def test_negative_weight_retracts_a_mention():
+    detector = BurstDetector()
+    detector.observe("entity:a", T0)
+    detector.observe("entity:a", T0 + HOUR)
+    detector.observe("entity:a", T0, weight=-1.0)
+    counts = _counts(detector, T0 + HOUR)["entity:a"]
+    assert counts == pytest.approx([1.0, 1.0, 1.0])
+
+
+def test_scan_flags_a_spike_over_the_baseline():
+    detector = BurstDetector(min_mentions=3, min_z=3)
+    for day in range(7):
+        detector.observe("entity:steady", T0 + day * 24 * HOUR)
+    for minute in range(12):
+        detector.observe("entity:spike", T0 + 6 * 24 * HOUR + minute * 60)
+    rows = detector.take_dirty()
+    bursts = detector.scan(rows, T0 + 6 * 24 * HOUR + 15 * 60)
+    assert [b["key"] for b in bursts] == ["entity:spike"]
+    assert bursts[0]["horizon_hours"] == 1.0
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from topic_engine.related import entity_pairs, npmi
+from topic_engine.topic_builder import TopicBuilder
+
+DAY = 86400.0
+T0 = 1_700_000_000.0
+
+
+def _post(ts: float, *entities: str) -> tuple[float, list[tuple[str, str]]]:
+    return ts, entity_pairs(list(entities), 12)
+
+
+def test_npmi_bounds():
+    assert npmi(5, 5, 5, 5) == 1.0
+    assert npmi(0, 5, 5, 10) == -1.0
+    assert npmi(2, 4, 4, 8) == pytest.approx(0.0)
+    assert 0 < npmi(3, 4, 4, 20) < 1
+
+
+def test_counts_decay_with_half_life(store):
+    store.add_entity_cooccurrences([_post(T0, "a", "b"), _post(T0, "a", "b"), _post(T0, "a")], 1.0)
+    pairs, singles, total = store.entity_cooccurrence_counts(["a"], 1.0, 0.5, now_ts=T0 + DAY)
+    assert pairs == {("a", "b"): pytest.approx(1.0)}
+    assert singles == {"a": pytest.approx(1.5), "b": pytest.approx(1.0)}
+    assert total == pytest.approx(1.5)
+
+
+def test_short_half_life_over_years_stays_finite(store):
+    # One post a week for three years at a one-day half-life: a fixed epoch would overflow.
+    for week in range(3 * 52):
+        store.add_entity_cooccurrences([_post(T0 + week * 7 * DAY, "a", "b")], 1.0)
+    now = T0 + (3 * 52 - 1) * 7 * DAY
+    pairs, singles, total = store.entity_cooccurrence_counts(["a"], 1.0, 0.5, now_ts=now)
+    expected = 1.0 / (1.0 - 2.0**-7)
+    assert total == pytest.approx(expected)
+    assert pairs[("a", "b")] == pytest.approx(expected)
+    assert math.isfinite(npmi(pairs[("a", "b")], singles["a"], singles["b"], total))
+    assert store.entity_cooccurrence_counts(["a"], 1.0, 0.0, now_ts=now + 10_000 * DAY) == ({}, {}, 0.0)
+
+
+def test_rebase_keeps_older_counts(store):
+    store.add_entity_cooccurrences([_post(T0, "a", "b")], 1.0)
+    store.add_entity_cooccurrences([_post(T0 + 20 * DAY, "a", "c")], 1.0)
+    _, singles, total = store.entity_cooccurrence_counts(["a", "b", "c"], 1.0, 0.0, now_ts=T0 + 20 * DAY)
+    assert singles["b"] == pytest.approx(2.0**-20)
+    assert singles["c"] == pytest.approx(1.0)
+    assert total == pytest.approx(1.0 + 2.0**-20)
+
+
+def test_half_life_change_restarts_counts(store):
+    store.add_entity_cooccurrences([_post(T0, "a", "b")], 30.0)
+    assert store.entity_cooccurrences_current(30.0)
+    assert not store.entity_cooccurrences_current(7.0)
+    store.add_entity_cooccurrences([_post(T0, "a")], 7.0)
+    _, singles, total = store.entity_cooccurrence_counts(["a", "b"], 7.0, 0.0, now_ts=T0)
+    assert singles == {"a": pytest.approx(1.0)} and total == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("half_life", [0, -1, float("inf")])
+def test_invalid_half_life_rejected_at_load(half_life):
+    cfg = {"topic_building": {"related_topics": {"half_life_days": half_life}}}
+    with pytest.raises(ValueError):
+        TopicBuilder(cfg=cfg)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+import api.app as app_module
+from api.http_cache import CachePolicy, HttpCacheMiddleware, etag_matches
+from tests.helpers import add_posts, hours_ago
+
+POLICIES = {"/data": CachePolicy(max_age=60, s_maxage=300, stale_while_revalidate=3600)}
+
+
+@pytest.fixture
+def tiny():
+    state = {"version": "v1", "calls": 0}
+
+    def data(request):
+        state["calls"] += 1
+        headers = {"Cache-Control": "no-store"} if request.query_params.get("fresh") else None
+        return Response(b"{}", media_type="application/json", headers=headers)
+
+    app = Starlette(routes=[Route("/data", data)])
+    app.add_middleware(HttpCacheMiddleware, version=lambda: state["version"], policies=POLICIES)
+    return TestClient(app), state
+
+
+def test_etag_matches_weak_and_lists():
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')
+
+
+def test_matching_if_none_match_is_answered_without_the_route(tiny):
+    client, state = tiny
+    first = client.get("/data?b=2&a=1")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == POLICIES["/data"].header()
+    etag = first.headers["etag"]
+
+    # Query order does not change the tag.
+    again = client.get("/data?a=1&b=2", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    assert state["calls"] == 1
+
+
+def test_new_version_changes_the_etag(tiny):
+    client, state = tiny
+    etag = client.get("/data").headers["etag"]
+    state["version"] = "v2"
+    r = client.get("/data", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["etag"] != etag
+
+
+def test_no_store_responses_are_not_tagged(tiny):
+    client, _ = tiny
+    r = client.get("/data?fresh=1")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "no-store"
+    assert "etag" not in r.headers
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(app_module, "_post_bootstrap_attempted", True)
+    return TestClient(app_module.app)
+
+
+def test_api_revalidates_to_304(client):
+    add_posts(app_module.store, [{"title": "Cache test post about inference serving"}])
+    r = client.get("/api/dates")
+    assert r.status_code == 200 and r.headers["etag"]
+    assert client.get("/api/dates", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_on_demand_translation_is_not_cached(client):
+    published = hours_ago(2)
+    add_posts(app_module.store, [{"title": "Untranslated post about KV cache offloading", "published_at": published}])
+    r = client.get(f"/api/daily?day={published.date().isoformat()}")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "no-store"
+    assert "etag" not in r.headers
+
+    r = client.get("/api/browse?kind=tag&value=no-such-tag-anywhere")
+    assert r.status_code == 200 and r.json()["count"] == 0
+    assert "etag" in r.headers
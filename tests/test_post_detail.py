@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.app as app_module
+from tests.helpers import add_posts
+
+BODY = "\n\n".join(
+    f"Section {i} walks through prefix caching case {i} and how eviction interacts with batch scheduling."
+    for i in range(12)
+)
+BUDGET = 0.5
+
+
+@pytest.fixture
+def stalled(monkeypatch):
+    """Client whose provider calls block until the test ends; returns (client, texts sent to the provider)."""
+    release = threading.Event()
+    sent: list[str] = []
+    cfg = dataclasses.replace(
+        app_module._get_translate_cfg(),
+        detail_latency_budget=BUDGET,
+        detail_max_concurrency=2,
+        detail_segments_per_request=1,
+        detail_max_queued_groups=1,
+    )
+    translate_pool, fetch_pool = ThreadPoolExecutor(max_workers=2), ThreadPoolExecutor(max_workers=2)
+
+    def translate(items):
+        sent.extend(text for text, _ in items)
+        release.wait(10)
+        return [None] * len(items)
+
+    monkeypatch.setattr(app_module, "_translate_cfg", cfg)
+    monkeypatch.setattr(app_module, "_translate_pool", translate_pool)
+    monkeypatch.setattr(app_module, "_fetch_pool", fetch_pool)
+    monkeypatch.setattr(app_module, "_translate_many_to_zh", translate)
+    monkeypatch.setattr(app_module, "_fetch_article_result", lambda url: ("", "disabled", False))
+    monkeypatch.setattr(app_module, "_post_bootstrap_attempted", True)
+    yield TestClient(app_module.app), sent
+    release.set()
+    translate_pool.shutdown(wait=True)
+    fetch_pool.shutdown(wait=True)
+
+
+def test_detail_answers_within_budget_with_pending_paragraphs(stalled):
+    client, _ = stalled
+    post_id = add_posts(app_module.store, [{"content": BODY}])[0]
+    started = time.monotonic()
+    r = client.get(f"/api/post/{post_id}")
+    assert time.monotonic() - started < BUDGET + 2
+    post = r.json()["post"]
+    assert post["pending_paragraphs"] == 12
+    assert all(p["pending"] and p["en"] for p in post["paragraphs"])
+
+
+def test_full_queue_leaves_groups_unsent(stalled):
+    client, sent = stalled
+    post_id = add_posts(app_module.store, [{"content": BODY}])[0]
+    client.get(f"/api/post/{post_id}")
+    # Two running on the pool plus one queued; the other groups were never submitted.
+    paragraphs = [text for text in sent if text.startswith("Section")]
+    assert 1 <= len(paragraphs) <= 3
+    assert app_module._translate_queued <= 1
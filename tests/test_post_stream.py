@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.app as app_module
+from tests.helpers import add_posts
+
+BODY = "\n\n".join(
+    f"Paragraph {i} explains how speculative decoding number {i} trades draft tokens against verification cost."
+    for i in range(12)
+)
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(app_module, "_post_bootstrap_attempted", True)
+    monkeypatch.setattr(app_module, "_fetch_article_result", lambda url: ("", "disabled", False))
+    return TestClient(app_module.app)
+
+
+def _events(client: TestClient, url: str) -> list[dict]:
+    r = client.get(url)
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "no-store"
+    return [json.loads(line) for line in r.text.splitlines() if line.strip()]
+
+
+def _long_post() -> int:
+    return add_posts(app_module.store, [{"content": BODY}])[0]
+
+
+def test_stream_sends_every_paragraph(client):
+    post_id = _long_post()
+    events = _events(client, f"/api/post/{post_id}/stream")
+    assert [e["type"] for e in events[:2]] == ["meta", "content"]
+    content = events[1]
+    assert content["from"] == 0 and content["total"] == 12 and len(content["en"]) == 12
+    assert content["content_source"] == "rss_content"
+    assert sorted(e["index"] for e in events if e["type"] == "paragraph") == list(range(12))
+    assert events[-1] == {"type": "done", "pending": []}
+
+
+def test_resume_from_skips_earlier_paragraphs(client):
+    post_id = _long_post()
+    events = _events(client, f"/api/post/{post_id}/stream?from=5&source=rss_content&total=12")
+    content = events[1]
+    assert content["from"] == 5
+    assert content["en"] == BODY.split("\n\n")[5:]
+    assert sorted(e["index"] for e in events if e["type"] == "paragraph") == list(range(5, 12))
+
+
+@pytest.mark.parametrize("query", ["source=fetched_fulltext&total=12", "source=rss_content&total=30"])
+def test_resume_for_other_text_starts_over(client, query):
+    post_id = _long_post()
+    events = _events(client, f"/api/post/{post_id}/stream?from=5&{query}")
+    content = events[1]
+    assert content["from"] == 0 and len(content["en"]) == 12
+    assert sorted(e["index"] for e in events if e["type"] == "paragraph") == list(range(12))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import pytest
+
+from db.store import _HISTORY_SCALE, Store
+from tests.helpers import hours_ago
+
+PARAMS = {"recency_weight": 0.1, "recency_tau_hours": 24, "config_hash": "test"}
+LATEST = hours_ago(48).isoformat()
+
+
+def rankings(**bases: float) -> dict[str, list[tuple]]:
+    breakdown = {"D_diversity": 0.5, "Q_volume": 0.4, "V_velocity": 0.1, "n_posts": 3, "n_blogs": 2, "n_prev": 1}
+    return {"24h": [(f"topic.{t}", b * 1.5, breakdown, b, 0.2, b, LATEST) for t, b in bases.items()]}
+
+
+def publish(store: Store, as_of, ranks: dict[str, list[tuple]]) -> int:
+    run_id = store.stage_rankings(as_of.isoformat(), ranks, PARAMS)
+    store.publish_ranking_run(run_id, rankings=ranks)
+    return run_id
+
+
+def points(store: Store, as_of) -> dict[str, float]:
+    """topic -> base of the history points written at ``as_of``."""
+    with store.connect() as conn:
+        return {
+            r["topic_id"].removeprefix("topic."): r["base"] / _HISTORY_SCALE
+            for r in conn.execute(
+                "SELECT k.topic_id, h.base FROM ranking_history h JOIN topic_keys k USING (topic_key) WHERE h.ts = ?",
+                (int(as_of.timestamp()),),
+            )
+        }
+
+
+def value_at(store: Store, topic: str, as_of) -> float | None:
+    """Base score the history reports for ``topic`` as of ``as_of``."""
+    with store.connect() as conn:
+        row = conn.execute(
+            """
+            SELECT h.base FROM ranking_history h JOIN topic_keys k USING (topic_key)
+            WHERE k.topic_id = ? AND h.ts <= ? ORDER BY h.ts DESC LIMIT 1
+            """,
+            (f"topic.{topic}", int(as_of.timestamp())),
+        ).fetchone()
+    return None if row is None else row["base"] / _HISTORY_SCALE
+
+
+def series(store: Store) -> list[tuple]:
+    with store.connect() as conn:
+        return sorted(tuple(r) for r in conn.execute("SELECT * FROM ranking_series"))
+
+
+def test_publish_records_only_changed_series(store):
+    t1, t2, t3 = hours_ago(3), hours_ago(2), hours_ago(1)
+    publish(store, t1, rankings(a=1, b=2))
+    publish(store, t2, rankings(a=1, b=3))
+    assert points(store, t1) == {"a": 1, "b": 2}
+    assert points(store, t2) == {"b": 3}
+    store.stage_rankings(t3.isoformat(), rankings(a=5), PARAMS)
+    assert points(store, t3) == {}
+
+
+def test_dropped_series_gets_zero_point(store):
+    t1, t2 = hours_ago(2), hours_ago(1)
+    publish(store, t1, rankings(a=1, b=2))
+    publish(store, t2, rankings(a=1))
+    assert points(store, t2) == {"b": 0}
+
+
+def test_rollback_removes_points_and_restores_heads(store):
+    t1, t2, t3 = hours_ago(3), hours_ago(2), hours_ago(1)
+    good = publish(store, t1, rankings(a=1, b=2))
+    heads = series(store)
+    publish(store, t2, rankings(a=4, b=8))
+    assert store.rollback_ranking_run() == good
+    assert points(store, t2) == {}
+    assert series(store) == heads
+    # The next run is diffed against the restored heads.
+    publish(store, t3, rankings(a=1, b=3))
+    assert points(store, t3) == {"b": 3}
+
+
+def test_backfill_closes_at_next_live_run(store):
+    t1, t2, t3 = hours_ago(3), hours_ago(2), hours_ago(1)
+    publish(store, t1, rankings(a=1, b=2))
+    publish(store, t3, rankings(a=1, b=5))
+    store.write_backfilled_history([(t2.isoformat(), rankings(a=9, b=9))], t2.isoformat(), t2.isoformat())
+    assert (value_at(store, "a", t2), value_at(store, "b", t2)) == (9, 9)
+    assert (value_at(store, "a", t3), value_at(store, "b", t3)) == (1, 5)
+
+
+def test_backfill_covering_latest_run_resets_heads(store):
+    t1, t2, t3 = hours_ago(3), hours_ago(2), hours_ago(1)
+    publish(store, t1, rankings(a=1, b=2))
+    publish(store, t2, rankings(a=1, b=2))
+    snapshots = [(t1.isoformat(), rankings(a=7, b=2)), (t2.isoformat(), rankings(a=7, b=3))]
+    store.write_backfilled_history(snapshots, t1.isoformat(), t2.isoformat())
+    assert (value_at(store, "a", t2), value_at(store, "b", t2)) == (7, 3)
+    # The live run after the backfill is diffed against the backfilled values.
+    publish(store, t3, rankings(a=1, b=2))
+    assert points(store, t3) == {"a": 1, "b": 2}
+    assert (value_at(store, "a", t3), value_at(store, "b", t3)) == (1, 2)
+
+
+def test_failed_backfill_leaves_history_untouched(store):
+    t1, t2, t3 = hours_ago(3), hours_ago(2), hours_ago(1)
+    publish(store, t1, rankings(a=1))
+    publish(store, t3, rankings(a=2))
+
+    def snapshots():
+        yield t1.isoformat(), rankings(a=9)
+        raise RuntimeError("scoring failed")
+
+    with pytest.raises(RuntimeError):
+        store.write_backfilled_history(snapshots(), t1.isoformat(), t2.isoformat())
+    assert points(store, t1) == {"a": 1}
+    assert points(store, t3) == {"a": 2}
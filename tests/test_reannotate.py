@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+from pipeline import DailyPipeline, PipelineConfig
+from tests.helpers import CONFIG_DIR, add_posts, hours_ago
+
+POSTS = [
+    {"content": "We benchmark vllm against sglang on paged attention.", "published_at": hours_ago(30)},
+    {"content": "Our sglang deployment alongside ollama.", "published_at": hours_ago(20)},
+    {"content": "Running ollama with gguf files from llama.cpp.", "published_at": hours_ago(10)},
+    {"content": "The new vllm release speeds up sglang comparisons.", "published_at": hours_ago(5)},
+]
+
+
+def _pipeline(tmp_path: Path, config_dir: Path) -> DailyPipeline:
+    cfg = PipelineConfig(
+        db_path=str(tmp_path / "ainews.db"), opml_path="", config_dir=str(config_dir), annotate_workers=1
+    )
+    pipeline = DailyPipeline(cfg)
+    pipeline.store.init_db()
+    return pipeline
+
+
+def _drop_entity(config_dir: Path, entity_id: str) -> None:
+    path = config_dir / "entities.yaml"
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data["entities"] = [e for e in data["entities"] if e["id"] != entity_id]
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+
+
+def _burst_counts(pipeline: DailyPipeline, now: float) -> dict[str, np.ndarray]:
+    """Persisted burst counters decayed to ``now``."""
+    detector = pipeline._burst_detector()
+    rows = pipeline.store.load_burst_counters(detector.half_lives_hours)
+    return {
+        key: np.frombuffer(counts, dtype="<f8") * np.exp(-detector.rates * (now - updated))
+        for key, _, updated, counts in rows
+    }
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    return Path(shutil.copytree(CONFIG_DIR, tmp_path / "config"))
+
+
+def test_reannotate_updates_cooccurrence_counts_in_place(tmp_path, config_dir):
+    pipeline = _pipeline(tmp_path, config_dir)
+    add_posts(pipeline.store, POSTS)
+    pipeline.run_annotate_and_topics()
+    half_life = float(pipeline._related_cfg().get("half_life_days", 30))
+    ids = ["ent.vllm", "ent.sglang", "ent.ollama", "ent.llama_cpp"]
+    before = pipeline.store.entity_cooccurrence_counts(ids, half_life, 0.0)
+    assert ("ent.sglang", "ent.vllm") in before[0]
+
+    _drop_entity(config_dir, "ent.sglang")
+    pipeline = _pipeline(tmp_path, config_dir)
+    summary = pipeline.run_reannotate()
+    assert sum(job["reannotated"] for job in summary["jobs"]) > 0
+
+    now = time.time()
+    pairs, singles, total = pipeline.store.entity_cooccurrence_counts(ids, half_life, 0.0, now_ts=now)
+    assert not any("ent.sglang" in pair for pair in pairs) and "ent.sglang" not in singles
+
+    pipeline.store.reset_entity_cooccurrences(half_life)
+    pipeline._seed_cooccurrences()
+    r_pairs, r_singles, r_total = pipeline.store.entity_cooccurrence_counts(ids, half_life, 0.0, now_ts=now)
+    assert pairs == pytest.approx(r_pairs, rel=1e-3)
+    assert singles == pytest.approx(r_singles, rel=1e-3)
+    assert total == pytest.approx(r_total, rel=1e-3)
+
+
+
+def test_reannotate_retracts_old_burst_mentions(tmp_path, config_dir):
+    pipeline = _pipeline(tmp_path, config_dir)
+    add_posts(pipeline.store, POSTS)
+    pipeline.run_annotate_and_topics()
+    now = time.time()
+    before = _burst_counts(pipeline, now)
+    assert before["entity:ent.sglang"][-1] > 2.5
+
+    _drop_entity(config_dir, "ent.sglang")
+    pipeline = _pipeline(tmp_path, config_dir)
+    pipeline.run_reannotate()
+    after = _burst_counts(pipeline, now)
+    assert after["entity:ent.sglang"] == pytest.approx(np.zeros(3), abs=1e-9)
+    assert after["entity:ent.vllm"] == pytest.approx(before["entity:ent.vllm"])
+    assert after["entity:ent.ollama"] == pytest.approx(before["entity:ent.ollama"])
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+import db.fastjson as fastjson
+from tests.helpers import add_posts
+
+ITEMS = [
+    {"id": 1, "title": "Speculative decoding, 第二部分", "score": 1.5, "tags": ["a", "b"]},
+    {},
+    {"id": 3, "title": None},
+]
+RAW = ['{"zh":"推测解码","n":[1,2]}', None, b'["x"]']
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param and not fastjson._HAS_ORJSON:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(fastjson, "_HAS_ORJSON", request.param)
+
+
+def test_dumps_with_raw_matches_json_dumps(backend):
+    body = fastjson.dumps_with_raw(ITEMS, "extra", RAW)
+    expected = [{**item, "extra": None if raw is None else json.loads(raw)} for item, raw in zip(ITEMS, RAW)]
+    assert json.loads(body) == expected
+    assert body.decode("utf-8") == json.dumps(expected, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_dumps_with_raw_empty(backend):
+    assert fastjson.dumps_with_raw([], "extra", []) == b"[]"
+
+
+def test_blob_served_until_a_write(store):
+    store.put_response_blobs([("daily:2026-01-01", b"[1]", None)], store.cache_version())
+    assert store.get_response_blob("daily:2026-01-01") == b"[1]"
+    assert store.get_response_blob("daily:2026-01-02") is None
+
+    add_posts(store, [{"title": "A new post invalidates every stored body"}])
+    assert store.get_response_blob("daily:2026-01-01") is None
+
+
+def test_blob_expires(store):
+    version = store.cache_version()
+    store.put_response_blobs([("topics:a", b"[]", time.time() - 1), ("topics:b", b"[2]", time.time() + 60)], version)
+    assert store.get_response_blob("topics:a") is None
+    assert store.get_response_blob("topics:b") == b"[2]"
+
+
+def test_put_replaces_all_blobs(store):
+    store.put_response_blobs([("a", b"1", None), ("b", b"2", None)], store.cache_version())
+    store.put_response_blobs([("b", b"3", None)], store.cache_version())
+    assert store.get_response_blob("a") is None
+    assert store.get_response_blob("b") == b"3"
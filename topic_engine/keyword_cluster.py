@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+
+
+class KeywordClusterer:
+    """Incremental keyword clustering through an inverted index of salient terms.
+
+    Each post is reduced to its ``top_keywords`` most salient terms (sublinear
+    tf × idf). Each cluster is described by its ``cluster_keywords`` most
+    frequent member keywords, and the inverted index maps those terms to
+    clusters, so a post is only compared with clusters sharing one of its
+    keywords: assignment costs O(keywords × matching clusters), independent of
+    corpus size. A post joins the cluster sharing the most keywords if at
+    least ``min_keyword_overlap`` are shared; otherwise it starts a cluster.
+    """
+
+    def __init__(self, min_keyword_overlap: int = 3, top_keywords: int = 10, cluster_keywords: int = 30) -> None:
+        self.min_overlap = int(min_keyword_overlap)
+        self.top_keywords = int(top_keywords)
+        self.cluster_keywords = int(cluster_keywords)
+        self.counts: dict[int, Counter[str]] = {}
+        self.n_posts: dict[int, int] = {}
+        self.top: dict[int, set[str]] = {}
+        self.index: dict[str, set[int]] = {}
+        self._dirty_terms: set[tuple[int, str]] = set()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "KeywordClusterer":
+        return cls(
+            min_keyword_overlap=int(cfg.get("min_keyword_overlap", 3)),
+            top_keywords=int(cfg.get("top_keywords", 10)),
+            cluster_keywords=int(cfg.get("cluster_keywords", 30)),
+        )
+
+    def salient(self, tf: dict[str, int], idf: dict[str, float]) -> list[str]:
+        scored = [
+            ((1.0 + math.log(count)) * idf.get(term, 0.0), term)
+            for term, count in tf.items()
+            if len(term) > 1 and not term.isdigit()
+        ]
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [term for score, term in scored[: self.top_keywords] if score > 0]
+
+    def load(self, cluster_id: int, n_posts: int, counts: dict[str, int]) -> None:
+        self.counts[cluster_id] = Counter(counts)
+        self.n_posts[cluster_id] = n_posts
+        self._reindex(cluster_id)
+
+    def _reindex(self, cluster_id: int) -> None:
+        top = {term for term, _ in self.counts[cluster_id].most_common(self.cluster_keywords)}
+        old = self.top.get(cluster_id, set())
+        for term in old - top:
+            ids = self.index.get(term)
+            if ids is not None:
+                ids.discard(cluster_id)
+                if not ids:
+                    del self.index[term]
+        for term in top - old:
+            self.index.setdefault(term, set()).add(cluster_id)
+        self.top[cluster_id] = top
+
+    def assign(self, keywords: list[str], new_cluster_id) -> tuple[int, float]:
+        """Add a post's keywords to its best cluster (or a new one); returns (cluster_id, overlap share)."""
+        overlap: Counter[int] = Counter()
+        for term in keywords:
+            overlap.update(self.index.get(term, ()))
+        best = None
+        if overlap:
+            best = min(overlap, key=lambda cid: (-overlap[cid], -self.n_posts[cid], cid))
+        if best is not None and overlap[best] >= self.min_overlap:
+            share = overlap[best] / max(1, len(keywords))
+        else:
+            best = int(new_cluster_id())
+            self.counts[best] = Counter()
+            self.n_posts[best] = 0
+            share = 1.0
+        self.counts[best].update(keywords)
+        self.n_posts[best] += 1
+        self._dirty_terms.update((best, term) for term in keywords)
+        self._reindex(best)
+        return best, share
+
+    def take_dirty_terms(self) -> list[tuple[int, str, int]]:
+        """(cluster_id, term, count) rows changed since the last call, for persistence."""
+        rows = [(cid, term, self.counts[cid][term]) for cid, term in sorted(self._dirty_terms)]
+        self._dirty_terms.clear()
+        return rows
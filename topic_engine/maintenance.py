@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable
+
+# Which topic survives a merge: entity topics over semantic over keyword clusters.
+_KIND_PRIORITY = {"entity": 0, "semantic": 1, "keyword": 2}
+
+
+def topic_kind(topic_id: str) -> str:
+    parts = topic_id.split(".")
+    return parts[1] if len(parts) > 2 and parts[0] == "topic" else ""
+
+
+def is_episode(topic_id: str) -> bool:
+    return "@" in topic_id
+
+
+def _parse_iso(ts: str) -> datetime:
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class UnionFind:
+    def __init__(self) -> None:
+        self.parent: dict[str, str] = {}
+        self.rank: dict[str, int] = {}
+
+    def find(self, x: str) -> str:
+        self.parent.setdefault(x, x)
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: str, b: str) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.rank.get(ra, 0) < self.rank.get(rb, 0):
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if self.rank.get(ra, 0) == self.rank.get(rb, 0):
+            self.rank[ra] = self.rank.get(ra, 0) + 1
+
+    def groups(self) -> list[list[str]]:
+        out: dict[str, list[str]] = {}
+        for x in self.parent:
+            out.setdefault(self.find(x), []).append(x)
+        return [sorted(g) for g in out.values() if len(g) > 1]
+
+
+def plan_merges(edges: Iterable[tuple[str, str]], topics: dict[str, dict]) -> list[tuple[str, list[str]]]:
+    """Group topics connected by merge edges; returns (surviving topic, merged topics) per group.
+
+    ``topics`` maps topic_id to a row with n_posts and created_at. The survivor is
+    the highest-priority kind, then the largest, then the oldest topic.
+    """
+    uf = UnionFind()
+    for a, b in edges:
+        if a != b and a in topics and b in topics:
+            uf.union(a, b)
+    plans = []
+    for group in uf.groups():
+        keep = min(
+            group,
+            key=lambda t: (
+                _KIND_PRIORITY.get(topic_kind(t), 9),
+                is_episode(t),
+                -int(topics[t]["n_posts"]),
+                topics[t]["created_at"],
+                t,
+            ),
+        )
+        plans.append((keep, [t for t in group if t != keep]))
+    return plans
+
+
+def split_episodes(posts: list[tuple[int, str]], max_gap_days: float) -> list[list[tuple[int, str]]]:
+    """Split (post_id, published_at) pairs into runs separated by gaps longer than ``max_gap_days``."""
+    ordered = sorted(posts, key=lambda p: (p[1], p[0]))
+    episodes: list[list[tuple[int, str]]] = []
+    last: datetime | None = None
+    for post in ordered:
+        ts = _parse_iso(post[1])
+        if last is None or (ts - last).total_seconds() > max_gap_days * 86400:
+            episodes.append([])
+        episodes[-1].append(post)
+        last = ts
+    return episodes
+
+
+def episode_id(topic_id: str, first_published_at: str) -> str:
+    return f"{topic_id}@{_parse_iso(first_published_at).date().isoformat()}"
+
+
+def match_episode(
+    episode: list[tuple[int, str]], existing: list[tuple[str, str, str]], max_gap_days: float
+) -> str | None:
+    """Existing episode (id, first, last) that ``episode`` continues or overlaps, if any."""
+    first, last = _parse_iso(episode[0][1]), _parse_iso(episode[-1][1])
+    gap = max_gap_days * 86400
+    for topic_id, ep_first, ep_last in existing:
+        if (first - _parse_iso(ep_last)).total_seconds() <= gap and (_parse_iso(ep_first) - last).total_seconds() <= gap:
+            return topic_id
+    return None
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+
+
+def npmi(c_ab: float, c_a: float, c_b: float, n: float) -> float:
+    """Normalized PMI of two entities from (decayed) post counts; in [-1, 1]."""
+    if c_ab <= 0 or c_a <= 0 or c_b <= 0 or n <= 0:
+        return -1.0
+    p_ab = min(1.0, c_ab / n)
+    if p_ab >= 1.0:
+        return 1.0
+    return max(-1.0, min(1.0, math.log(c_ab * n / (c_a * c_b)) / -math.log(p_ab)))
+
+
+def entity_pairs(entity_ids: list[str], max_entities: int) -> list[tuple[str, str]]:
+    """(a, b) pairs with a <= b, including (a, a), over a post's distinct entities."""
+    ents = sorted(set(entity_ids))[:max_entities]
+    return [(a, b) for i, a in enumerate(ents) for b in ents[i:]]
+
+
+def related_topics(
+    profiles: dict[str, list[tuple[str, float]]],
+    neighbors: dict[str, dict[str, float]],
+    top_k: int,
+) -> dict[str, list[tuple[str, float]]]:
+    """Top ``top_k`` related topics per topic.
+
+    ``profiles`` maps a topic to (entity, share) pairs, ``neighbors`` an entity to
+    {entity: association} (itself at 1.0). Two topics score
+    sum(share_T(e) * assoc(e, f) * share_U(f)); only topics holding a neighbour of
+    one of T's entities are visited, through an entity -> topics index.
+    """
+    index: dict[str, list[tuple[str, float]]] = defaultdict(list)
+    for topic_id, profile in profiles.items():
+        for entity_id, share in profile:
+            index[entity_id].append((topic_id, share))
+    out: dict[str, list[tuple[str, float]]] = {}
+    for topic_id, profile in profiles.items():
+        scores: dict[str, float] = defaultdict(float)
+        for entity_id, share in profile:
+            for other, assoc in neighbors.get(entity_id, {}).items():
+                for cand, cand_share in index.get(other, ()):
+                    if cand != topic_id:
+                        scores[cand] += share * assoc * cand_share
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:top_k]
+        if ranked:
+            out[topic_id] = ranked
+    return out
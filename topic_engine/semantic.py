@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+import zlib
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    _HAS_NUMPY = False
+
+
+class SemanticClusterer:
+    """Incremental nearest-centroid clustering of posts on hashed TF-IDF vectors.
+
+    Terms are hashed into ``2**hash_bits`` features and mapped to ``dims``
+    dimensions by a fixed ±1 random projection (int8 table), which keeps
+    cosine similarity approximately intact at a fraction of the size. Active
+    centroids live in one dense float32 matrix, so a whole chunk of posts is
+    scored against every centroid with a single matrix product; only clusters
+    changed earlier in the same chunk are re-scored per post. A post joins the
+    most similar cluster at or above ``similarity_threshold``, otherwise it
+    starts a new cluster.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.4, dims: int = 256, hash_bits: int = 15, seed: int = 7) -> None:
+        if not _HAS_NUMPY:
+            raise RuntimeError("semantic clustering requires numpy")
+        self.threshold = float(similarity_threshold)
+        self.dims = dims
+        self.hash_mask = (1 << hash_bits) - 1
+        rng = np.random.default_rng(seed)
+        self.projection = (rng.integers(0, 2, size=(1 << hash_bits, dims), dtype=np.int8) * 2 - 1).astype(np.int8)
+        self.cluster_ids: list[int] = []
+        self.n_posts: list[int] = []
+        self._row: dict[int, int] = {}
+        # Row i: sum of member unit vectors (its direction is the mean direction) and its unit version.
+        self._sums = np.zeros((64, dims), dtype=np.float32)
+        self._units = np.zeros((64, dims), dtype=np.float32)
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "SemanticClusterer":
+        return cls(similarity_threshold=float(cfg.get("similarity_threshold", 0.4)), dims=int(cfg.get("dims", 256)))
+
+    def __len__(self) -> int:
+        return len(self.cluster_ids)
+
+    def vectorize(self, tf: dict[str, int], idf: dict[str, float]) -> "np.ndarray | None":
+        """Unit-length projected TF-IDF vector (sublinear tf), or None if no term carries weight."""
+        features: dict[int, float] = {}
+        for term, count in tf.items():
+            w = (1.0 + math.log(count)) * idf.get(term, 0.0)
+            if w > 0:
+                h = zlib.crc32(term.encode("utf-8")) & self.hash_mask
+                features[h] = features.get(h, 0.0) + w
+        if not features:
+            return None
+        idx = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+        weights = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        vec = weights @ self.projection[idx].astype(np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else None
+
+    @staticmethod
+    def mean_vectors(groups: dict[str, list["np.ndarray"]]) -> dict[str, "np.ndarray"]:
+        """Unit mean direction of each non-empty group of unit vectors."""
+        out = {}
+        for key, vecs in groups.items():
+            if vecs:
+                total = np.sum(vecs, axis=0)
+                norm = float(np.linalg.norm(total))
+                if norm > 0:
+                    out[key] = total / norm
+        return out
+
+    @staticmethod
+    def similar_pairs(vectors: dict[str, "np.ndarray"], queries: list[str], min_sim: float) -> list[tuple[str, str]]:
+        """(query, other) pairs whose unit vectors have cosine >= ``min_sim``."""
+        if not queries or len(vectors) < 2:
+            return []
+        keys = sorted(vectors)
+        matrix = np.stack([vectors[k] for k in keys])
+        sims = np.stack([vectors[q] for q in queries]) @ matrix.T
+        return [
+            (q, keys[j])
+            for i, q in enumerate(queries)
+            for j in np.nonzero(sims[i] >= min_sim)[0].tolist()
+            if keys[j] != q
+        ]
+
+    def load(self, cluster_id: int, centroid: "np.ndarray | bytes", n_posts: int) -> int:
+        """Add a cluster (centroid as an array or a ``centroid_blob``); returns its row."""
+        if isinstance(centroid, (bytes, bytearray, memoryview)):
+            centroid = np.frombuffer(centroid, dtype=np.float32)
+        row = len(self.cluster_ids)
+        if row == len(self._sums):
+            self._sums = np.vstack([self._sums, np.zeros_like(self._sums)])
+            self._units = np.vstack([self._units, np.zeros_like(self._units)])
+        self.cluster_ids.append(int(cluster_id))
+        self.n_posts.append(int(n_posts))
+        self._row[int(cluster_id)] = row
+        self._sums[row] = centroid
+        self._refresh(row)
+        return row
+
+    def _refresh(self, row: int) -> None:
+        norm = float(np.linalg.norm(self._sums[row]))
+        self._units[row] = self._sums[row] / norm if norm > 0 else 0.0
+
+    def centroid_blob(self, cluster_id: int) -> bytes:
+        return self._sums[self._row[cluster_id]].tobytes()
+
+    def cluster_size(self, cluster_id: int) -> int:
+        return self.n_posts[self._row[cluster_id]]
+
+    def assign_batch(self, vecs: list["np.ndarray"], new_cluster_id) -> list[tuple[int, float]]:
+        """Assign unit vectors in order; returns (cluster_id, similarity) per vector.
+
+        ``new_cluster_id`` is called to allocate an id whenever a cluster is created.
+        """
+        if not vecs:
+            return []
+        base = len(self.cluster_ids)
+        # Similarity to every pre-existing centroid in one product; rows touched
+        # earlier in this batch (joined or created) are re-scored per vector.
+        scores = self._units[:base] @ np.stack(vecs).T if base else None
+        touched: set[int] = set()
+        out: list[tuple[int, float]] = []
+        for j, vec in enumerate(vecs):
+            sims = np.empty(len(self.cluster_ids), dtype=np.float32)
+            if base:
+                sims[:base] = scores[:, j]
+            if touched:
+                rows = np.fromiter(touched, dtype=np.int64, count=len(touched))
+                sims[rows] = self._units[rows] @ vec
+            best_row = int(np.argmax(sims)) if len(sims) else -1
+            best_sim = float(sims[best_row]) if best_row >= 0 else -1.0
+            if best_row >= 0 and best_sim >= self.threshold:
+                self._sums[best_row] += vec
+                self.n_posts[best_row] += 1
+                self._refresh(best_row)
+            else:
+                best_row = self.load(new_cluster_id(), vec, 1)
+                best_sim = 1.0
+            touched.add(best_row)
+            out.append((self.cluster_ids[best_row], best_sim))
+        return out
@@ -0,0 +1,139 @@
+"""Translation providers: a batched Google (gtx) client and a local stand-in."""
+from __future__ import annotations
+
+import time
+from typing import Protocol
+
+import requests
+
+GTX_BATCH_URL = "https://translate.googleapis.com/translate_a/t"
+GTX_SINGLE_URL = "https://translate.googleapis.com/translate_a/single"
+
+
+class TranslationProvider(Protocol):
+    name: str
+    # False for stand-ins whose output must not be stored as a translation.
+    persistent: bool
+    # Limits of one translate_batch call; the Translator packs segments within them.
+    max_batch_segments: int
+    max_batch_chars: int
+
+    def translate_batch(self, texts: list[str], target: str) -> list[str | None]:
+        """Translations in input order; None where a segment could not be translated."""
+        ...
+
+
+class GoogleGtxProvider:
+    """Unauthenticated translate.googleapis.com client.
+
+    A batch goes out as one POST with repeated ``q`` fields; if the response
+    parses but does not line up with the request, the segments are retried one
+    by one on the single-segment endpoint. A failed request (timeout, network
+    or HTTP error, unparseable body) is not retried: the provider answers None
+    without any request for ``failure_backoff`` seconds afterwards, so a slow or
+    blocking endpoint costs one timeout rather than one per segment or request.
+    """
+
+    name = "google"
+    persistent = True
+
+    def __init__(
+        self,
+        timeout: float = 3.0,
+        max_batch_segments: int = 32,
+        max_batch_chars: int = 4500,
+        session: requests.Session | None = None,
+        failure_backoff: float = 30.0,
+    ) -> None:
+        self.timeout = timeout
+        self.max_batch_segments = max_batch_segments
+        self.max_batch_chars = max_batch_chars
+        self.session = session or requests.Session()
+        self.failure_backoff = failure_backoff
+        self._failed_until = 0.0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._failed_until
+
+    def _failed(self) -> None:
+        self._failed_until = time.monotonic() + self.failure_backoff
+
+    def translate_batch(self, texts: list[str], target: str) -> list[str | None]:
+        if not texts or not self._available():
+            return [None] * len(texts)
+        if len(texts) > 1:
+            try:
+                resp = self.session.post(
+                    GTX_BATCH_URL,
+                    params={"client": "gtx", "sl": "auto", "tl": target, "dt": "t"},
+                    data=[("q", t) for t in texts],
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+                out = self._parse_batch(resp.json())
+            except (requests.RequestException, ValueError):
+                self._failed()
+                return [None] * len(texts)
+            if len(out) == len(texts):
+                return out
+        return [self._translate_one(t, target) if self._available() else None for t in texts]
+
+    @staticmethod
+    def _parse_batch(data) -> list[str | None]:
+        # One segment comes back as a bare item, several as a list; an item is
+        # the translation or [translation, detected source language].
+        if not isinstance(data, list) or (len(data) == 2 and isinstance(data[0], str) and isinstance(data[1], str)):
+            data = [data]
+        out: list[str | None] = []
+        for item in data:
+            if isinstance(item, list) and item:
+                item = item[0]
+            out.append(item if isinstance(item, str) and item else None)
+        return out
+
+    def _translate_one(self, text: str, target: str) -> str | None:
+        try:
+            resp = self.session.get(
+                GTX_SINGLE_URL,
+                params={"client": "gtx", "sl": "auto", "tl": target, "dt": "t", "q": text},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+        except (requests.RequestException, ValueError):
+            self._failed()
+            return None
+        try:
+            translated = "".join(part[0] for part in (data[0] or []) if part and part[0])
+        except (IndexError, KeyError, TypeError):
+            return None
+        return translated or None
+
+
+class LocalProvider:
+    """Offline stand-in: looks segments up in ``table``, else tags them with the target language.
+
+    Used for tests and deployments without network access; its output is
+    never stored. ``calls`` counts translate_batch invocations.
+    """
+
+    name = "local"
+    persistent = False
+
+    def __init__(self, table: dict[str, str] | None = None, max_batch_segments: int = 64, max_batch_chars: int = 20000) -> None:
+        self.table = dict(table or {})
+        self.max_batch_segments = max_batch_segments
+        self.max_batch_chars = max_batch_chars
+        self.calls = 0
+
+    def translate_batch(self, texts: list[str], target: str) -> list[str | None]:
+        self.calls += 1
+        return [self.table.get(t, f"[{target}] {t}") for t in texts]
+
+
+def build_provider(name: str, timeout: float = 3.0, failure_backoff: float = 30.0) -> TranslationProvider:
+    if name == "google":
+        return GoogleGtxProvider(timeout=timeout, failure_backoff=failure_backoff)
+    if name == "local":
+        return LocalProvider()
+    raise ValueError(f"unknown translation provider: {name}")
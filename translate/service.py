@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import yaml
+
+from db.store import Store
+from translate.providers import TranslationProvider, build_provider
+
+
+@dataclass
+class TranslateConfig:
+    provider: str = "google"
+    target: str = "zh-CN"
+    timeout: float = 3.0
+    failure_backoff: float = 30.0
+    pretranslate_enabled: bool = True
+    lookback_days: float = 3.0
+    max_posts_per_run: int = 500
+    paragraphs_enabled: bool = False
+    paragraphs_window: str = "24h"
+    paragraphs_top_topics: int = 10
+    paragraphs_posts_per_topic: int = 3
+    max_requests: int = 60
+    max_chars: int = 200000
+    min_request_interval: float = 0.5
+    detail_latency_budget: float = 6.0
+    detail_max_concurrency: int = 4
+    detail_segments_per_request: int = 8
+    detail_max_queued_groups: int = 32
+    detail_stream_timeout: float = 60.0
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "TranslateConfig":
+        p = Path(path)
+        if not p.exists():
+            return cls()
+        try:
+            data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+        except Exception:
+            return cls()
+        pre = data.get("pretranslate") or {}
+        para = pre.get("paragraphs") or {}
+        budget = data.get("budget") or {}
+        detail = data.get("post_detail") or {}
+        return cls(
+            provider=str(data.get("provider", "google")),
+            target=str(data.get("target", "zh-CN")),
+            timeout=float(data.get("timeout", 3.0)),
+            failure_backoff=float(data.get("failure_backoff", 30.0)),
+            pretranslate_enabled=bool(pre.get("enabled", True)),
+            lookback_days=float(pre.get("lookback_days", 3.0)),
+            max_posts_per_run=int(pre.get("max_posts_per_run", 500)),
+            paragraphs_enabled=bool(para.get("enabled", False)),
+            paragraphs_window=str(para.get("window", "24h")),
+            paragraphs_top_topics=int(para.get("top_topics", 10)),
+            paragraphs_posts_per_topic=int(para.get("posts_per_topic", 3)),
+            max_requests=int(budget.get("max_requests", 60)),
+            max_chars=int(budget.get("max_chars", 200000)),
+            min_request_interval=float(budget.get("min_request_interval", 0.5)),
+            detail_latency_budget=float(detail.get("latency_budget", 6.0)),
+            detail_max_concurrency=int(detail.get("max_concurrency", 4)),
+            detail_segments_per_request=int(detail.get("segments_per_request", 8)),
+            detail_max_queued_groups=int(detail.get("max_queued_groups", 32)),
+            detail_stream_timeout=float(detail.get("stream_timeout", 60.0)),
+        )
+
+
+class RateBudget:
+    """Caps provider requests and characters, spacing requests at least ``min_interval`` apart."""
+
+    def __init__(self, max_requests: int, max_chars: int, min_interval: float = 0.0) -> None:
+        self.requests_left = max_requests
+        self.chars_left = max_chars
+        self.min_interval = min_interval
+        self._last = 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.requests_left <= 0 or self.chars_left <= 0
+
+    def acquire(self, n_chars: int) -> bool:
+        if self.requests_left <= 0 or n_chars > self.chars_left:
+            return False
+        wait = self._last + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last = time.monotonic()
+        self.requests_left -= 1
+        self.chars_left -= n_chars
+        return True
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()[:32]
+
+
+class Translator:
+    """Translate text segments through a persistent cache, batching and coalescing provider calls.
+
+    Segments are looked up in the store's ``translation_cache`` by source hash
+    and target language in one query. Misses are packed into as few provider
+    requests as the provider's batch limits allow. A segment already being
+    translated by another thread is not requested again: the caller waits for
+    that thread's result instead. Failed segments (None) are not cached, nor is
+    anything from a non-persistent provider; with a ``budget``, segments beyond
+    it come back as None without a request.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        provider: TranslationProvider,
+        target: str = "zh-CN",
+        wait_timeout: float = 30.0,
+        budget: RateBudget | None = None,
+    ) -> None:
+        self.store = store
+        self.provider = provider
+        self.target = target
+        self.budget = budget
+        self.wait_timeout = wait_timeout
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self.stats = {"segments": 0, "cache_hits": 0, "coalesced": 0, "provider_calls": 0, "provider_segments": 0}
+
+    def translate(self, text: str) -> str | None:
+        return self.translate_many([text])[0]
+
+    def lookup(self, texts: Iterable[str]) -> list[str | None]:
+        """Cached translations only, without provider requests; None on a miss, "" for empty input."""
+        texts = list(texts)
+        keys = {t: source_hash(t) for t in texts if t}
+        found = self.store.get_translations(set(keys.values()), self.target) if keys else {}
+        return [found.get(keys[t]) if t else "" for t in texts]
+
+    def translate_many(self, texts: Iterable[str]) -> list[str | None]:
+        """Translations in input order; empty input segments map to ""."""
+        texts = list(texts)
+        keys = {t: source_hash(t) for t in texts if t}
+        found = self.store.get_translations(set(keys.values()), self.target) if keys else {}
+        by_key = {k: found[k] for k in keys.values() if k in found}
+        self.stats["segments"] += len(texts)
+        self.stats["cache_hits"] += sum(1 for t in texts if t and keys[t] in by_key)
+
+        misses = {keys[t]: t for t in texts if t and keys[t] not in by_key}
+        owned: dict[str, Future] = {}
+        waiting: dict[str, Future] = {}
+        with self._lock:
+            for key in misses:
+                fut = self._inflight.get(key)
+                if fut is None:
+                    owned[key] = self._inflight[key] = Future()
+                else:
+                    waiting[key] = fut
+        self.stats["coalesced"] += len(waiting)
+
+        if owned:
+            try:
+                by_key.update(self._translate_misses({k: misses[k] for k in owned}))
+            finally:
+                with self._lock:
+                    for key, fut in owned.items():
+                        self._inflight.pop(key, None)
+                        fut.set_result(by_key.get(key))
+        for key, fut in waiting.items():
+            try:
+                by_key[key] = fut.result(timeout=self.wait_timeout)
+            except Exception:
+                by_key[key] = None
+        return [by_key.get(keys[t]) if t else "" for t in texts]
+
+    def _translate_misses(self, misses: dict[str, str]) -> dict[str, str | None]:
+        out: dict[str, str | None] = {}
+        rows = []
+        for batch in self._batches(list(misses.items())):
+            if self.budget is not None and not self.budget.acquire(sum(len(text) for _, text in batch)):
+                out.update((key, None) for key, _ in batch)
+                continue
+            self.stats["provider_calls"] += 1
+            self.stats["provider_segments"] += len(batch)
+            try:
+                results = self.provider.translate_batch([text for _, text in batch], self.target)
+            except Exception:
+                results = [None] * len(batch)
+            for (key, _), translated in zip(batch, results):
+                out[key] = translated
+                if translated and self.provider.persistent:
+                    rows.append((key, self.target, translated, self.provider.name))
+        self.store.put_translations(rows)
+        return out
+
+    def _batches(self, items: list[tuple[str, str]]) -> Iterable[list[tuple[str, str]]]:
+        batch: list[tuple[str, str]] = []
+        chars = 0
+        for item in items:
+            size = len(item[1])
+            if batch and (len(batch) >= self.provider.max_batch_segments or chars + size > self.provider.max_batch_chars):
+                yield batch
+                batch, chars = [], 0
+            batch.append(item)
+            chars += size
+        if batch:
+            yield batch
+
+
+def build_translator(store: Store, cfg: TranslateConfig, budget: RateBudget | None = None) -> Translator:
+    """Translator for ``cfg``; the AINEWS_TRANSLATE_PROVIDER environment variable overrides its provider."""
+    name = os.getenv("AINEWS_TRANSLATE_PROVIDER", "").strip() or cfg.provider
+    provider = build_provider(name, timeout=cfg.timeout, failure_backoff=cfg.failure_backoff)
+    return Translator(store, provider, target=cfg.target, budget=budget)
@@ -0,0 +1,57 @@
+"""Text preparation shared by the API and the pre-translation stage.
+
+Both sides must cut segments identically so that pre-translated segments
+hit the translation cache at request time.
+"""
+from __future__ import annotations
+
+import re
+
+ZH_RE = re.compile(r"[\u4e00-\u9fff]")
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+BLOCK_BREAK_RE = re.compile(r"</?(p|div|article|section|h1|h2|h3|h4|h5|h6|li|ul|ol|blockquote|pre|br)[^>]*>", re.IGNORECASE)
+
+# Longest source segment sent for a title, summary or chunk.
+MAX_SEGMENT_CHARS = 800
+
+
+def to_cn_text(text: str, limit: int = 220) -> str:
+    value = (text or "").strip()
+    if not value:
+        return ""
+    value = HTML_TAG_RE.sub(" ", value)
+    value = re.sub(r"\s+", " ", value).strip()
+    if len(value) > limit:
+        value = value[: limit - 1] + "…"
+    if ZH_RE.search(value):
+        return value
+    return f"（英文）{value}"
+
+
+def source_segment(text: str) -> str:
+    """The segment to translate for ``text``; "" when it is empty or already Chinese."""
+    value = (text or "").strip()
+    return "" if not value or ZH_RE.search(value) else value[:MAX_SEGMENT_CHARS]
+
+
+def extract_paragraphs(text: str, max_paragraphs: int = 120) -> list[str]:
+    if not text:
+        return []
+    t = text
+    # Keep paragraph boundaries from common block tags.
+    t = BLOCK_BREAK_RE.sub("\n\n", t)
+    t = HTML_TAG_RE.sub(" ", t)
+    t = t.replace("\r\n", "\n").replace("\r", "\n")
+    t = re.sub(r"[ \t]+", " ", t)
+    raw_parts = [x.strip() for x in re.split(r"\n{2,}", t) if x.strip()]
+    # Fallback when source has no block boundaries.
+    if len(raw_parts) <= 1:
+        line_parts = [x.strip() for x in t.split("\n") if x.strip()]
+        if line_parts:
+            raw_parts = line_parts
+    return raw_parts[:max_paragraphs]
+
+
+def paragraph_segments(paragraphs: list[str], max_paragraph_chars: int = 1400) -> list[str]:
+    """Non-empty paragraphs cut to ``max_paragraph_chars``, as shown and translated."""
+    return [en[:max_paragraph_chars] for en in ((p or "").strip() for p in paragraphs) if en]